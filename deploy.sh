@@ -50,6 +50,9 @@ echo "This may take several minutes..."
 gcloud builds submit --tag $IMAGE_NAME
 
 # Deploy to Cloud Run
+# An investigation runs under one deadline (VERA_DEADLINE_SECONDS, 240 s).
+# The request timeout also ends a Streamlit session's websocket, so it keeps
+# ample room above the deadline for URL extraction, the report and reading it
 echo "🚀 Deploying to Cloud Run..."
 gcloud run deploy $SERVICE_NAME \
     --image $IMAGE_NAME \
@@ -59,6 +62,7 @@ gcloud run deploy $SERVICE_NAME \
     --memory 2Gi \
     --cpu 2 \
     --timeout 900 \
+    --set-env-vars VERA_DEADLINE_SECONDS=240 \
     --max-instances 10 \
     --min-instances 0 \
     --port 8080
@@ -0,0 +1,121 @@
+"""
+Benchmark article-body extraction on the saved news page corpus.
+
+Compares the single-pass density extractor (vera/utils/article_extractor.py)
+with the previous sequential selector scan, on speed (parse excluded) and
+quality (word-level F1 against the gold article text).
+
+Corpus: tests/fixtures/news_pages/<name>.html with gold text in <name>.txt.
+The bundled corpus is six small synthetic pages (2-3 KB each). They were
+written to reproduce common layouts: article body classes, entry-content,
+a sidebar, a cookie banner, teasers before the article, and JSON-LD. They
+are not captured from real sites. Numbers measured on them (e.g. density
+extractor F1 0.97 vs 0.68 for the selector scan) are synthetic. They show
+relative behaviour on those layouts, not accuracy on real traffic. Add
+saved pages (with hand-checked gold text) there to benchmark against real
+traffic.
+
+Usage:
+    python scripts/benchmark_extraction.py [--repeat 200] [--corpus DIR]
+"""
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from vera.utils.article_extractor import find_article_element, iter_text
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "news_pages"
+
+LEGACY_SELECTORS = [
+    {'name': 'div', 'class_': 'article__body'},
+    {'name': 'div', 'class_': 'article-body'},
+    {'name': 'div', 'class_': 'article__text'},
+    {'name': 'div', 'class_': 'article-content'},
+    {'name': 'article', 'class_': None},
+    {'name': 'div', 'class_': 'post-content'},
+    {'name': 'div', 'class_': 'entry-content'},
+    {'name': 'div', 'class_': 'content'},
+    {'name': 'main', 'class_': None},
+    {'name': 'body', 'class_': None},
+]
+
+
+def legacy_extract(soup: BeautifulSoup) -> str:
+    """Selector scan used by url_extractor before the density extractor."""
+    for tag in soup(["script", "style", "nav", "footer", "header", "aside", "form", "iframe"]):
+        tag.decompose()
+    for selector in LEGACY_SELECTORS:
+        if selector['class_']:
+            elem = soup.find(selector['name'], class_=selector['class_'])
+            if not elem:
+                elem = soup.find(selector['name'], class_=lambda x: x and selector['class_'] in x if x else False)
+        else:
+            elem = soup.find(selector['name'])
+        if elem:
+            text = elem.get_text(separator='\n', strip=True)
+            if text:
+                return text
+    paragraphs = [p.get_text(strip=True) for p in soup.find_all('p')]
+    paragraphs = [p for p in paragraphs if len(p) > 50]
+    if paragraphs:
+        return '\n\n'.join(paragraphs)
+    return soup.get_text(separator='\n', strip=True)
+
+
+def density_extract(soup: BeautifulSoup) -> str:
+    element = find_article_element(soup) or soup.body or soup
+    return '\n'.join(iter_text(element))
+
+
+def word_f1(extracted: str, gold: str) -> float:
+    """Word-level F1 of extracted text against gold text."""
+    predicted, expected = Counter(extracted.lower().split()), Counter(gold.lower().split())
+    overlap = sum((predicted & expected).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(predicted.values())
+    recall = overlap / sum(expected.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory with .html/.txt pairs")
+    parser.add_argument("--repeat", type=int, default=200, help="Extractions per page for timing")
+    args = parser.parse_args()
+
+    pages = sorted(args.corpus.glob("*.html"))
+    if not pages:
+        print(f"No .html pages found in {args.corpus}")
+        return
+
+    extractors = {"legacy selectors": legacy_extract, "density (single pass)": density_extract}
+    totals = {name: [0.0, 0.0] for name in extractors}
+
+    print(f"{'page':32} {'extractor':24} {'F1':>6} {'ms/page':>9}")
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        gold = page.with_suffix(".txt").read_text(encoding="utf-8")
+        for name, extract in extractors.items():
+            # Parse outside the timed region - both extractors take the same tree
+            soups = [BeautifulSoup(html, "html.parser") for _ in range(args.repeat)]
+            start = time.perf_counter()
+            for soup in soups:
+                text = extract(soup)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+            f1 = word_f1(text, gold)
+            totals[name][0] += f1
+            totals[name][1] += elapsed_ms
+            print(f"{page.stem:32} {name:24} {f1:6.3f} {elapsed_ms:9.3f}")
+
+    print()
+    for name, (f1_sum, ms_sum) in totals.items():
+        print(f"{'MEAN':32} {name:24} {f1_sum / len(pages):6.3f} {ms_sum / len(pages):9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark HTML parser backends for URL extraction.
+
+For every installed backend (see vera/utils/html_parser.py) measures, on the
+saved news page corpus:
+    - pages/sec for parse + article extraction
+    - peak memory growth (RSS, includes the C parsers' own allocations)
+    - extraction quality (word-level F1 against the gold text)
+
+Each backend runs in its own process so peak memory is not shared.
+
+Corpus: tests/fixtures/news_pages/<name>.html with gold text in <name>.txt.
+The bundled pages are small synthetic ones (2-3 KB); add saved pages from
+production traffic there for representative numbers. Parser speed depends
+on page size, and at 2-3 KB lxml and html.parser are within run-to-run
+noise of each other; --pad-kb adds navigation, script and teaser
+boilerplate to every page to approximate the size of real news pages
+(typically 50-150 KB).
+
+Usage:
+    python scripts/benchmark_parsers.py [--repeat 50] [--corpus DIR] [--backends lxml html.parser] [--pad-kb 70]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import time
+from pathlib import Path
+
+from benchmark_extraction import DEFAULT_CORPUS, word_f1
+
+
+def pad_page(content: bytes, kb: int) -> bytes:
+    """Prepend about `kb` KB of page boilerplate (navigation, inline script, teasers) to the body."""
+    if kb <= 0:
+        return content
+    count = max(1, kb * 1024 // 100)
+    boilerplate = (
+        "<nav><ul>" + "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(count // 4)) + "</ul></nav>"
+        + "<script>var config = {" + ",".join(f'"key{i}": {i}' for i in range(count)) + "};</script>"
+        + "<aside>" + "".join(
+            f'<div class="teaser"><a href="/article/{i}"><img src="/img/{i}.jpg" alt="">'
+            f"<span>Teaser headline number {i} with a few more words</span></a></div>"
+            for i in range(count // 2)
+        ) + "</aside>"
+    ).encode()
+    head, body, rest = content.partition(b"<body>")
+    return head + body + boilerplate + rest if body else boilerplate + content
+
+
+def run_backend(backend: str, corpus: str, repeat: int, results, pad_kb: int = 0) -> None:
+    from vera.utils.article_extractor import find_article_element, iter_text
+    from vera.utils.html_parser import parse_html
+
+    pages = [
+        (pad_page(path.read_bytes(), pad_kb), path.with_suffix(".txt").read_text(encoding="utf-8"))
+        for path in sorted(Path(corpus).glob("*.html"))
+    ]
+
+    def extract(content: bytes) -> str:
+        document, adapter = parse_html(content, backend)
+        element = find_article_element(document, adapter) or adapter.root(document)
+        return "\n".join(iter_text(element, adapter))
+
+    extract(pages[0][0])  # Warm up imports
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content, _gold in pages:
+            extract(content)
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    f1 = sum(word_f1(extract(content), gold) for content, gold in pages) / len(pages)
+    results.put({
+        "backend": backend,
+        "pages_per_sec": repeat * len(pages) / elapsed,
+        "peak_mb": (peak_kb - baseline_kb) / 1024,
+        "f1": f1,
+    })
+
+
+def main():
+    from vera.utils.html_parser import BACKENDS, available_backends
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory with .html/.txt pairs")
+    parser.add_argument("--repeat", type=int, default=50, help="Passes over the corpus per backend")
+    parser.add_argument("--backends", nargs="*", choices=BACKENDS, help="Backends to compare (default: all installed)")
+    parser.add_argument("--pad-kb", type=int, default=0, help="Boilerplate added to every page (KB)")
+    args = parser.parse_args()
+
+    if not list(args.corpus.glob("*.html")):
+        print(f"No .html pages found in {args.corpus}")
+        return
+
+    installed = available_backends()
+    backends = args.backends or installed
+    missing = [name for name in backends if name not in installed]
+    if missing:
+        print(f"Not installed (skipped): {', '.join(missing)}")
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    print(f"{'backend':12} {'pages/sec':>10} {'peak MB':>9} {'F1':>6}")
+    for backend in backends:
+        if backend in missing:
+            continue
+        process = context.Process(target=run_backend, args=(backend, str(args.corpus), args.repeat, results, args.pad_kb))
+        process.start()
+        row = results.get()
+        process.join()
+        print(f"{row['backend']:12} {row['pages_per_sec']:10.1f} {row['peak_mb']:9.1f} {row['f1']:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
+import asyncio
+
 from vera.agents.wikipedia_tool import search_wikipedia
 
 print("Testing Wikipedia Tool...")
-result = search_wikipedia("Python (programming language)")
+result = asyncio.run(search_wikipedia("Python (programming language)"))
 print(result)
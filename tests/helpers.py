@@ -0,0 +1,11 @@
+"""Shared test doubles."""
+
+
+class FakeClock:
+    """Injectable time source; tests advance it by changing `now`."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+from starlette.testclient import TestClient
+from vera.api import create_app
+from vera.investigation import InvestigationResult
+from vera.service import BackgroundInvestigations, follow_investigation
+from vera.utils.streaming import DedupRenderer
+
+
+async def fake_investigate(text, language="English", source_url=None, api_key=None, session_id=None, user_id=None,
+                           on_stage_start=None, on_stage_end=None, on_report_text=None,
+                           reuse_near_duplicates=True):
+    """Stand-in for the agent pipeline that emits the same callbacks."""
+    for name in ("Researcher", "Reporter"):
+        on_stage_start(name)
+        await asyncio.sleep(0.01)
+        if name == "Reporter":
+            on_report_text("# VERA Analysis Report")
+        on_stage_end(name, 0.01)
+    if text == "fail":
+        raise RuntimeError("quota exceeded")
+    return InvestigationResult(
+        session_id=session_id, language=language, source_url=source_url,
+        report="# VERA Analysis Report", scores={"disinformation": 2},
+    )
+
+
+def read_events(client, investigation_id, headers=None):
+    events = []
+    with client.stream("GET", f"/investigations/{investigation_id}/events", headers=headers or {}) as response:
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[len("data: "):]))
+    return events
+
+
+class TestApi(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("vera.service.investigate", fake_investigate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_investigation_streams_agent_and_report_events(self):
+        """Test that the SSE stream carries agent start/finish, report tokens and the result."""
+        with TestClient(create_app()) as client:
+            response = client.post("/investigations", json={"text": "Some claim"})
+            self.assertEqual(response.status_code, 202)
+            investigation_id = response.json()["id"]
+
+            events = read_events(client, investigation_id)
+            types = [event["type"] for event in events]
+            self.assertEqual(types[0], "started")
+            self.assertEqual(types[-1], "completed")
+            self.assertIn({"type": "agent_start", "agent": "Researcher"},
+                          [{k: e[k] for k in ("type", "agent")} for e in events if "agent" in e])
+            deltas = "".join(e["text"] for e in events if e["type"] == "report_delta")
+            self.assertEqual(deltas, "# VERA Analysis Report")
+
+            status = client.get(f"/investigations/{investigation_id}").json()
+            self.assertEqual(status["status"], "completed")
+            self.assertEqual(status["result"]["scores"], {"disinformation": 2})
+
+            # Reconnecting clients resume after Last-Event-ID
+            resumed = read_events(client, investigation_id, headers={"Last-Event-ID": str(events[-2]["id"])})
+            self.assertEqual([e["type"] for e in resumed], ["completed"])
+
+    def test_failed_investigation_and_validation(self):
+        """Test error reporting, request validation and unknown ids."""
+        with TestClient(create_app()) as client:
+            investigation_id = client.post("/investigations", json={"text": "fail"}).json()["id"]
+            events = read_events(client, investigation_id)
+            self.assertEqual(events[-1]["type"], "failed")
+            self.assertIn("quota", events[-1]["error"])
+
+            self.assertEqual(client.post("/investigations", json={}).status_code, 400)
+            for body in ({"text": 1}, {"url": ["https://example.com"]}, {"text": "x", "language": None},
+                         {"text": "x", "source_url": {}}, ["text"], "text"):
+                response = client.post("/investigations", json=body)
+                self.assertEqual(response.status_code, 400, body)
+                self.assertIn("error", response.json())
+            self.assertEqual(client.post("/investigations", json={"text": "x", "language": "Deutsch"}).status_code, 400)
+            self.assertEqual(client.get("/investigations/missing").status_code, 404)
+
+
+class TestBackgroundInvestigations(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        async def recording_investigate(text, **kwargs):
+            self.calls.append(kwargs)
+            return await fake_investigate(text, **kwargs)
+
+        patcher = patch("vera.service.investigate", recording_investigate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_jobs_run_in_the_background_and_can_be_reattached(self):
+        """Test that a job submitted without an event loop runs to completion and is found by id."""
+        jobs = BackgroundInvestigations()
+        self.addCleanup(jobs.close)
+
+        job = jobs.submit("Some claim", language="Polski", api_key="key-a", user_id="streamlit_user")
+        deadline = time.time() + 5
+        while not job.finished and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertIs(jobs.get(job.id), job)
+        self.assertIsNone(jobs.get("missing"))
+        self.assertEqual(job.status, "completed")
+        self.assertEqual([e["type"] for e in job.events][-1], "completed")
+        # Options reach investigate() but stay out of the event log
+        self.assertEqual((self.calls[0]["api_key"], self.calls[0]["user_id"]), ("key-a", "streamlit_user"))
+        self.assertNotIn("key-a", json.dumps([job.to_dict(), job.events]))
+
+    def test_following_a_job_renders_the_final_report_once(self):
+        """Test that the UI event loop shows progress and draws the report exactly once."""
+        jobs = BackgroundInvestigations()
+        self.addCleanup(jobs.close)
+        job = jobs.submit("Some claim")
+
+        frames, progress = [], []
+        follow_investigation(
+            job, DedupRenderer(frames.append), lambda active: progress.append(list(active)), interval=0.01
+        )
+
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(frames, ["# VERA Analysis Report"])
+        self.assertEqual(progress, [["Researcher"], [], ["Reporter"], []])
+
+
+if __name__ == '__main__':
+    unittest.main()
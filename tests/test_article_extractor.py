@@ -0,0 +1,40 @@
+import unittest
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from vera.utils.article_extractor import find_article_element, iter_text
+
+CORPUS = Path(__file__).parent / "fixtures" / "news_pages"
+
+
+class TestArticleExtractor(unittest.TestCase):
+    def test_corpus_pages_extract_article_only(self):
+        """Test that every saved page yields its gold paragraphs and no navigation lists."""
+        pages = sorted(CORPUS.glob("*.html"))
+        self.assertTrue(pages)
+        for page in pages:
+            with self.subTest(page=page.stem):
+                soup = BeautifulSoup(page.read_text(encoding="utf-8"), "html.parser")
+                text = "\n".join(iter_text(find_article_element(soup)))
+                for paragraph in page.with_suffix(".txt").read_text(encoding="utf-8").split("\n\n"):
+                    self.assertIn(paragraph.strip(), text)
+                self.assertNotIn("Hospitals prepare for a difficult flu season", text)
+                self.assertNotIn("Politics", text)
+
+    def test_page_without_paragraphs(self):
+        """Test that a page without paragraphs has no article element."""
+        soup = BeautifulSoup("<html><body><div><a href='/'>Home</a></div></body></html>", "html.parser")
+        self.assertIsNone(find_article_element(soup))
+
+    def test_skipped_tags_are_not_text(self):
+        """Test that scripts and navigation never reach the extracted text."""
+        soup = BeautifulSoup(
+            "<div><script>var x = 1;</script><nav>Menu</nav><p>Body text</p><!-- comment --></div>",
+            "html.parser",
+        )
+        self.assertEqual(list(iter_text(soup.div)), ["Body text"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import io
+import json
+import unittest
+from unittest.mock import patch
+from vera.batch import read_items, run_batch
+from vera.investigation import InvestigationResult
+
+
+class TestBatch(unittest.TestCase):
+    def test_read_items_assigns_ids_and_flags_bad_lines(self):
+        """Test that input lines get ids and malformed JSON becomes an error item."""
+        items = list(read_items(['{"text": "a"}', '', 'not json', '{"id": "x", "text": "b"}']))
+        self.assertEqual([item["id"] for item in items], ["line-1", "line-3", "x"])
+        self.assertIn("error", items[1])
+
+    def test_run_batch_bounds_concurrency_and_streams_results(self):
+        """Test that at most N investigations run at once and every item yields a JSONL line."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_investigate(text, language="English", source_url=None, user_id=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if text == "fail":
+                raise RuntimeError("quota exceeded")
+            return InvestigationResult(
+                session_id="s", language=language, source_url=source_url,
+                report="# VERA Analysis Report", scores={"disinformation": 2},
+                timings_ms={"Researcher": 10},
+            )
+
+        items = [{"id": str(i), "text": "fail" if i == 3 else f"claim {i}"} for i in range(10)]
+        output = io.StringIO()
+        with patch("vera.batch.investigate", fake_investigate):
+            counts = asyncio.run(run_batch(items, output, concurrency=3))
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(max_in_flight, 3)
+        self.assertEqual(counts, {"ok": 9, "error": 1})
+        self.assertEqual(sorted(r["id"] for r in results), sorted(str(i) for i in range(10)))
+        failed = next(r for r in results if r["id"] == "3")
+        self.assertEqual(failed["status"], "error")
+        self.assertIn("quota", failed["error"])
+        ok = next(r for r in results if r["id"] == "0")
+        self.assertEqual(ok["timings_ms"], {"Researcher": 10})
+
+    def test_invalid_fields_fail_only_their_item(self):
+        """Test that non-string fields and unknown languages become per-item errors."""
+        async def fake_investigate(text, language="English", source_url=None, user_id=None):
+            return InvestigationResult(session_id="s", language=language, source_url=source_url,
+                                       report="# VERA Analysis Report", scores={})
+
+        items = [
+            {"id": "a", "text": 5},
+            {"id": "b", "text": "claim", "language": ["English"]},
+            {"id": "c", "text": "claim", "language": "Deutsch"},
+            {"id": "d", "text": "claim"},
+        ]
+        output = io.StringIO()
+        with patch("vera.batch.investigate", fake_investigate):
+            counts = asyncio.run(run_batch(items, output, concurrency=2))
+
+        errors = {r["id"]: r.get("error") for r in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(counts, {"ok": 1, "error": 3})
+        self.assertEqual(errors["a"], "'text' must be a string")
+        self.assertEqual(errors["b"], "'language' must be a string")
+        self.assertIn("language must be one of", errors["c"])
+        self.assertIsNone(errors["d"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from vera.cache import SQLiteCache, investigation_cache_key
+from helpers import FakeClock
+
+
+class TestCache(unittest.TestCase):
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are returned until their TTL passes."""
+        clock = FakeClock()
+        cache = SQLiteCache(":memory:", ttl_seconds=60, clock=clock)
+        cache.set("k", {"report": "# VERA Analysis Report"})
+        clock.now += 59
+        self.assertEqual(cache.get("k"), {"report": "# VERA Analysis Report"})
+        clock.now += 2
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the size bound evicts the least recently used entry."""
+        clock = FakeClock()
+        cache = SQLiteCache(":memory:", max_entries=2, clock=clock)
+        cache.set("a", 1)
+        clock.now += 1
+        cache.set("b", 2)
+        clock.now += 1
+        cache.get("a")  # "b" is now least recently used
+        clock.now += 1
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_cache_key_normalizes_text_only(self):
+        """Test that whitespace differences share a key but language and URL do not."""
+        key = investigation_cache_key("Vaccine X  contains\nmicrochips ", "English")
+        self.assertEqual(key, investigation_cache_key("Vaccine X contains microchips", "English"))
+        self.assertNotEqual(key, investigation_cache_key("Vaccine X contains microchips", "Polski"))
+        self.assertNotEqual(key, investigation_cache_key("Vaccine X contains microchips", "English", "https://a.pl/x"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from vera.utils.chunking import is_long_document, split_into_chunks
+
+
+class TestChunking(unittest.TestCase):
+    def test_paragraphs_are_packed_without_splitting(self):
+        """Test that sections follow paragraph boundaries and keep all text."""
+        paragraphs = [f"Paragraph {i}." + " word" * 300 for i in range(20)]
+        text = "\n\n".join(paragraphs)
+        chunks = split_into_chunks(text, chunk_chars=4000)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 4000 for chunk in chunks))
+        self.assertEqual("\n\n".join(chunks), text)
+
+    def test_section_count_is_capped(self):
+        """Test that very long documents get larger sections, not more of them."""
+        text = "\n".join("Sentence number %d is here." % i * 20 for i in range(2000))
+        chunks = split_into_chunks(text, chunk_chars=1000, max_chunks=5)
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(sum(len(chunk) for chunk in chunks) + 4, len(text))
+
+    def test_oversized_paragraph_is_split_at_sentences(self):
+        """Test that a paragraph longer than a section is cut at sentence ends."""
+        text = " ".join(f"This is sentence {i}." for i in range(200))
+        chunks = split_into_chunks(text, chunk_chars=500)
+        self.assertTrue(all(chunk.endswith(".") for chunk in chunks))
+        self.assertTrue(all(len(chunk) <= 500 for chunk in chunks))
+
+    def test_long_document_threshold(self):
+        self.assertFalse(is_long_document("short claim"))
+        self.assertTrue(is_long_document("x" * 20_000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from vera.claim_cache import ClaimVerdictCache, lookup_verdicts, store_verdicts
+from helpers import FakeClock
+
+
+# Claims with their embeddings: the first two are paraphrases of each other
+VECTORS = {
+    "Vaccine X contains microchips": [1.0, 0.1, 0.0],
+    "Microchips are hidden in vaccine X": [0.95, 0.15, 0.02],
+    "The euro was introduced in 1999": [0.0, 0.2, 1.0],
+}
+
+FINDING = {
+    "claim": "Vaccine X contains microchips",
+    "verdict": "False",
+    "sources": ["Reuters: Fact check on vaccine ingredients", "WHO: Vaccine safety"],
+    "explanation": "No vaccine contains microchips.",
+}
+
+
+async def fake_embed(claims):
+    return np.array([VECTORS[claim] for claim in claims], dtype=np.float32)
+
+
+class TestClaimCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ClaimVerdictCache(":memory:", version="v1", ttl_seconds=3600, threshold=0.9, clock=self.clock)
+
+    def test_similar_claims_are_answered_until_stale(self):
+        """Test that a paraphrase matches above the threshold, an unrelated claim does not, and verdicts expire."""
+        asyncio.run(store_verdicts(["Vaccine X contains microchips"], [FINDING], cache=self.cache, embed=fake_embed))
+        self.assertEqual(len(self.cache), 1)
+
+        findings = asyncio.run(lookup_verdicts(
+            ["The euro was introduced in 1999", "Microchips are hidden in vaccine X"],
+            cache=self.cache,
+            embed=fake_embed,
+        ))
+        self.assertIsNone(findings[0])
+        self.assertEqual(findings[1]["claim"], "Microchips are hidden in vaccine X")
+        self.assertEqual(findings[1]["verdict"], "False")
+        self.assertEqual(findings[1]["reused_from"]["claim"], "Vaccine X contains microchips")
+
+        self.clock.now += 3601
+        findings = asyncio.run(lookup_verdicts(["Microchips are hidden in vaccine X"], cache=self.cache, embed=fake_embed))
+        self.assertEqual(findings, [None])
+
+    def test_exact_matches_without_embeddings(self):
+        """Test that normalized identical claims match when the embedding API is unavailable."""
+        async def no_embed(claims):
+            return None
+
+        asyncio.run(store_verdicts(["Vaccine X contains microchips"], [FINDING], cache=self.cache, embed=no_embed))
+        records = self.cache.lookup(["vaccine x  contains microchips.", "Microchips are hidden in vaccine X"])
+        self.assertEqual(records[0]["verdict"], "False")
+        self.assertEqual(records[0]["sources"], ["Reuters: Fact check on vaccine ingredients", "WHO: Vaccine safety"])
+        self.assertIsNone(records[1])
+
+    def test_stores_extend_the_index_and_prune_expired_verdicts(self):
+        """Test that re-storing a claim replaces its verdict and expired verdicts are pruned on later stores."""
+        claims = ["Vaccine X contains microchips", "The euro was introduced in 1999"]
+        vectors = np.array([VECTORS[claim] for claim in claims], dtype=np.float32)
+        self.cache.add(claims, [FINDING, {**FINDING, "verdict": "True"}], vectors)
+        self.cache.add(claims[:1], [{**FINDING, "verdict": "True"}], vectors[:1])
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.lookup(claims[:1], vectors[:1])[0]["verdict"], "True")
+
+        self.clock.now += 3601
+        paraphrase = "Microchips are hidden in vaccine X"
+        self.cache.add([paraphrase], [FINDING], np.array([VECTORS[paraphrase]], dtype=np.float32))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache._conn.execute("SELECT COUNT(*) FROM claim_verdicts").fetchone()[0], 1)
+        self.assertEqual(self.cache.lookup(claims, vectors)[0]["claim"], paraphrase)
+        self.assertIsNone(self.cache.lookup(claims, vectors)[1])
+
+    def test_unverified_findings_are_not_stored(self):
+        """Test that only True/False verdicts are stored and other versions are ignored."""
+        unverified = {**FINDING, "verdict": "Unverified"}
+        asyncio.run(store_verdicts(["Vaccine X contains microchips"], [unverified], cache=self.cache, embed=fake_embed))
+        self.assertEqual(len(self.cache), 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            cache = ClaimVerdictCache(path, version="v1", clock=self.clock)
+            cache.add(["Vaccine X contains microchips"], [FINDING], np.array([VECTORS["Vaccine X contains microchips"]]))
+            cache.close()
+            self.assertEqual(len(ClaimVerdictCache(path, version="v1", clock=self.clock)), 1)
+            self.assertEqual(len(ClaimVerdictCache(path, version="v2", clock=self.clock)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
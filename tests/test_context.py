@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+
+from vera.context import ContextGemini, InvestigationContext, current_context, use_context
+
+
+class TestInvestigationContext(unittest.TestCase):
+    def test_concurrent_investigations_see_their_own_context(self):
+        async def investigation(key, language):
+            with use_context(InvestigationContext(api_key=key, language=language)):
+                # Tasks created inside the investigation inherit its context
+                seen = await asyncio.gather(*(worker() for _ in range(3)))
+                return key, language, seen
+
+        async def worker():
+            await asyncio.sleep(0.01)
+            context = current_context()
+            return context.api_key, context.language
+
+        async def main():
+            return await asyncio.gather(investigation("key-a", "English"), investigation("key-b", "Polski"))
+
+        for key, language, seen in asyncio.run(main()):
+            self.assertEqual(seen, [(key, language)] * 3)
+        self.assertIsNone(current_context().api_key)
+
+    def test_model_uses_the_client_of_the_current_key(self):
+        model = ContextGemini(model="gemini-2.5-flash")
+
+        async def client_for(key):
+            with use_context(InvestigationContext(api_key=key)):
+                await asyncio.sleep(0.01)
+                return model.api_client
+
+        async def main():
+            return await asyncio.gather(client_for("key-a"), client_for("key-b"), client_for("key-a"))
+
+        first, second, again = asyncio.run(main())
+        self.assertEqual(first._api_client.api_key, "key-a")
+        self.assertEqual(second._api_client.api_key, "key-b")
+        self.assertIs(first, again)
+        self.assertFalse(first.vertexai)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from vera.utils import html_parser
+from vera.utils.article_extractor import find_article_element, iter_text
+
+CORPUS = Path(__file__).parent / "fixtures" / "news_pages"
+
+
+class TestHtmlParser(unittest.TestCase):
+    def test_missing_backend_falls_back(self):
+        """Test that an uninstalled backend falls back to the next available one."""
+        with patch.object(html_parser, "available_backends", return_value=["html.parser"]):
+            self.assertEqual(html_parser.resolve_backend("selectolax"), "html.parser")
+            self.assertEqual(html_parser.resolve_backend("auto"), "html.parser")
+        with patch.object(html_parser, "available_backends", return_value=["lxml", "html.parser"]):
+            self.assertEqual(html_parser.resolve_backend("selectolax"), "lxml")
+        with self.assertRaises(ValueError):
+            html_parser.resolve_backend("regex")
+
+    def test_installed_backends_extract_the_same_article(self):
+        """Test that every installed backend finds the same article text."""
+        page = (CORPUS / "portal_cookie_banner.html").read_bytes()
+        texts = {}
+        for backend in html_parser.available_backends():
+            document, adapter = html_parser.parse_html(page, backend)
+            element = find_article_element(document, adapter)
+            texts[backend] = list(iter_text(element, adapter))
+        self.assertIn("html.parser", texts)
+        for backend, text in texts.items():
+            self.assertEqual(text, texts["html.parser"], backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from vera.utils.http import create_session
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Fails the first request with 503, then serves a gzip-compressed page."""
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.client_address[1], self.headers.get("Accept-Encoding", "")))
+        if len(self.requests_seen) == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = gzip.compress(b"<html><body><p>Article</p></body></html>")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpSession(unittest.TestCase):
+    def setUp(self):
+        FlakyHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/article"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_5xx_and_decodes_gzip_over_one_connection(self):
+        """Test that a 503 is retried on the kept-alive connection and gzip is negotiated."""
+        session = create_session(retries=2)
+        response = session.get(self.url, timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Article", response.text)
+
+        response = session.get(self.url, timeout=5)
+        self.assertEqual(response.status_code, 200)
+        ports = {port for port, _ in FlakyHandler.requests_seen}
+        self.assertEqual(len(FlakyHandler.requests_seen), 3)
+        self.assertEqual(len(ports), 1)
+        self.assertIn("gzip", FlakyHandler.requests_seen[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from vera.investigation import build_user_message, investigate
+from vera.utils.chunking import MAX_DOCUMENT_CHARS
+
+
+class TestInvestigation(unittest.TestCase):
+    def test_build_user_message_wraps_input(self):
+        """Test that user input is delimited and the source URL is excluded."""
+        msg = build_user_message("Some claim", "English", "2025-01-01 00:00:00 UTC", source_url="https://example.com/a")
+        text = msg.parts[0].text
+        self.assertIn("<<<USER_INPUT_START>>>\nSome claim\n<<<USER_INPUT_END>>>", text)
+        self.assertIn("[SOURCE URL TO VERIFY: https://example.com/a]", text)
+
+    def test_result_cache_io_runs_off_the_event_loop(self):
+        """Test that the SQLite result cache is read in a worker thread, not on the event loop."""
+        threads = []
+
+        class FakeCache:
+            def get(self, key):
+                threads.append(threading.get_ident())
+                return {"session_id": "old", "language": "English", "source_url": None,
+                        "report": "# VERA Analysis Report", "scores": {}, "cached_at": 0.0}
+
+        async def main():
+            with patch("vera.investigation.get_result_cache", return_value=FakeCache()):
+                return await investigate("Some claim"), threading.get_ident()
+
+        result, loop_thread = asyncio.run(main())
+        self.assertTrue(result.cached)
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+
+    def test_oversized_input_is_cut_to_the_document_cap(self):
+        """Test that inputs beyond MAX_DOCUMENT_CHARS are truncated before anything else sees them."""
+        seen = []
+
+        def cache_key(text, language, source_url):
+            seen.append(text)
+            return "key"
+
+        class FakeCache:
+            def get(self, key):
+                return {"session_id": "old", "language": "English", "source_url": None,
+                        "report": "# VERA Analysis Report", "scores": {}, "cached_at": 0.0}
+
+        with patch("vera.investigation.get_result_cache", return_value=FakeCache()), \
+                patch("vera.investigation.investigation_cache_key", cache_key):
+            asyncio.run(investigate("x" * (10 * MAX_DOCUMENT_CHARS)))
+        self.assertTrue(seen[0].startswith("x" * MAX_DOCUMENT_CHARS + "\n\n[Content truncated"))
+        self.assertLess(len(seen[0]), MAX_DOCUMENT_CHARS + 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from google.adk.events import Event
+from google.genai import types as genai_types
+
+from vera.metrics import StageMetrics, aggregate, estimate_cost
+from helpers import FakeClock
+
+
+def usage(prompt, output, thoughts=None, cached=None):
+    return genai_types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt,
+        candidates_token_count=output,
+        thoughts_token_count=thoughts,
+        cached_content_token_count=cached,
+    )
+
+
+class TestStageMetrics(unittest.TestCase):
+    def test_records_tokens_tools_and_first_event_times(self):
+        clock = FakeClock(100.0)
+        metrics = StageMetrics(started=clock.now, clock=clock)
+
+        clock.now += 0.5
+        call = genai_types.Part(function_call=genai_types.FunctionCall(id="c1", name="search_wikipedia", args={}))
+        metrics.record(Event(author="a", content=genai_types.Content(role="model", parts=[call]),
+                             usage_metadata=usage(1000, 20, thoughts=50)))
+        clock.now += 1.25
+        response = genai_types.Part(function_response=genai_types.FunctionResponse(
+            id="c1", name="search_wikipedia", response={"result": "..."}))
+        metrics.record(Event(author="a", content=genai_types.Content(role="user", parts=[response])))
+        clock.now += 0.25
+        text = genai_types.Content(role="model", parts=[genai_types.Part.from_text(text="Verdict")])
+        # Partial chunk: counts as the first text, its usage is repeated by the final event
+        metrics.record(Event(author="a", content=text, partial=True, usage_metadata=usage(1200, 5)))
+        metrics.record(Event(author="a", content=text, usage_metadata=usage(1200, 300, cached=1000)))
+
+        self.assertEqual(metrics.ttfe_ms, 500)
+        self.assertEqual(metrics.ttfr_ms, 2000)
+        self.assertEqual(metrics.tool_calls, 1)
+        self.assertEqual(metrics.tool_latency_ms, 1250)
+        self.assertEqual(metrics.llm_calls, 2)
+        self.assertEqual(metrics.prompt_tokens, 2200)
+        self.assertEqual(metrics.output_tokens, 320)
+        self.assertEqual(metrics.thinking_tokens, 50)
+        self.assertEqual(metrics.cached_tokens, 1000)
+        self.assertAlmostEqual(metrics.cost_usd, estimate_cost(2200, 320, 50, 1000))
+        self.assertGreater(metrics.cost_usd, 0)
+
+    def test_aggregate_sums_counters_but_not_first_event_times(self):
+        stages = [
+            {"prompt_tokens": 100, "output_tokens": 10, "tool_calls": 2, "ttfe_ms": 300, "cost_usd": 0.001},
+            {"prompt_tokens": 50, "output_tokens": 5, "llm_calls": 1, "cost_usd": 0.0005},
+        ]
+        totals = aggregate(stages)
+        self.assertEqual(totals["prompt_tokens"], 150)
+        self.assertEqual(totals["output_tokens"], 15)
+        self.assertEqual(totals["tool_calls"], 2)
+        self.assertEqual(totals["llm_calls"], 1)
+        self.assertAlmostEqual(totals["cost_usd"], 0.0015)
+        self.assertNotIn("ttfe_ms", totals)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from vera.near_duplicate import NearDuplicateIndex, hamming_distance, simhash
+from helpers import FakeClock
+
+POST = (
+    "The statistics office revised last year's economic growth figure down from 3.1 percent to 2.4 percent "
+    "after late tax data showed weaker construction activity than expected. Opposition politicians accused "
+    "the government of hiding the numbers before the election, while the office said the revision followed "
+    "its usual schedule and that similar corrections had happened in four of the last ten years."
+)
+OTHER = (
+    "Vaccine X contains microchips according to a viral video that was shared thousands of times on social "
+    "media platforms last week, but health authorities and independent laboratories found no such components "
+    "in any tested batch of the vaccine."
+)
+
+
+class TestNearDuplicate(unittest.TestCase):
+    def test_reposts_share_a_signature(self):
+        """Test that emojis, hashtags, mentions and links do not change the signature, other texts do."""
+        repost = "RT @newsbot: 🔥🔥 " + POST + " #economy #election https://t.co/abc 😡"
+        self.assertEqual(hamming_distance(simhash(POST), simhash(repost)), 0)
+        self.assertGreater(hamming_distance(simhash(POST), simhash(OTHER)), 10)
+        self.assertIsNone(simhash("Too short to fingerprint reliably."))
+
+    def test_index_matches_same_language_until_expiry(self):
+        """Test that the index finds a repost in the same language and forgets it after the TTL."""
+        clock = FakeClock()
+        index = NearDuplicateIndex(":memory:", ttl_seconds=60, clock=clock)
+        self.assertTrue(index.add("key-1", POST, "English"))
+        self.assertFalse(index.add("key-1", POST, "English"))
+        index.add("key-2", OTHER, "English")
+
+        match = index.find("#breaking " + POST + " 👀", "English")
+        self.assertEqual((match.cache_key, match.distance), ("key-1", 0))
+        self.assertIsNone(index.find(POST, "Polski"))
+        clock.now += 61
+        self.assertIsNone(index.find(POST, "English"))
+
+    def test_expired_entries_are_replaced_and_pruned(self):
+        """Test that a key can be re-added after its TTL and expired entries are dropped from the index."""
+        clock = FakeClock()
+        index = NearDuplicateIndex(":memory:", ttl_seconds=60, clock=clock)
+        index.add("key-1", POST, "English")
+        index.add("key-2", OTHER, "English")
+        clock.now += 61
+
+        self.assertTrue(index.add("key-1", POST, "English"))
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index._keys, ["key-1"])
+        self.assertEqual(index.find(POST, "English").cache_key, "key-1")
+        self.assertIsNone(index.find(OTHER, "English"))
+        self.assertEqual(index._conn.execute("SELECT COUNT(*) FROM near_duplicates").fetchone()[0], 1)
+
+    def test_index_persists_across_restarts(self):
+        """Test that signatures are reloaded from SQLite, past the initial array capacity."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            index = NearDuplicateIndex(path)
+            for i in range(100):
+                index.add(f"key-{i}", f"Variant {i}: " + OTHER.replace("last week", f"{i} days ago"), "English")
+            index.add("post", POST, "English")
+            index.close()
+
+            reloaded = NearDuplicateIndex(path)
+            self.assertEqual(len(reloaded), 101)
+            self.assertEqual(reloaded.find(POST + " #economy", "English").cache_key, "post")
+            reloaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
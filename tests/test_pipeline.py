@@ -0,0 +1,431 @@
+import asyncio
+import dataclasses
+import json
+import unittest
+from types import SimpleNamespace
+
+from google.adk.sessions import InMemorySessionService
+from google.genai import types as genai_types
+
+from vera.agents.claim_extractor import parse_claims
+from vera.cache import SQLiteCache
+from vera.checkpoints import CheckpointStore
+from vera.pipeline import (
+    InvestigationPipeline,
+    Stage,
+    StageTimeoutError,
+    StructuredOutputError,
+    USER_INPUT,
+    claim_verification_items,
+    compose_message,
+    event_text,
+    get_investigation_stages,
+    get_long_document_stages,
+    run_dag,
+    stage_role,
+    transitive_dependencies,
+    validate_stages,
+)
+
+
+def make_stages():
+    """Stage graph with the same shape as the VERA pipeline."""
+    factory = lambda: None
+    return [
+        Stage("Researcher", factory),
+        Stage("Librarian", factory, prompt="p"),
+        Stage("Analyst", factory, prompt="p"),
+        Stage("Critic", factory, prompt="p", depends_on=("Researcher", "Librarian", "Analyst")),
+        Stage("Scoring", factory, prompt="p", depends_on=("Critic",)),
+        Stage("Reporter", factory, prompt="p", depends_on=("Scoring",)),
+    ]
+
+
+class TestPipeline(unittest.TestCase):
+    def test_independent_stages_run_concurrently(self):
+        """Test that stages without dependencies overlap and dependents wait for them."""
+        active = set()
+        max_active = 0
+        order = []
+
+        async def run_stage(stage):
+            nonlocal max_active
+            active.add(stage.name)
+            max_active = max(max_active, len(active))
+            await asyncio.sleep(0.05)
+            active.discard(stage.name)
+            order.append(stage.name)
+
+        timings = asyncio.run(run_dag(make_stages(), run_stage))
+
+        self.assertEqual(max_active, 3)
+        self.assertEqual(set(order[:3]), {"Researcher", "Librarian", "Analyst"})
+        self.assertEqual(order[3:], ["Critic", "Scoring", "Reporter"])
+        self.assertEqual(set(timings), {s.name for s in make_stages()})
+
+    def test_stage_failure_cancels_pipeline(self):
+        """Test that a failing stage propagates and later stages never start."""
+        started = []
+
+        async def run_stage(stage):
+            started.append(stage.name)
+            if stage.name == "Librarian":
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.05)
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run_dag(make_stages(), run_stage))
+        self.assertNotIn("Critic", started)
+
+    def test_max_concurrency_bounds_running_stages(self):
+        """Test that no more than max_concurrency stages run at once."""
+        active = set()
+        max_active = 0
+        factory = lambda: None
+        stages = [Stage(f"Analyst-{i}", factory) for i in range(1, 7)]
+
+        async def run_stage(stage):
+            nonlocal max_active
+            active.add(stage.name)
+            max_active = max(max_active, len(active))
+            await asyncio.sleep(0.02)
+            active.discard(stage.name)
+
+        timings = asyncio.run(run_dag(stages, run_stage, max_concurrency=2))
+        self.assertEqual(max_active, 2)
+        self.assertEqual(len(timings), 6)
+
+    def test_long_document_graph(self):
+        """Test that section stages only see their section and feed the reduce stages."""
+        stages = get_long_document_stages(["<section one>", "<section two>"])
+        validate_stages(stages)
+        by_name = {stage.name: stage for stage in stages}
+
+        self.assertEqual(by_name["Researcher"].depends_on, ("Claims-1", "Claims-2"))
+        self.assertIsNotNone(by_name["Researcher"].fan_out)
+        self.assertEqual(by_name["Critic"].depends_on, ("Researcher", "Librarian", "Analyst-1", "Analyst-2"))
+        self.assertIn("<section two>", by_name["Analyst-2"].prompt)
+        self.assertNotIn("<section one>", by_name["Analyst-2"].prompt)
+        self.assertEqual(by_name["Analyst-2"].inputs, ())
+        self.assertEqual(by_name["Researcher"].inputs, ("claims_1", "claims_2"))
+        self.assertIn("analysis_report_2", by_name["Reporter"].inputs)
+        self.assertEqual(stage_role("Claims-2"), "Claims")
+        self.assertEqual(stage_role("Critic"), "Critic")
+
+    def test_claims_are_merged_by_rank_and_deduplicated(self):
+        """Test that claim lists interleave by rank, drop duplicates and keep unparseable output."""
+        section_1 = json.dumps({"claims": [{"claim": "GDP grew 3%."}, {"claim": "Unemployment fell."}]})
+        section_2 = json.dumps({"claims": [{"claim": "gdp grew  3%"}, {"claim": "Exports doubled.", "context": "2024"}]})
+        claims = parse_claims([section_1, "```json\n" + section_2 + "\n```", "not json", ""])
+
+        self.assertEqual(
+            [claim.claim for claim in claims],
+            ["GDP grew 3%.", "not json", "Unemployment fell.", "Exports doubled."],
+        )
+        self.assertEqual(len(parse_claims([section_1, section_2], limit=2)), 2)
+
+        items = claim_verification_items([section_2], source_url="https://example.com/a")
+        self.assertEqual([item.key for item in items], ["gdp grew  3%", "Exports doubled."])
+        self.assertIn("[SOURCE URL TO VERIFY: https://example.com/a]", items[1].prompt)
+        self.assertIn("Exports doubled.\nContext: 2024", items[1].prompt)
+
+    def test_fan_out_stage_runs_workers_concurrently_and_merges(self):
+        """Test that one worker runs per uncached claim, concurrently, and failures are noted in the merged output."""
+        stages = get_investigation_stages()
+        by_name = {stage.name: stage for stage in stages}
+        self.assertEqual(by_name["Researcher"].depends_on, ("Claims",))
+        self.assertEqual(by_name["Critic"].depends_on, ("Researcher", "Librarian", "Analyst"))
+
+        stored = []
+
+        async def lookup(keys):
+            return [{"claim": key, "verdict": "True", "reused_from": {}} if key == "Claim number 5" else None
+                    for key in keys]
+
+        async def store(keys, outputs):
+            stored.extend(keys)
+
+        researcher = dataclasses.replace(
+            by_name["Researcher"],
+            agent_factory=lambda: SimpleNamespace(name="ResearcherAgent"),
+            fan_out=dataclasses.replace(by_name["Researcher"].fan_out, lookup=lookup, store=store),
+        )
+        pipeline = InvestigationPipeline(
+            [Stage("Claims", lambda: None, output_key="claims"), researcher],
+            session_service=InMemorySessionService(),
+            app_name="test",
+            user_id="user",
+            session_id="session",
+        )
+        claims = {"claims": [{"claim": f"Claim number {i}"} for i in range(1, 6)]}
+        pipeline.state["claims"] = claims
+
+        active = 0
+        max_active = 0
+
+        async def run_worker(stage, agent, index, prompt):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            if index == 3:
+                raise RuntimeError("search quota")
+            return {"claim": f"Claim number {index}", "verdict": "False", "sources": ["Reuters: Fact check"]}
+
+        pipeline._run_worker = run_worker
+        forwarded = []
+        merged = asyncio.run(pipeline._run_fan_out(researcher, lambda name, event: forwarded.append(event_text(event))))
+
+        self.assertEqual(max_active, 4)
+        self.assertEqual(forwarded, [json.dumps(merged)])
+        verdicts = merged["claims"]
+        self.assertEqual([verdict["claim"] for verdict in verdicts], [f"Claim number {i}" for i in range(1, 6)])
+        self.assertEqual(verdicts[3]["verdict"], "False")
+        self.assertEqual(verdicts[2]["verdict"], "Unverified")
+        self.assertEqual(verdicts[2]["explanation"], "Verification failed (RuntimeError).")
+        self.assertIn("reused_from", verdicts[4])
+        self.assertEqual(stored, ["Claim number 1", "Claim number 2", "Claim number 4"])
+
+        pipeline.state["claims"] = json.dumps({"claims": []})
+        self.assertEqual(asyncio.run(pipeline._run_fan_out(researcher, None)), {"claims": []})
+
+    def test_invalid_structured_output_is_retried_once(self):
+        """Test that a result not matching the stage schema is retried with the errors, then fails the stage."""
+        by_name = {stage.name: stage for stage in get_investigation_stages()}
+        scoring = dataclasses.replace(by_name["Scoring"], depends_on=(), inputs=())
+        pipeline = InvestigationPipeline(
+            [scoring], session_service=InMemorySessionService(), app_name="test", user_id="user", session_id="s",
+        )
+        score = {"score": 7, "justification": "..."}
+        answers = [
+            {"disinformation": {**score, "score": 11}, "manipulation": score, "confidence": score},
+            '```json\n{"disinformation": %s, "manipulation": %s, "confidence": %s}\n```' % ((json.dumps(score),) * 3),
+        ]
+        messages = []
+
+        async def run_agent(stage, agent, session_id, message, on_event=None):
+            messages.append((session_id, message))
+            return answers.pop(0)
+
+        pipeline._run_agent = run_agent
+        result = asyncio.run(pipeline._run_validated(scoring, None, "s-Scoring", "Score it."))
+        self.assertEqual(result["disinformation"], score)
+        self.assertEqual(messages[1][0], "s-Scoring-retry")
+        self.assertIn("disinformation.score", messages[1][1])
+
+        answers[:] = ["no scores", "still no scores"]
+        with self.assertRaises(StructuredOutputError):
+            asyncio.run(pipeline._run_validated(scoring, None, "s-Scoring", "Score it."))
+
+    def test_stages_receive_only_declared_inputs(self):
+        """Test that later stages get the findings they declare, not the user text or other state."""
+        by_name = {stage.name: stage for stage in get_investigation_stages()}
+        self.assertNotIn(USER_INPUT, by_name["Scoring"].inputs)
+        self.assertNotIn(USER_INPUT, by_name["Reporter"].inputs)
+        self.assertNotIn("claims", by_name["Critic"].inputs)
+
+        message = compose_message(
+            {USER_INPUT: "<<<USER_INPUT_START>>>\ntext\n<<<USER_INPUT_END>>>", "analysis_report_2": "Fear appeal."},
+            "Provide a critique.",
+        )
+        self.assertEqual(
+            message,
+            "<<<USER_INPUT_START>>>\ntext\n<<<USER_INPUT_END>>>\n\n"
+            "### Analysis Report (section 2)\nFear appeal.\n\nProvide a critique.",
+        )
+
+        factory = lambda: None
+        with self.assertRaises(ValueError):
+            validate_stages([
+                Stage("Analyst", factory, output_key="analysis_report"),
+                Stage("Scoring", factory, inputs=("analysis_report", "critique"), depends_on=("Analyst",)),
+            ])
+
+    def test_agents_are_shared_and_read_request_values_at_run_time(self):
+        """Test that agent factories are cached and per-request values come from the session state."""
+        from vera.agents import get_analyst_agent, get_reporter_agent
+        from vera.agents.reporter import reporter_instruction
+
+        self.assertIs(get_analyst_agent(), get_analyst_agent())
+        self.assertIn("{current_datetime}", get_analyst_agent().instruction)
+        self.assertIs(get_reporter_agent(), get_reporter_agent())
+
+        instruction = reporter_instruction(SimpleNamespace(state={"language": "Polski", "current_datetime": "T1"}))
+        self.assertIn("Current date and time: T1", instruction)
+        self.assertIn("po POLSKU", instruction)
+        self.assertIn("in ENGLISH", reporter_instruction(SimpleNamespace(state={})))
+
+    def test_failed_run_resumes_from_the_first_incomplete_stage(self):
+        """Test that completed stages are checkpointed and restored instead of run again."""
+        checkpoints = CheckpointStore(SQLiteCache(":memory:", table="checkpoints"))
+        stages = [dataclasses.replace(stage, output_key=stage.name.lower()) for stage in make_stages()]
+        runs = []
+
+        def make_pipeline(fail_on=None):
+            pipeline = InvestigationPipeline(
+                stages, session_service=InMemorySessionService(), app_name="test", user_id="user",
+                session_id=f"s{len(runs)}", checkpoints=checkpoints, run_id="input-key",
+            )
+
+            async def run_stage(stage, on_event, budget):
+                runs.append(stage.name)
+                if stage.name == fail_on:
+                    raise RuntimeError("429 RESOURCE_EXHAUSTED")
+                pipeline.state[stage.output_key] = {"from": stage.name}
+
+            pipeline._run_stage = run_stage
+            return pipeline
+
+        message = genai_types.Content(role="user", parts=[genai_types.Part.from_text(text="text")])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(make_pipeline(fail_on="Critic").run(message))
+        self.assertEqual(set(runs), {"Researcher", "Librarian", "Analyst", "Critic"})
+
+        runs.clear()
+        pipeline = make_pipeline()
+        timings = asyncio.run(pipeline.run(message))
+        self.assertEqual(runs, ["Critic", "Scoring", "Reporter"])
+        self.assertEqual(pipeline.resumed, ["Researcher", "Librarian", "Analyst"])
+        self.assertEqual(pipeline.state["librarian"], {"from": "Librarian"})
+        self.assertEqual(set(timings), {"Critic", "Scoring", "Reporter"})
+
+        asyncio.run(pipeline.clear_checkpoints())
+        self.assertEqual(checkpoints.load("input-key", [stage.name for stage in stages]), {})
+
+    def test_concurrent_runs_of_one_input_keep_each_others_checkpoints(self):
+        """Test that a second run of the same input neither restores nor clears the first run's checkpoints."""
+        checkpoints = CheckpointStore(SQLiteCache(":memory:", table="checkpoints"))
+        stages = [dataclasses.replace(stage, output_key=stage.name.lower()) for stage in make_stages()]
+        names = [stage.name for stage in stages]
+
+        def make_pipeline(session_id, run_stage):
+            pipeline = InvestigationPipeline(
+                stages, session_service=InMemorySessionService(), app_name="test", user_id="user",
+                session_id=session_id, checkpoints=checkpoints, run_id="input-key",
+            )
+
+            async def record(stage, on_event, budget):
+                await run_stage(stage)
+                pipeline.state[stage.output_key] = {"from": session_id}
+
+            pipeline._run_stage = record
+            return pipeline
+
+        async def main():
+            critic_started = asyncio.Event()
+
+            async def first_stage(stage):
+                if stage.name == "Critic":
+                    critic_started.set()
+                    await asyncio.sleep(0.05)
+                    raise RuntimeError("429 RESOURCE_EXHAUSTED")
+
+            async def second_stage(stage):
+                pass
+
+            first = asyncio.create_task(make_pipeline("s1", first_stage).run(message))
+            await critic_started.wait()
+            second = make_pipeline("s2", second_stage)
+            await second.run(message)
+            await second.clear_checkpoints()
+            with self.assertRaises(RuntimeError):
+                await first
+            return second
+
+        message = genai_types.Content(role="user", parts=[genai_types.Part.from_text(text="text")])
+        second = asyncio.run(main())
+        self.assertEqual(second.resumed, [])
+        self.assertEqual(set(checkpoints.load("input-key", names)), {"Researcher", "Librarian", "Analyst"})
+        self.assertEqual(checkpoints.load("input-key", names)["Analyst"].value, {"from": "s1"})
+
+    def test_deadline_skips_and_cuts_short_optional_stages(self):
+        """Test that optional stages give way to the required ones when the deadline is near."""
+        factory = lambda: None
+        stages = [
+            Stage("A", factory, output_key="a", min_budget=0.1),
+            Stage("L", factory, output_key="l", optional=True, min_budget=0.05),
+            Stage("B", factory, depends_on=("A",), output_key="b", optional=True, min_budget=0.3),
+            Stage("C", factory, depends_on=("A", "B", "L"), output_key="c", min_budget=0.1),
+        ]
+        pipeline = InvestigationPipeline(
+            stages, session_service=InMemorySessionService(), app_name="test", user_id="user",
+            session_id="s", deadline=0.5,
+        )
+        durations = {"A": 0.3, "L": 5.0, "B": 0.0, "C": 0.0}
+        ran = []
+
+        async def run_stage(stage, on_event, budget):
+            ran.append(stage.name)
+            await asyncio.sleep(durations[stage.name])
+            pipeline.state[stage.output_key] = stage.name
+
+        pipeline._run_stage = run_stage
+        message = genai_types.Content(role="user", parts=[genai_types.Part.from_text(text="text")])
+        asyncio.run(pipeline.run(message))
+
+        self.assertEqual(pipeline.degraded, {"L": "timed_out", "B": "skipped"})
+        self.assertEqual(sorted(ran), ["A", "C", "L"])
+        self.assertEqual((pipeline.state["l"], pipeline.state["b"], pipeline.state["c"]), (None, None, "C"))
+        self.assertNotIn("### B", compose_message({"b": None, "a": "A"}, "task"))
+
+    def test_required_stages_may_use_the_whole_deadline(self):
+        """Test that a slow required stage is not cut short for later stages, and names itself when it overruns."""
+        factory = lambda: None
+        stages = [
+            Stage("A", factory, output_key="a", min_budget=0.1),
+            Stage("B", factory, depends_on=("A",), output_key="b", optional=True, min_budget=0.1),
+            Stage("C", factory, depends_on=("A", "B"), output_key="c", min_budget=0.3),
+        ]
+        durations = {"A": 0.4, "B": 0.0, "C": 0.0}
+
+        def run(deadline):
+            pipeline = InvestigationPipeline(
+                stages, session_service=InMemorySessionService(), app_name="test", user_id="user",
+                session_id="s", deadline=deadline,
+            )
+
+            async def run_stage(stage, on_event, budget):
+                await asyncio.sleep(durations[stage.name])
+                pipeline.state[stage.output_key] = stage.name
+
+            pipeline._run_stage = run_stage
+            message = genai_types.Content(role="user", parts=[genai_types.Part.from_text(text="text")])
+            asyncio.run(pipeline.run(message))
+            return pipeline
+
+        pipeline = run(deadline=0.6)
+        self.assertEqual(pipeline.degraded, {"B": "skipped"})
+        self.assertEqual(pipeline.state["c"], "C")
+
+        overrun = r"^A did not finish within 0\.2s \(the 0\.2s investigation deadline\)"
+        with self.assertRaisesRegex(StageTimeoutError, overrun):
+            run(deadline=0.2)
+
+    def test_event_text_is_not_duplicated(self):
+        """Parts present in both content and model_content are counted once."""
+        content = SimpleNamespace(parts=[SimpleNamespace(text="Werdykt: "), SimpleNamespace(text="Fałsz")])
+        self.assertEqual(event_text(SimpleNamespace(content=content, model_content=content)), "Werdykt: Fałsz")
+        self.assertEqual(event_text(SimpleNamespace(content=None, model_content=content)), "Werdykt: Fałsz")
+
+    def test_invalid_graphs_are_rejected(self):
+        """Test that unknown dependencies and cycles raise ValueError."""
+        factory = lambda: None
+        with self.assertRaises(ValueError):
+            validate_stages([Stage("A", factory, depends_on=("Missing",))])
+        with self.assertRaises(ValueError):
+            validate_stages([
+                Stage("A", factory, depends_on=("B",)),
+                Stage("B", factory, depends_on=("A",)),
+            ])
+
+    def test_transitive_dependencies_in_declaration_order(self):
+        """Test that downstream stages see every upstream stage in order."""
+        self.assertEqual(
+            transitive_dependencies(make_stages(), "Scoring"),
+            ["Researcher", "Librarian", "Analyst", "Critic"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
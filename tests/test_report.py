@@ -0,0 +1,88 @@
+import unittest
+
+from vera.report import LABELS, clean_source, render_report
+
+CLAIMS = [
+    {
+        "claim": "Vaccine X contains\nmicrochips",
+        "verdict": "False",
+        "sources": [
+            "Reuters: [Fact check](https://vertexaisearch.cloud.google.com/grounding-api-redirect/AYhp)",
+            "https://grounding-api-redirect.google.com/abc",
+            "Wikipedia: https://en.wikipedia.org/wiki/Vaccine",
+        ],
+    },
+    {"claim": "The euro was introduced in 1999", "verdict": "True", "sources": [],
+     "reused_from": {"claim": "Euro introduced 1999", "verified_on": "2026-10-01"}},
+]
+TECHNIQUES = [{"name": "Fear-mongering", "quote": "They are coming for your children", "explanation": "..."}]
+SCORES = {"disinformation": 8, "manipulation": 7, "confidence": None}
+
+
+def render(language, **overrides):
+    arguments = dict(
+        summary="The text is false.",
+        conclusion="Do not share it.",
+        scores=SCORES,
+        claims=CLAIMS,
+        techniques=TECHNIQUES,
+        critique={"concerns": ["Few sources", "One-sided", "Old data", "Dropped"], "assessment": "Solid"},
+        language=language,
+        generated_at="2026-10-17 12:00:00 UTC",
+    )
+    arguments.update(overrides)
+    return render_report(**arguments)
+
+
+class TestReport(unittest.TestCase):
+    def test_english_report_layout(self):
+        """Test that the report has all six sections, clean sources and the section limits."""
+        report = render("English")
+        headings = [line for line in report.splitlines() if line.startswith("#")]
+        self.assertEqual(headings, [
+            "# VERA Analysis Report",
+            "## 1. Executive Summary",
+            "## 2. Quantitative Assessment",
+            "## 3. Factual Verification",
+            "## 4. Potential Impact Analysis",
+            "## 5. Critical Review",
+            "## 6. Conclusion",
+        ])
+        self.assertIn("- **Claim**: Vaccine X contains microchips", report)
+        self.assertIn(
+            "  - **Source**: Reuters: Fact check; Verified via Google Search; "
+            "Wikipedia: https://en.wikipedia.org/wiki/Vaccine",
+            report,
+        )
+        self.assertNotIn("redirect", report)
+        self.assertIn("verdict reused from an earlier verification on 2026-10-01", report)
+        self.assertIn('  - **Example**: "They are coming for your children"', report)
+        self.assertNotIn("Dropped", report)
+        self.assertIn("- **Analysis Confidence**: n/a", report)
+        self.assertTrue(report.rstrip().endswith("*Report generated by VERA on 2026-10-17 12:00:00 UTC*"))
+        self.assertIn("- **Potential Disinformation Level**: 8/10\n- **Potential Manipulation Level**: 7/10", report)
+
+    def test_polish_report_and_empty_sections(self):
+        """Test Polish labels and the placeholders for sections without findings."""
+        report = render("Polski", claims=[], techniques=[], critique={"concerns": [], "assessment": "Rzetelne."})
+        self.assertIn("## 3. Weryfikacja Faktów\n" + LABELS["Polski"]["no_claims"], report)
+        self.assertIn("## 4. Analiza Potencjalnej Manipulacji\n" + LABELS["Polski"]["no_techniques"], report)
+        self.assertIn("## 5. Przegląd Krytyczny\nRzetelne.", report)
+        self.assertIn("- **Potencjalny Poziom Dezinformacji**: 8/10", report)
+        self.assertEqual(clean_source("https://grounding-api-redirect.google.com/x", LABELS["Polski"]),
+                         LABELS["Polski"]["search_source"])
+
+    def test_degraded_stages_are_noted(self):
+        """Test that stages dropped for the deadline are named under the title."""
+        report = render("English", critique=None, degraded={"Critic": "skipped", "Researcher": "truncated"})
+        self.assertIn(
+            "# VERA Analysis Report\n\n> ⚠️ Reduced analysis: to answer within the time limit, these steps "
+            "were skipped or cut short: Critic (skipped), Researcher (not every claim verified).",
+            report,
+        )
+        self.assertIn("## 5. Critical Review\n" + LABELS["English"]["review_skipped"], report)
+        self.assertNotIn("⚠️", render("English"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+
+from vera.utils.streaming import DedupRenderer
+
+
+class TestDedupRenderer(unittest.TestCase):
+    def test_identical_frames_are_not_sent_again(self):
+        frames = []
+        view = DedupRenderer(frames.append)
+
+        for html in ("idle", "Analyst", "Analyst", "Analyst", "idle"):
+            view.update(html)
+
+        self.assertEqual(frames, ["idle", "Analyst", "idle"])
+        self.assertEqual(view.frames, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
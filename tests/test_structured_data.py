@@ -0,0 +1,40 @@
+import unittest
+
+from vera.utils.structured_data import extract_structured_data, format_metadata
+
+BODY = "Article body sentence that is long enough to count as a real article. " * 6
+
+
+class TestStructuredData(unittest.TestCase):
+    def test_json_ld_article_body_and_metadata(self):
+        """Test that articleBody and metadata are read from JSON-LD and meta tags."""
+        markup = (
+            '<html><head><meta property="og:site_name" content="Ledger">'
+            '<link rel="amphtml" href="https://example.com/amp/1">'
+            '<script type="application/ld+json">[{"@type": "BreadcrumbList"}, '
+            '{"@type": ["NewsArticle"], "headline": "Headline", "datePublished": "2025-01-02", '
+            '"author": {"@type": "Person", "name": "Jan Kowalski"}, '
+            f'"articleBody": "<p>{BODY}</p>"}}]</script></head><body></body></html>'
+        )
+        data = extract_structured_data(markup)
+        self.assertEqual(data.text, BODY.strip())
+        self.assertEqual(data.metadata["title"], "Headline")
+        self.assertEqual(data.metadata["author"], "Jan Kowalski")
+        self.assertEqual(data.metadata["publisher"], "Ledger")
+        self.assertEqual(data.metadata["amp_url"], "https://example.com/amp/1")
+        self.assertEqual(
+            format_metadata(data.metadata),
+            "Title: Headline\nPublished: 2025-01-02\nAuthor: Jan Kowalski\nPublisher: Ledger",
+        )
+
+    def test_short_or_invalid_json_ld_falls_back(self):
+        """Test that teaser bodies and broken JSON do not count as article text."""
+        markup = (
+            '<script type="application/ld+json">{"@type": "NewsArticle", "articleBody": "Teaser"}</script>'
+            '<script type="application/ld+json">{not json</script>'
+        )
+        self.assertIsNone(extract_structured_data(markup).text)
+
+
+if __name__ == '__main__':
+    unittest.main()
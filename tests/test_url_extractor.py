@@ -0,0 +1,98 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from vera.utils.url_extractor import collect_text, extract_text_from_url, get_extraction_stats
+
+CORPUS = Path(__file__).parent / "fixtures" / "news_pages"
+
+PARAGRAPH = "<p>" + "Disinformation spreads faster than corrections. " * 4 + "</p>\n"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves a PDF at /report.pdf, corpus pages at /corpus/<name> and a ~5 MB article elsewhere."""
+    bytes_sent = 0
+
+    def do_GET(self):
+        if self.path.startswith("/corpus/"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            body = (CORPUS / (self.path.split("/")[-1] + ".html")).read_bytes()
+        elif self.path.endswith(".pdf"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.end_headers()
+            body = b"%PDF-1.4" + b"0" * 1_000_000
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.end_headers()
+            body = ("<html><body><article>" + PARAGRAPH * 25_000 + "</article></body></html>").encode()
+        try:
+            for start in range(0, len(body), 65536):
+                self.wfile.write(body[start:start + 65536])
+                PageHandler.bytes_sent += min(65536, len(body) - start)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUrlExtractor(unittest.TestCase):
+    def setUp(self):
+        PageHandler.bytes_sent = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_non_html_content_is_rejected(self):
+        """Test that a PDF is rejected from its Content-Type."""
+        success, message = extract_text_from_url(self.base + "/report.pdf")
+        self.assertFalse(success)
+        self.assertIn("application/pdf", message)
+
+    def test_large_page_download_is_capped(self):
+        """Test that a huge page is read only up to the byte ceiling and still extracted."""
+        success, text = extract_text_from_url(self.base + "/article", max_bytes=200_000)
+        self.assertTrue(success)
+        self.assertIn("Disinformation spreads faster", text)
+        self.assertTrue(text.endswith("[Content truncated due to length...]"))
+
+    def test_json_ld_fast_path(self):
+        """Test that JSON-LD pages are served from structured data with publication metadata."""
+        before = get_extraction_stats()
+        success, text = extract_text_from_url(self.base + "/corpus/jsonld_news_article")
+        self.assertTrue(success)
+        self.assertTrue(text.startswith("Title: Statistics office revises growth figure down\n"))
+        self.assertIn("Published: 2025-05-14T09:30:00+02:00", text)
+        self.assertIn("revised last year's economic growth figure down", text)
+        self.assertNotIn("Economy", text)
+        self.assertEqual(get_extraction_stats()["json-ld"], before.get("json-ld", 0) + 1)
+
+        success, text = extract_text_from_url(self.base + "/corpus/classic_article_body")
+        self.assertTrue(success)
+        self.assertEqual(get_extraction_stats()["article"], before.get("article", 0) + 1)
+
+    def test_collect_text_stops_at_limit(self):
+        """Test that text collection stops consuming fragments past the limit."""
+        consumed = []
+
+        def fragments():
+            for i in range(1000):
+                consumed.append(i)
+                yield "x" * 10
+
+        text = collect_text(fragments(), limit=100)
+        self.assertLess(len(consumed), 20)
+        self.assertGreater(len(text), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
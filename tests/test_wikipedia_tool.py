@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from vera.agents import wikipedia_tool
+from vera.cache import MemoryLRUCache
+
+
+def api_response(pages):
+    return httpx.Response(200, json={"batchcomplete": True, "query": {"pages": pages}})
+
+
+class TestWikipediaTool(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.handler = None
+        self.memory_patch = patch.object(wikipedia_tool, "_memory_cache", MemoryLRUCache())
+        self.memory_patch.start()
+        self.client_patch = patch.object(wikipedia_tool, "_get_client", self.make_client)
+        self.client_patch.start()
+        self.env_patch = patch.dict(os.environ, {"VERA_CACHE_TTL_SECONDS": "0"})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.memory_patch.stop()
+        self.client_patch.stop()
+        self.env_patch.stop()
+
+    def make_client(self):
+        async def transport(request):
+            self.requests.append(request)
+            return await self.handler(request)
+        return httpx.AsyncClient(transport=httpx.MockTransport(transport))
+
+    def search(self, query):
+        return asyncio.run(wikipedia_tool.search_wikipedia(query))
+
+    def test_single_request_and_cached_repeat(self):
+        """Test that a lookup is one API request and a normalized repeat hits the cache."""
+        async def handler(request):
+            return api_response([
+                {"index": 2, "title": "Warsaw Pact", "fullurl": "https://en.wikipedia.org/wiki/Warsaw_Pact"},
+                {
+                    "index": 1,
+                    "title": "Warsaw",
+                    "fullurl": "https://en.wikipedia.org/wiki/Warsaw",
+                    "extract": "Warsaw is the capital of Poland.",
+                },
+            ])
+        self.handler = handler
+
+        result = self.search("Warsaw")
+        self.assertEqual(
+            result,
+            "**Warsaw**\n\nWarsaw is the capital of Poland.\n\nSource: https://en.wikipedia.org/wiki/Warsaw",
+        )
+        self.assertEqual(self.search("  warsaw "), result)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0].url.params["gsrsearch"], "Warsaw")
+
+    def test_disambiguation_lists_options(self):
+        """Test that a disambiguation page returns the search results as options."""
+        async def handler(request):
+            return api_response([
+                {"index": 1, "title": "Mercury", "pageprops": {"disambiguation": ""}},
+                {"index": 2, "title": "Mercury (planet)"},
+            ])
+        self.handler = handler
+
+        self.assertEqual(
+            self.search("Mercury"),
+            "Disambiguation needed for 'Mercury'. Options: Mercury, Mercury (planet)",
+        )
+
+    def test_errors_are_not_cached(self):
+        """Test that network errors are reported and retried on the next call."""
+        async def failing(request):
+            raise httpx.ConnectError("offline")
+
+        async def empty(request):
+            return api_response([])
+
+        self.handler = failing
+        self.assertIn("Error searching Wikipedia", self.search("Warsaw"))
+        self.handler = empty
+        self.assertEqual(self.search("Warsaw"), "No Wikipedia results found for 'Warsaw'.")
+        self.assertEqual(len(self.requests), 2)
+
+    def test_language_cannot_redirect_the_request_host(self):
+        """Test that only language edition codes reach the API URL (the model chooses the language)."""
+        async def handler(request):
+            return api_response([{"index": 1, "title": "Warszawa", "extract": "Stolica Polski."}])
+        self.handler = handler
+
+        for language in ("evil.example#", "en.evil.example", "EN", "pl/../x", ""):
+            result = asyncio.run(wikipedia_tool.search_wikipedia("Warszawa", language=language))
+            self.assertIn("invalid language code", result)
+            with self.assertRaises(ValueError):
+                asyncio.run(wikipedia_tool.fetch_wikipedia("Warszawa", language))
+        self.assertEqual(self.requests, [])
+
+        self.assertIn("Stolica Polski.", asyncio.run(wikipedia_tool.search_wikipedia("Warszawa", language="pl")))
+        self.assertEqual(self.requests[0].url.host, "pl.wikipedia.org")
+
+    def test_lookups_in_one_turn_overlap(self):
+        """Test that concurrent lookups do not block each other."""
+        async def slow(request):
+            await asyncio.sleep(0.2)
+            return api_response([])
+        self.handler = slow
+
+        async def lookup_all():
+            return await asyncio.gather(*(wikipedia_tool.search_wikipedia(q) for q in ("a", "b", "c")))
+
+        start = time.monotonic()
+        asyncio.run(lookup_all())
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(len(self.requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
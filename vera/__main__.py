@@ -0,0 +1,63 @@
+"""
+VERA command line interface.
+
+Usage:
+    python -m vera batch --input items.jsonl --concurrency 8 [--output results.jsonl]
+    python -m vera serve [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import os
+import sys
+
+from vera.utils.logging_config import setup_logging
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m vera", description="VERA - Virtual Evidence & Reality Assessment")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Run investigations for every item of a JSONL file")
+    batch.add_argument("--input", required=True, help="JSONL file with one item per line ('-' for stdin)")
+    batch.add_argument("--output", default="-", help="JSONL file for results (default: stdout)")
+    batch.add_argument("--concurrency", type=int, default=4, help="Maximum investigations in flight (default: 4)")
+    batch.add_argument("--language", default="English", choices=["English", "Polski"], help="Default report language")
+    batch.add_argument("--api-key", default=None, help="Google API key (default: GOOGLE_API_KEY environment variable)")
+    batch.add_argument("--log-level", default="INFO", help="Log level for the JSON log file")
+
+    serve = subparsers.add_parser("serve", help="Run the HTTP API (POST /investigations, SSE event streams)")
+    serve.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    serve.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    serve.add_argument("--api-key", default=None, help="Google API key (default: GOOGLE_API_KEY environment variable)")
+    serve.add_argument("--log-level", default="INFO", help="Log level")
+
+    args = parser.parse_args(argv)
+
+    api_key = args.api_key or os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        parser.error("a Google API key is required (--api-key or GOOGLE_API_KEY)")
+    os.environ["GOOGLE_API_KEY"] = api_key
+    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "False"  # Use AI Studio
+
+    if args.command == "batch":
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+
+        # Console logging would interleave with JSONL results on stdout
+        setup_logging(log_level=args.log_level, enable_console=False, enable_file=True)
+
+        from vera.batch import run_batch_cli
+        return run_batch_cli(args.input, args.output, args.concurrency, args.language)
+
+    if args.command == "serve":
+        import uvicorn
+
+        setup_logging(log_level=args.log_level, enable_console=True, enable_file=True)
+        uvicorn.run("vera.api:app", host=args.host, port=args.port, log_level=args.log_level.lower())
+        return 0
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
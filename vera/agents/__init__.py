@@ -4,3 +4,4 @@ from .critic import get_critic_agent
 from .scoring import get_scoring_agent
 from .reporter import get_reporter_agent
 from .librarian import get_librarian_agent
+from .claim_extractor import get_claim_extractor_agent
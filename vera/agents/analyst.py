@@ -11,7 +11,7 @@ Key responsibilities:
 - Assess the intent behind the message
 
 Model: gemini-2.5-flash
-Output: Detailed analysis report with examples
+Output: JSON matching AnalysisReport
 """
 
 """
@@ -25,22 +25,44 @@ Design Decision: Pure LLM analysis (no tools) to focus on reasoning and
 pattern recognition rather than fact-checking.
 """
 
+import functools
+from typing import List
+
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
 from google.genai import types
+from pydantic import BaseModel, Field
+
+from vera.context import ContextGemini
 from vera.utils.logging_config import get_agent_logger
+from .config import MODEL_NAME
 
 # Initialize logger for this agent - enables per-agent log files
 logger = get_agent_logger("Analyst")
 
 
+class Technique(BaseModel):
+    """A manipulation technique found in the text."""
+    name: str = Field(description="Technique or rhetorical device, e.g. fear-mongering")
+    quote: str = Field(description="Exact quote from the text that uses it")
+    explanation: str = Field(description="How the quote uses the technique")
+
+
+class AnalysisReport(BaseModel):
+    """Structured output of the Analyst."""
+    techniques: List[Technique] = Field(default_factory=list, description="Most significant first")
+    sentiment: str = Field(description="Sentiment and tone of the text")
+    intent: str = Field(description="Likely intent behind the message")
+    summary: str = Field(description="Two or three sentences on how manipulative the text is overall")
+
+
+@functools.cache
 def get_analyst_agent() -> Agent:
     """
     Creates and returns the Analyst Agent (The Manipulation Detector).
     
-    This agent runs third in the workflow, after Researcher and Librarian,
-    to analyze manipulation techniques using the factual context provided
-    by previous agents.
+    This agent runs concurrently with Researcher and Librarian at the start
+    of the workflow. Manipulation techniques are visible in the original
+    text itself, so it does not wait for the factual context.
     
     Design Decision: No tools - relies on LLM's reasoning capabilities to
     identify patterns of manipulation, propaganda, and logical fallacies.
@@ -49,23 +71,19 @@ def get_analyst_agent() -> Agent:
         Agent: Configured Analyst agent for manipulation detection
     """
     logger.info("Initializing AnalystAgent")
-    
-    # Get current datetime from environment
-    import os
-    current_datetime = os.environ.get("VERA_CURRENT_DATETIME", "Unknown")
 
     return Agent(
         name="AnalystAgent",
-        model=Gemini(
-            model="gemini-2.5-flash"  # Fast model sufficient for pattern recognition
+        model=ContextGemini(
+            model=MODEL_NAME  # Fast model sufficient for pattern recognition
         ),
         description="Analyzes manipulation techniques and propaganda",
         
         # Instruction prompt focuses on psychological manipulation
-        # Key design: Builds on Researcher's facts to identify how truth is twisted
+        # Key design: Works on the original text only, so it can run alongside Researcher
         instruction=f"""You are the Analyst Agent. Your goal is to identify manipulation techniques.
 
-Current date and time: {current_datetime}
+Current date and time: {{current_datetime}}
 
 Responsibilities:
 1. Identify rhetorical devices (loaded language, appeals to emotion, false dichotomies).
@@ -73,6 +91,10 @@ Responsibilities:
 3. Analyze sentiment and tone.
 4. Assess the intent behind the message.
 
-Provide a detailed analysis with examples from the text.""",
+Answer with a JSON object: "techniques" (each with its name, an exact quote from the text and
+an explanation; empty if there are none), "sentiment", "intent" and a short "summary".""",
+        output_schema=AnalysisReport,
+        output_key="analysis_report",
+        include_contents="none",
 
     )
@@ -0,0 +1,22 @@
+"""
+Shared agent configuration.
+
+MODEL_NAME and PROMPT_VERSION identify what produced an investigation's
+output; the result cache keys on both so a model switch or prompt change
+never serves stale reports.
+"""
+
+# Gemini model used by every VERA agent
+MODEL_NAME = "gemini-2.5-flash"
+
+# Approximate USD prices per million tokens, for cost estimates in the metrics
+# (vera/metrics.py); thinking tokens are billed as output. Update with the price list.
+PRICING = {
+    "gemini-2.5-flash": {"input": 0.30, "cached": 0.03, "output": 2.50},
+}
+
+# Gemini model embedding claims for the claim verdict cache (vera/claim_cache.py)
+EMBEDDING_MODEL = "gemini-embedding-001"
+
+# Bump whenever any agent instruction or the stage graph changes meaningfully
+PROMPT_VERSION = "6"
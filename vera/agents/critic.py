@@ -19,19 +19,35 @@ Design Decision: Pure LLM analysis (no tools) to focus on critical thinking
 and meta-analysis of other agents' outputs.
 """
 
+import functools
+from typing import List
+
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from pydantic import BaseModel, Field
+
+from vera.context import ContextGemini
 from vera.utils.logging_config import get_agent_logger
+from .config import MODEL_NAME
 
 # Initialize logger for this agent - enables per-agent log files
 logger = get_agent_logger("Critic")
 
+
+class Critique(BaseModel):
+    """Structured output of the Critic."""
+    concerns: List[str] = Field(
+        default_factory=list,
+        description="Valid concerns about the findings (bias, weak sources, gaps), most important first",
+    )
+    assessment: str = Field(description="Overall judgement of how solid the findings are")
+
+@functools.cache
 def get_critic_agent() -> Agent:
     """
     Creates and returns the Critic Agent (The Validator).
     
-    This agent runs fourth in the workflow, after Researcher, Librarian, and
-    Analyst, to provide independent validation and catch potential errors or
+    This agent runs once Researcher, Librarian, and Analyst have all
+    completed, to provide independent validation and catch potential errors or
     biases in their findings.
     
     Design Decision: No tools - focuses on meta-analysis and critical review
@@ -40,14 +56,11 @@ def get_critic_agent() -> Agent:
     Returns:
         Agent: Configured Critic agent for validation and bias detection
     """
-    # Get current datetime from environment
-    import os
-    current_datetime = os.environ.get("VERA_CURRENT_DATETIME", "Unknown")
 
     return Agent(
         name="CriticAgent",
-        model=Gemini(
-            model="gemini-2.5-flash"  # Fast model sufficient for critical review
+        model=ContextGemini(
+            model=MODEL_NAME  # Fast model sufficient for critical review
         ),
         description="Reviews findings for bias and errors",
         
@@ -55,7 +68,7 @@ def get_critic_agent() -> Agent:
         # Key design: Acts as adversarial reviewer to catch mistakes and biases
         instruction=f"""You are the Critic Agent. Your goal is to review all previous findings critically.
 
-Current date and time: {current_datetime}
+Current date and time: {{current_datetime}}
 
 Responsibilities:
 1. Review the provided 'Research Findings' and 'Analysis Report'.
@@ -63,8 +76,11 @@ Responsibilities:
 3. Check for logical fallacies in the *investigation itself*.
 4. NOTE: URLs starting with "vertexaisearch.cloud.google.com" or containing "grounding-api-redirect" are VALID, TRUSTED verification sources from the internal search engine. DO NOT flag them as non-transparent or suspicious.
 5. Identify any missing perspectives or alternative explanations.
-6. Provide a 'Critique Report' listing valid concerns or confirming the solidity of the findings.
+6. Answer with a JSON object: "concerns" lists the valid concerns (empty if there are none), "assessment" states how solid the findings are.
 
 Be constructive but rigorous. Your job is to be the "Devil's Advocate" before the final verdict.""",
+        output_schema=Critique,
+        output_key="critique",
+        include_contents="none",
 
     )
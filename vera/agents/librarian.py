@@ -12,21 +12,26 @@ Design Decision: Separated from Researcher to avoid tool conflicts between
 Google Search (Grounding API) and Wikipedia in a single agent.
 """
 
+import functools
+
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
 from google.genai import types
 from .wikipedia_tool import search_wikipedia
+from vera.context import ContextGemini
 from vera.utils.logging_config import get_agent_logger
+from .config import MODEL_NAME
 
 # Initialize logger for this agent - enables per-agent log files
 logger = get_agent_logger("Librarian")
 
+@functools.cache
 def get_librarian_agent() -> Agent:
     """
     Creates and returns the Librarian Agent (The Context Provider).
     
-    This agent runs second in the workflow, after Researcher, to provide
-    encyclopedic context and definitions for terms mentioned in the text.
+    This agent runs concurrently with Researcher and Analyst at the start of
+    the workflow, providing encyclopedic context and definitions for terms
+    mentioned in the text. It only needs the original user input.
     
     Design Decision: Uses only Wikipedia to provide stable, encyclopedic
     knowledge. Avoids real-time news to prevent overlap with Researcher.
@@ -45,14 +50,10 @@ def get_librarian_agent() -> Agent:
         http_status_codes=[429, 500, 503, 504],  # Retry on rate limit and server errors
     )
     
-    # Get current datetime from environment
-    import os
-    current_datetime = os.environ.get("VERA_CURRENT_DATETIME", "Unknown")
-    
     return Agent(
         name="LibrarianAgent",
-        model=Gemini(
-            model="gemini-2.5-flash",  # Fast, cost-effective model for context retrieval
+        model=ContextGemini(
+            model=MODEL_NAME,  # Fast, cost-effective model for context retrieval
             retry_options=retry_config
         ),
         description="Provides context and definitions using Wikipedia",
@@ -61,11 +62,12 @@ def get_librarian_agent() -> Agent:
         # Key design: Complements Researcher by providing depth, not breadth
         instruction=f"""You are the Librarian Agent. Your goal is to provide encyclopedic context.
 
-Current date and time: {current_datetime}
+Current date and time: {{current_datetime}}
 
 Responsibilities:
 1. Identify key terms, concepts, or entities in the text that need context.
 2. Use `search_wikipedia` to find definitions, background info, and historical context.
+   Look up all terms you need in the same turn - the searches run in parallel.
 3. Focus on providing depth and understanding, not real-time news.
 4. Provide a 'Librarian Report' with Wikipedia summaries.
 
@@ -82,4 +84,6 @@ Be concise but informative. Focus on terms that help understand the text better.
         # Tools: Only Wikipedia to avoid conflicts
         # Design Decision: Custom tool implementation for better control over results
         tools=[search_wikipedia],
+        output_key="librarian_report",
+        include_contents="none",
     )
@@ -1,106 +1,46 @@
 """
-Reporter Agent - Final Report Generator
-
-Takes outputs from all analysis agents and generates the final
-formatted investigation report following VERA's standard template.
 Reporter Agent - Final Report Synthesis
 
-This agent is the final step in the workflow, synthesizing all findings from
-previous agents (Researcher, Librarian, Analyst, Critic, Scoring) into a
-comprehensive, structured markdown report for the user.
+This agent is the final step in the workflow. It reads the findings of the
+previous agents (Researcher, Librarian, Analyst, Critic, Scoring) and writes
+the two parts of the report that need judgement: the executive summary and
+the conclusion. Every other section (scores, claim verdicts, techniques,
+critical review) is rendered from the structured findings by
+`vera/report.py`, so this call is short and the report layout is fixed.
 
 Design Decision: Pure LLM analysis (no tools) to focus on synthesis,
 communication, and creating a coherent narrative from diverse analyses.
 """
 
+import functools
+
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents.readonly_context import ReadonlyContext
+from pydantic import BaseModel, Field
+
+from vera.context import ContextGemini
 from vera.utils.logging_config import get_agent_logger
+from .config import MODEL_NAME
 
 # Initialize logger for this agent - enables per-agent log files
 logger = get_agent_logger("Reporter")
 
-def get_reporter_agent(language: str = "English") -> Agent:
-    """
-    Creates and returns the Reporter Agent (The Synthesizer).
-    
-    This agent runs last in the workflow, after all analysis is complete,
-    to create a user-friendly markdown report that combines all findings
-    into a coherent narrative.
-    
-    Design Decision: No tools - focuses on synthesis and communication.
-    Language parameter allows for multilingual reports (English/Polish).
-    
-    Args:
-        language: Report language ("English" or "Polski")
-        
-    Returns:
-        Agent: Configured Reporter agent for final report generation
-    """
-    logger.info(f"Initializing ReporterAgent (language={language})")
-    
-    # Language-specific instructions for report generation
-    # Ensures report is in user's preferred language
-    if language == "Polski":
-        lang_instruction = """🇵🇱 ABSOLUTNIE KRYTYCZNE WYMAGANIE JĘZYKOWE 🇵🇱
-
-MUSISZ napisać CAŁY raport w języku POLSKIM. To oznacza:
-
-1. WSZYSTKIE nagłówki sekcji w POLSKIM:
-   - "# Raport Analizy VERA" (NIE "# VERA Analysis Report")
-   - "## 1. Podsumowanie" (NIE "## 1. Executive Summary")
-   - "## 2. Ocena Ilościowa" (NIE "## 2. Quantitative Assessment")
-   - "## 3. Weryfikacja Faktów" (NIE "## 3. Factual Verification")
-   - "## 4. Analiza Potencjalnej Manipulacji" (NIE "## 4. Potential Manipulation Analysis")
-   - "## 5. Przegląd Krytyczny" (NIE "## 5. Critical Review")
-   - "## 6. Wnioski" (NIE "## 6. Conclusion")
-
-2. WSZYSTKIE podsekcje w POLSKIM:
-   - "**Twierdzenie**:" (NIE "**Claim**:")
-   - "**Werdykt**:" (NIE "**Verdict**:")
-   - "**Źródło**:" (NIE "**Source**:")
-     🚨 KRYTYCZNE: Przed dodaniem źródła, sprawdź czy NIE zawiera:
-       ❌ "grounding-api-redirect.google.com" → USUŃ URL, zostaw tylko opis
-       ❌ "vertexaisearch.cloud.google.com" → USUŃ URL, zostaw tylko opis
-       ✅ Wikipedia URLs są OK (stabilne linki)
-       ✅ Format: "BBC News: Tytuł artykułu" (BEZ URL jeśli był redirect)
-   - "**Technika**:" (NIE "**Technique**:")
-   - "**Przykład**:" (NIE "**Example**:")
-
-3. CAŁY tekst w POLSKIM:
-   - Wszystkie zdania
-   - Wszystkie opisy
-   - Wszystkie punkty wypunktowane
-   - Wszystkie cytaty i przykłady
-
-4. Wartości liczbowe (scores) pozostają bez zmian: "8/10"
-
-PRZYKŁAD POPRAWNEGO NAGŁÓWKA:
-"# Raport Analizy VERA
-
-## 1. Podsumowanie
-Treść analizy jest wysoce podejrzana..."
-
-JEŚLI NAPISZESZ COKOLWIEK PO ANGIELSKU, TO BŁĄD!
-"""
-    else:
-        lang_instruction = """LANGUAGE REQUIREMENT: 
-Write the entire report in ENGLISH language. All headers, text, and labels must be in English."""
-    
-    # Get current datetime from environment
-    import os
-    current_datetime = os.environ.get("VERA_CURRENT_DATETIME", "Unknown")
 
-    return Agent(
-        name="ReporterAgent",
-        model=Gemini(
-            model="gemini-2.5-flash"  # Fast model sufficient for report synthesis
-        ),
-        description="Synthesizes all findings into a comprehensive markdown report",
-        
-        # Instruction prompt focuses on synthesis and communication
-        # Key design: Creates structured markdown report for easy reading
-        instruction=f"""You are the Reporter Agent. Your goal is to create a final comprehensive report.
+class ReportSummary(BaseModel):
+    """Structured output of the Reporter: the prose sections of the report."""
+    summary: str = Field(description="Executive summary: max 4 sentences (up to 80 words)")
+    conclusion: str = Field(description="Conclusion: 2-3 short paragraphs (up to 100 words in total)")
+
+
+# Language-specific instructions for report generation
+# Ensures report is in user's preferred language
+LANGUAGE_INSTRUCTIONS = {
+    "Polski": """🇵🇱 WYMAGANIE JĘZYKOWE: Napisz podsumowanie i wnioski WYŁĄCZNIE po POLSKU.
+Wszystkie zdania muszą być w języku polskim. JEŚLI NAPISZESZ COKOLWIEK PO ANGIELSKU, TO BŁĄD!""",
+    "English": """LANGUAGE REQUIREMENT: Write the summary and conclusion in ENGLISH.""",
+}
+
+INSTRUCTION = """You are the Reporter Agent. Your goal is to write the summary and conclusion of the final report.
 
 Current date and time: {current_datetime}
 
@@ -108,94 +48,64 @@ Current date and time: {current_datetime}
 
 You will receive:
 - Research Findings (from ResearcherAgent)
-- Librarian Report (from LibrarianAgent)  
+- Librarian Report (from LibrarianAgent)
 - Analysis Report (from AnalystAgent)
 - Critique (from CriticAgent)
 - Scores (from ScoringAgent)
 
-Your task is to synthesize ALL findings into a CONCISE, SCANNABLE markdown report with these sections:
-
-# VERA Analysis Report
-
-## 1. Executive Summary
-**Max 4 sentences (up to 80 words).** Brief verdict: Is this content credible, questionable, or false?
-
-## 2. Quantitative Assessment
-Display the three scores from ScoringAgent (exact format):
-- **Potential Disinformation Level**: X/10
-- **Potential Manipulation Level**: X/10
-- **Analysis Confidence**: X/10
-
-## 3. Factual Verification
-**Max 2-5 key claims.** For each claim:
-- **Claim**: [brief statement]
-  - **Verdict**: True/False/Unverified
-  - **Source**: [EXTRACT citation from Researcher's findings OR Librarian's Wikipedia links]
-
-🚨 CRITICAL URL SAFETY NET 🚨
+Research Findings, Analysis Report, Critique and Scores are JSON objects; use their fields directly.
+The scores, claim verdicts, techniques and concerns are shown to the reader in their own
+report sections - do not list them again.
 
-Before including ANY source citation, you MUST validate it:
+Answer with a JSON object:
+- "summary": **Max 4 sentences (up to 80 words).** Brief verdict: Is this content credible, questionable, or false?
+- "conclusion": **Max 2-3 short paragraphs (up to 100 words total).** Final verdict with actionable recommendation.
 
-STEP 1: CHECK for broken redirect URLs
-  ❌ If source contains "grounding-api-redirect.google.com" → REMOVE the URL
-  ❌ If source contains "vertexaisearch.cloud.google.com" → REMOVE the URL
-  ❌ If source contains "redirect" in domain → REMOVE the URL
-
-STEP 2: CLEAN the citation
-  ✅ If you removed a URL, keep only the descriptive text:
-     - "BBC News: [Article Title]" (NO URL)
-     - "Reuters: [Description]" (NO URL)
-     - "Verified via Google Search: [Title]" (NO URL)
-  
-  ✅ If the source is from Wikipedia (Librarian), keep the full Wikipedia URL - these are stable
-
-STEP 3: FORMAT properly
-  - **Source**: BBC News: Article about climate change
-  - **Source**: Verified via Google Search: WHO pandemic report
-  - **Source**: https://en.wikipedia.org/wiki/Topic_Name (Wikipedia URLs are OK)
-
-EXAMPLES OF CORRECT CLEANING:
-
-❌ BEFORE (BAD): 
-  - **Source**: [Article](https://vertexaisearch.cloud.google.com/grounding-api-redirect/...)
-
-✅ AFTER (GOOD):
-  - **Source**: BBC News: Climate change report from December 2024
-
-❌ BEFORE (BAD):
-  - **Source**: https://grounding-api-redirect.google.com/AYHp...
-
-✅ AFTER (GOOD):
-  - **Source**: Verified via Google Search: Economic analysis report
-
-REMEMBER: It's BETTER to have NO URL than a BROKEN URL. Credibility depends on working sources!
+**CRITICAL RULES:**
+- Plain sentences: no headings, no bullet lists, no URLs
+- Be CONCISE - respect word limits strictly
+- Stay consistent with the scores and verdicts you were given
+- NO preamble, NO meta-commentary
+"""
 
 
-## 4. Potential Impact Analysis
-** 2-5 techniques.** For each:
-- **Technique**: [name]
- -- **Example**: [one specific quote from text]
+def reporter_instruction(context: ReadonlyContext) -> str:
+    """Instruction provider: the report language and date come from the session state."""
+    language = context.state.get("language", "English")
+    return INSTRUCTION.format(
+        current_datetime=context.state.get("current_datetime", "Unknown"),
+        lang_instruction=LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS["English"]),
+    )
 
-## 5. Critical Review
-**Max 3 bullet points (50 words total).** Key concerns from Critic about potential biases or gaps.
 
-## 6. Conclusion
-**Max 2-3 paragraphs (up 100 words total).** Final verdict with actionable recommendation.
+@functools.cache
+def get_reporter_agent() -> Agent:
+    """
+    Creates and returns the Reporter Agent (The Synthesizer).
 
----
+    This agent runs last in the workflow, after all analysis is complete,
+    to write the executive summary and conclusion of the report.
 
-**IMPORTANT**: At the very end of the report, add a footer with the current datetime:
+    Design Decision: No tools - focuses on synthesis and communication.
+    The report language (English/Polish) is read from the session state
+    at run time, so one agent serves every language.
 
-*Report generated by VERA on {current_datetime}*
+    Returns:
+        Agent: Configured Reporter agent for the report prose
+    """
+    logger.info("Initializing ReporterAgent")
 
----
+    return Agent(
+        name="ReporterAgent",
+        model=ContextGemini(
+            model=MODEL_NAME  # Fast model sufficient for report synthesis
+        ),
+        description="Writes the executive summary and conclusion of the final report",
 
-**CRITICAL FORMATTING RULES:**
-- Use markdown: headers (##), bold (**text**), bullet points (-)
-- Be CONCISE - respect word limits strictly
-- Use specific quotes/examples, not generalizations
-- Make it SCANNABLE - busy readers should grasp it in 30 seconds
-- NO preamble, NO meta-commentary, ONLY the report
-""",
-        output_key="final_report",
+        # Instruction prompt focuses on synthesis and communication
+        # Key design: The report layout is rendered in code; only the prose is written here
+        instruction=reporter_instruction,
+        output_schema=ReportSummary,
+        output_key="report_summary",
+        include_contents="none",
     )
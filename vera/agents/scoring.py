@@ -9,13 +9,32 @@ Design Decision: Pure LLM analysis (no tools) to focus on synthesis and
 scoring based on all available context from previous agents.
 """
 
+import functools
+
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from pydantic import BaseModel, Field
+
+from vera.context import ContextGemini
 from vera.utils.logging_config import get_agent_logger
+from .config import MODEL_NAME
 
 # Initialize logger for this agent - enables per-agent log files
 logger = get_agent_logger("Scoring")
 
+
+class Score(BaseModel):
+    """One 1-10 score with its reasoning."""
+    score: int = Field(ge=1, le=10, description="Score from 1 to 10")
+    justification: str = Field(description="One or two sentences explaining the score")
+
+
+class Scores(BaseModel):
+    """Structured output of the Scoring agent."""
+    disinformation: Score = Field(description="Potential Disinformation Level (1=truthful, 10=completely false)")
+    manipulation: Score = Field(description="Potential Manipulation Level (1=neutral, 10=highly manipulative)")
+    confidence: Score = Field(description="Analysis Confidence (1=uncertain, 10=very confident)")
+
+@functools.cache
 def get_scoring_agent() -> Agent:
     """
     Creates and returns the Scoring Agent (The Quantifier).
@@ -30,14 +49,11 @@ def get_scoring_agent() -> Agent:
     Returns:
         Agent: Configured Scoring agent for quantitative assessment
     """
-    # Get current datetime from environment
-    import os
-    current_datetime = os.environ.get("VERA_CURRENT_DATETIME", "Unknown")
 
     return Agent(
         name="ScoringAgent",
-        model=Gemini(
-            model="gemini-2.5-flash"  # Fast model sufficient for scoring
+        model=ContextGemini(
+            model=MODEL_NAME  # Fast model sufficient for scoring
         ),
         description="Provides quantitative scores based on all findings",
         
@@ -45,7 +61,7 @@ def get_scoring_agent() -> Agent:
         # Key design: Three metrics provide comprehensive quantitative assessment
         instruction=f"""You are the Scoring Agent. Your goal is to provide objective scores.
 
-Current date and time: {current_datetime}
+Current date and time: {{current_datetime}}
 
 Based on ALL previous findings (Researcher, Librarian, Analyst, Critic), assign three scores (1-10):
 
@@ -61,10 +77,14 @@ Based on ALL previous findings (Researcher, Librarian, Analyst, Critic), assign
    - Consider source quality and consensus
    - Account for Critic's concerns
 
-Provide brief justification for each score. Be objective and consistent.""",
+Answer with a JSON object holding the three scores ("disinformation", "manipulation",
+"confidence"), each an integer "score" with a brief "justification". Be objective and consistent.""",
         
         # No tools - pure synthesis
         # Design Decision: Scoring requires holistic understanding of all findings,
         # which LLM excels at without external tools
         tools=[],
+        output_schema=Scores,
+        output_key="scores",
+        include_contents="none",
     )
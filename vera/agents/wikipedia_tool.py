@@ -5,68 +5,207 @@ Allows agents to search Wikipedia for up-to-date information, definitions,
 and background context. This is useful for grounding claims in a widely
 recognized knowledge base.
 
-Uses the `wikipedia` python library.
+Talks to the MediaWiki Action API directly: a single `query` request
+(search generator + extracts/info/pageprops) returns title, URL, summary
+and disambiguation info of the top results. Lookups are cached in-process
+(LRU) and on disk (SQLite, table "wikipedia" in the shared cache file),
+keyed on (language, normalized query).
+
+The tool is a coroutine on a pooled async HTTP client, so it never blocks
+the event loop: several lookups requested in one model turn run
+concurrently, and investigations sharing a process do not stall each other.
 """
 
-import wikipedia
+import asyncio
+import hashlib
+import os
+import re
+import threading
 import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from vera.cache import MemoryLRUCache, SQLiteCache, cache_path, normalize_text
 from vera.utils.logging_config import get_tool_logger
 
 logger = get_tool_logger("wikipedia")
 
-def search_wikipedia(query: str) -> str:
+API_URL = "https://{language}.wikipedia.org/w/api.php"
+# Language edition codes ("en", "pl", "zh-yue"). The language is a tool
+# argument chosen by the model, and it becomes part of the request host, so
+# anything else (e.g. "evil.example#") must never reach API_URL.
+_LANGUAGE_CODE = re.compile(r"[a-z]{2,3}(-[a-z]+)?")
+USER_AGENT = "VERA/1.0 (https://github.com/migdaluk/vera)"
+REQUEST_TIMEOUT = 10
+# Connection pool per event loop; bounds concurrent requests to Wikipedia
+MAX_CONNECTIONS = 10
+# Number of search results fetched; the rest serve as disambiguation options
+SEARCH_LIMIT = 5
+# Encyclopedia entries change slowly - a week is fresh enough for background context
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# httpx clients are bound to the event loop they were first used on, and the
+# Streamlit UI runs every investigation on a fresh loop - keep one per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+_memory_cache = MemoryLRUCache(max_entries=512, ttl_seconds=CACHE_TTL_SECONDS)
+_disk_cache: Optional[SQLiteCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def _get_disk_cache() -> Optional[SQLiteCache]:
+    """On-disk lookup cache; disabled together with the result cache (VERA_CACHE_TTL_SECONDS=0)."""
+    global _disk_cache
+    if float(os.environ.get("VERA_CACHE_TTL_SECONDS", 1)) <= 0:
+        return None
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            _disk_cache = SQLiteCache(cache_path(), table="wikipedia", ttl_seconds=CACHE_TTL_SECONDS)
+        return _disk_cache
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Pooled keep-alive client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+        )
+        _clients[loop] = client
+    return client
+
+
+def is_language_code(language: str) -> bool:
+    """Whether `language` is a well-formed Wikipedia language edition code."""
+    return isinstance(language, str) and _LANGUAGE_CODE.fullmatch(language) is not None
+
+
+def wikipedia_cache_key(query: str, language: str) -> str:
+    """Cache key of a lookup: normalized, case-insensitive query per language."""
+    material = f"{language.lower()}\n{normalize_text(query).casefold()}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+async def fetch_wikipedia(query: str, language: str = "en") -> Dict[str, Any]:
+    """
+    Look up a query with one MediaWiki API request.
+
+    Returns:
+        Dict with "title", "url", "summary" and "disambiguation" of the top
+        result plus "options" (titles of the other results), or an empty
+        dict if nothing was found.
+
+    Raises:
+        httpx.HTTPError: On network or HTTP errors
+        ValueError: If the language is not a language edition code, or the
+            API reports an error
+    """
+    if not is_language_code(language):
+        raise ValueError(f"Invalid Wikipedia language code: {language!r}")
+    response = await _get_client().get(
+        API_URL.format(language=language),
+        params={
+            "action": "query",
+            "format": "json",
+            "formatversion": 2,
+            "redirects": 1,
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": SEARCH_LIMIT,
+            "prop": "extracts|info|pageprops",
+            "exintro": 1,
+            "explaintext": 1,
+            "exsentences": 3,
+            "exlimit": SEARCH_LIMIT,
+            "inprop": "url",
+            "ppprop": "disambiguation",
+        },
+        timeout=REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    data = response.json()
+    if "error" in data:
+        raise ValueError(data["error"].get("info", "MediaWiki API error"))
+
+    pages = sorted(data.get("query", {}).get("pages", []), key=lambda page: page.get("index", 0))
+    if not pages:
+        return {}
+
+    top = pages[0]
+    return {
+        "title": top.get("title", ""),
+        "url": top.get("fullurl", ""),
+        "summary": (top.get("extract") or "").strip(),
+        "disambiguation": "disambiguation" in top.get("pageprops", {}),
+        "options": [page.get("title", "") for page in pages[1:]],
+    }
+
+
+def format_result(query: str, result: Dict[str, Any]) -> str:
+    """Render a lookup result as the text returned to the agent."""
+    if not result:
+        return f"No Wikipedia results found for '{query}'."
+    if result["disambiguation"]:
+        # Agent can choose to search for a more specific term
+        options = ", ".join([result["title"], *result["options"]][:SEARCH_LIMIT])
+        return f"Disambiguation needed for '{query}'. Options: {options}"
+    if not result["summary"]:
+        return f"No Wikipedia article found for '{query}'."
+    # Return formatted result with title and URL for citation
+    return f"**{result['title']}**\n\n{result['summary']}\n\nSource: {result['url']}"
+
+
+async def search_wikipedia(query: str, language: str = "en") -> str:
     """
     Searches Wikipedia for the given query and returns the summary of the top result.
-    
+
     Use this tool to:
     - Get definitions of terms
     - Find background information on people, places, or events
     - Verify general knowledge claims
-    
+
     Args:
         query (str): The search term (e.g., "Quantum computing", "Warsaw").
-        
+        language (str): Wikipedia language edition code (default "en", e.g. "pl").
+
     Returns:
         str: Summary of the Wikipedia page, or an error message if not found.
     """
     start_time = time.time()
     logger.info(f"Wikipedia search started: '{query}'")
-    
-    try:
-        # Search for the query
-        search_results = wikipedia.search(query)
-        
-        if not search_results:
-            logger.warning(f"No Wikipedia results found for '{query}'")
-            return f"No Wikipedia results found for '{query}'."
-            
-        # Get the page for the top result
-        # Set language to English for consistency
-        # Could be parameterized for multilingual support in future
-        wikipedia.set_lang("en")
-        
-        # Search for the article
-        # This may raise DisambiguationError if query is ambiguous
-        page = wikipedia.page(query, auto_suggest=True)
-        
-        # Get summary with 3 sentences
-        # Limiting sentences prevents overwhelming the LLM with too much text
-        summary = wikipedia.summary(query, sentences=3, auto_suggest=True)
-        
-        # Return formatted result with title and URL for citation
-        return f"**{page.title}**\n\n{summary}\n\nSource: {page.url}"
-        
-    except wikipedia.exceptions.DisambiguationError as e:
-        # Handle disambiguation - return list of options
-        # Agent can choose to search for a more specific term
-        options = ", ".join(e.options[:5])  # Limit to 5 options
-        return f"Disambiguation needed for '{query}'. Options: {options}"
-        
-    except wikipedia.exceptions.PageError:
-        # Handle missing page - inform agent that article doesn't exist
-        return f"No Wikipedia article found for '{query}'."
-        
-    except Exception as e:
-        # Handle unexpected errors gracefully
-        # Return error message instead of crashing
-        return f"Error searching Wikipedia for '{query}': {str(e)}"
+    if not is_language_code(language):
+        logger.warning(f"Rejected Wikipedia language code {language!r}")
+        return f"Error searching Wikipedia for '{query}': invalid language code {language!r} (use e.g. \"en\" or \"pl\")."
+
+    key = wikipedia_cache_key(query, language)
+    result = _memory_cache.get(key)
+    source = "memory"
+    if result is None:
+        disk_cache = _get_disk_cache()
+        # SQLite access is blocking I/O - keep it off the event loop
+        result = await asyncio.to_thread(disk_cache.get, key) if disk_cache is not None else None
+        source = "disk"
+        if result is None:
+            try:
+                result = await fetch_wikipedia(query, language)
+            except Exception as e:
+                # Return error message instead of crashing; errors are not cached
+                logger.error(f"Wikipedia search failed for '{query}': {e}")
+                return f"Error searching Wikipedia for '{query}': {str(e)}"
+            source = "api"
+            if disk_cache is not None:
+                await asyncio.to_thread(disk_cache.set, key, result)
+        _memory_cache.set(key, result)
+
+    logger.info(
+        f"Wikipedia search completed: '{query}' ({source})",
+        extra={"duration_ms": int((time.time() - start_time) * 1000)},
+    )
+    if not result:
+        logger.warning(f"No Wikipedia results found for '{query}'")
+    return format_result(query, result)
@@ -0,0 +1,152 @@
+"""
+VERA HTTP API - ASGI application exposing investigations over HTTP
+
+Endpoints:
+    POST /investigations
+        Body: {"text": "...", "language": "English", "source_url": "..."}
+              or {"url": "https://..."} to extract the article first.
+        Returns 202 with the investigation id and its event stream URL.
+
+    GET /investigations/{id}
+        Current status and, once completed, the result (report, scores, timings).
+
+    GET /investigations/{id}/events
+        Server-sent events: started, agent_start, agent_end, report_delta
+        (the rendered report, in one chunk), then completed or failed. Reconnecting
+        clients may send Last-Event-ID to resume where they left off.
+
+    GET /health
+        Liveness, plus how many URLs were served by each extraction path
+        (json-ld, article, full-page) since start.
+
+Run with:
+    python -m vera serve --port 8000
+    # or: uvicorn vera.api:app --port 8000
+
+Runs alongside the Streamlit UI; both use `vera/investigation.py`.
+The Google API key is read from the GOOGLE_API_KEY environment variable.
+"""
+
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from vera.investigation import LANGUAGES
+from vera.service import InvestigationService
+from vera.utils.chunking import MAX_DOCUMENT_CHARS
+from vera.utils.url_extractor import get_extraction_stats, is_url
+
+logger = logging.getLogger("vera.api")
+
+# Maximum accepted input length (characters)
+MAX_TEXT_LENGTH = MAX_DOCUMENT_CHARS
+
+
+def format_sse(event: dict) -> str:
+    """Serialize an investigation event as a server-sent event."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def create_app(service: Optional[InvestigationService] = None) -> Starlette:
+    """
+    Build the ASGI application.
+
+    Args:
+        service: Investigation service to use; a default one is created if omitted
+
+    Returns:
+        Starlette application
+    """
+    service = service or InvestigationService()
+
+    async def create_investigation(request: Request) -> JSONResponse:
+        try:
+            body = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Request body must be JSON"}, status_code=400)
+        if not isinstance(body, dict):
+            return JSONResponse({"error": "Request body must be a JSON object"}, status_code=400)
+
+        for name in ("text", "url", "language", "source_url"):
+            if body.get(name) is not None and not isinstance(body[name], str):
+                return JSONResponse({"error": f"'{name}' must be a string"}, status_code=400)
+
+        text = (body.get("text") or "").strip()
+        url = (body.get("url") or "").strip()
+        language = body.get("language", "English")
+        source_url = body.get("source_url") or url or None
+
+        if language not in LANGUAGES:
+            return JSONResponse({"error": f"language must be one of {list(LANGUAGES)}"}, status_code=400)
+        if not text and not url:
+            return JSONResponse({"error": "Provide 'text' or 'url'"}, status_code=400)
+        if url and not is_url(url):
+            return JSONResponse({"error": "'url' is not a valid http(s) URL"}, status_code=400)
+        if len(text) > MAX_TEXT_LENGTH:
+            return JSONResponse({"error": f"'text' exceeds {MAX_TEXT_LENGTH} characters"}, status_code=413)
+
+        investigation = service.submit(text=text or None, language=language, source_url=source_url)
+        logger.info("Investigation submitted via API", extra={"session_id": investigation.id})
+        return JSONResponse(
+            {
+                "id": investigation.id,
+                "status": investigation.status,
+                "events_url": f"/investigations/{investigation.id}/events",
+            },
+            status_code=202,
+        )
+
+    async def get_investigation(request: Request) -> JSONResponse:
+        investigation = service.get(request.path_params["investigation_id"])
+        if investigation is None:
+            return JSONResponse({"error": "Investigation not found"}, status_code=404)
+        return JSONResponse(investigation.to_dict())
+
+    async def stream_events(request: Request):
+        investigation = service.get(request.path_params["investigation_id"])
+        if investigation is None:
+            return JSONResponse({"error": "Investigation not found"}, status_code=404)
+
+        try:
+            after = int(request.headers.get("last-event-id", -1))
+        except ValueError:
+            after = -1
+
+        async def event_stream():
+            async for event in investigation.subscribe(after=after):
+                yield format_sse(event)
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "extraction_paths": get_extraction_stats()})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await service.shutdown()
+
+    app = Starlette(
+        routes=[
+            Route("/investigations", create_investigation, methods=["POST"]),
+            Route("/investigations/{investigation_id}", get_investigation, methods=["GET"]),
+            Route("/investigations/{investigation_id}/events", stream_events, methods=["GET"]),
+            Route("/health", health, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.service = service
+    return app
+
+
+app = create_app()
@@ -0,0 +1,169 @@
+"""
+Batch Investigations - Headless runner for many investigations at once
+
+Reads items from a JSONL file, runs up to N investigations concurrently on
+one event loop and writes one JSONL result per item as soon as it finishes.
+
+Input line format:
+    {"id": "item-1", "text": "Claim to verify...", "language": "English"}
+    {"id": "item-2", "url": "https://www.bbc.com/news/article-id"}
+
+Output line format:
+    {"id": "item-1", "status": "ok", "scores": {...}, "report": "...",
+     "timings_ms": {...}, "total_duration_ms": 41234, ...}
+
+Usage:
+    python -m vera batch --input items.jsonl --concurrency 8 --output results.jsonl
+"""
+
+import asyncio
+import json
+import logging
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from vera.investigation import LANGUAGES, investigate
+from vera.utils.url_extractor import extract_text_from_url, is_url
+
+logger = logging.getLogger("vera.batch")
+
+DEFAULT_CONCURRENCY = 4
+
+
+def read_items(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse JSONL input lines into items, assigning ids to items without one.
+
+    Blank lines are skipped. Malformed lines yield an item with an "error" key
+    so they still produce a result line.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            yield {"id": f"line-{line_number}", "error": f"Invalid JSON input: {e}"}
+            continue
+        item.setdefault("id", f"line-{line_number}")
+        yield item
+
+
+async def run_item(item: Dict[str, Any], default_language: str) -> Dict[str, Any]:
+    """
+    Run a single batch item and return its JSON-serializable result.
+
+    Errors are reported in the result instead of being raised, so one bad
+    item never stops the batch.
+    """
+    result: Dict[str, Any] = {"id": item["id"]}
+    if "error" in item:
+        result.update(status="error", error=item["error"])
+        return result
+
+    try:
+        for name in ("text", "url", "language"):
+            if item.get(name) is not None and not isinstance(item[name], str):
+                raise ValueError(f"'{name}' must be a string")
+        language = item.get("language") or default_language
+        if language not in LANGUAGES:
+            raise ValueError(f"language must be one of {list(LANGUAGES)}")
+        text = (item.get("text") or "").strip()
+        source_url = item.get("url")
+
+        if not text and source_url:
+            if not is_url(source_url):
+                raise ValueError(f"Not a valid URL: {source_url}")
+            # URL extraction is blocking I/O - keep it off the event loop
+            success, content = await asyncio.to_thread(extract_text_from_url, source_url)
+            if not success:
+                raise ValueError(content)
+            text = f"[Content extracted from: {source_url}]\n\n{content}"
+        if not text:
+            raise ValueError("Item has neither 'text' nor 'url'")
+
+        investigation = await investigate(
+            text,
+            language=language,
+            source_url=source_url,
+            user_id="batch_user",
+        )
+        result.update(status="ok", **investigation.to_dict())
+    except Exception as e:
+        logger.error(f"Batch item {item['id']} failed: {e}", exc_info=True)
+        result.update(status="error", error=str(e))
+
+    return result
+
+
+async def run_batch(
+    items: Iterable[Dict[str, Any]],
+    output: TextIO,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    default_language: str = "English",
+) -> Dict[str, int]:
+    """
+    Run investigations for all items with at most `concurrency` in flight.
+
+    Items are pulled lazily, so arbitrarily large inputs are never held in
+    memory at once. Each result is written and flushed as soon as it finishes.
+
+    Args:
+        items: Batch items (see module docstring)
+        output: Text stream receiving one JSON line per item
+        concurrency: Maximum number of investigations running at once
+        default_language: Language for items that do not specify one
+
+    Returns:
+        Counts of "ok" and "error" results
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    item_iter = iter(items)
+    counts = {"ok": 0, "error": 0}
+
+    async def worker() -> None:
+        # Workers pull from the shared iterator; the event loop is single-threaded,
+        # so next() is never called concurrently.
+        for item in item_iter:
+            result = await run_item(item, default_language)
+            counts[result["status"]] += 1
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    logger.info(f"Batch completed: {counts['ok']} ok, {counts['error']} failed")
+    return counts
+
+
+def run_batch_cli(
+    input_path: str,
+    output_path: Optional[str],
+    concurrency: int,
+    default_language: str,
+) -> int:
+    """
+    Entry point for `python -m vera batch`.
+
+    Returns:
+        Process exit code (0 if every item succeeded, 1 otherwise)
+    """
+    input_file = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+    output_file = sys.stdout if output_path in (None, "-") else open(output_path, "w", encoding="utf-8")
+    try:
+        counts = asyncio.run(run_batch(
+            read_items(input_file),
+            output_file,
+            concurrency=concurrency,
+            default_language=default_language,
+        ))
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    return 0 if counts["error"] == 0 else 1
@@ -0,0 +1,240 @@
+"""
+Caches - Persistent result cache for whole investigations and shared cache backends
+
+During news spikes most traffic is the same handful of claims. A repeat of
+an already-investigated text (same language, source URL, model and prompt
+version) is answered from the cache instead of running six Gemini calls.
+
+Backend: SQLite (one file, safe across threads and Streamlit reruns).
+Entries expire after a TTL; when the cache exceeds its size bound, the least
+recently used entries are evicted.
+
+Configuration (environment variables):
+    VERA_CACHE_PATH          SQLite file (default: cache/vera_cache.sqlite3)
+    VERA_CACHE_TTL_SECONDS   Entry lifetime, 0 disables the cache (default: 21600 = 6h)
+    VERA_CACHE_MAX_ENTRIES   Size bound before LRU eviction (default: 10000)
+
+The backends (SQLiteCache, MemoryLRUCache) are also used by tools, e.g.
+the Wikipedia client caches lookups in a separate table of the same file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("vera.cache")
+
+DEFAULT_CACHE_PATH = "cache/vera_cache.sqlite3"
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class SQLiteCache:
+    """
+    Key/value cache of JSON-serializable values with TTL and LRU eviction.
+
+    Args:
+        path: SQLite database file (parent directories are created)
+        table: Table name, so several caches can share one file
+        ttl_seconds: Lifetime of an entry
+        max_entries: Maximum number of entries kept; least recently used
+            entries are evicted beyond this bound
+        clock: Time source (seconds), injectable for tests
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "entries",
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table} (last_access)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        now = self.clock()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting expired and least recently used entries if needed."""
+        now = self.clock()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now + ttl, now),
+            )
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+            logger.debug(f"Evicted {overflow} cache entries from {self.table}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryLRUCache:
+    """
+    In-process LRU cache with TTL, used in front of SQLiteCache for hot keys.
+
+    Args:
+        max_entries: Maximum number of entries kept
+        ttl_seconds: Lifetime of an entry
+        clock: Time source (seconds), injectable for tests
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize input text for cache keys (Unicode form and whitespace)."""
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def investigation_cache_key(text: str, language: str, source_url: Optional[str] = None) -> str:
+    """
+    Content address of an investigation.
+
+    Keyed on the normalized input text, language, source URL and the model
+    and prompt versions that would produce the report.
+    """
+    # Imported here: agent tools use the cache backends from this module
+    from vera.agents.config import MODEL_NAME, PROMPT_VERSION
+
+    material = json.dumps(
+        {
+            "text": normalize_text(text),
+            "language": language,
+            "source_url": source_url or "",
+            "model": MODEL_NAME,
+            "prompt_version": PROMPT_VERSION,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def cache_path() -> str:
+    """SQLite file shared by all persistent caches."""
+    return os.environ.get("VERA_CACHE_PATH", DEFAULT_CACHE_PATH)
+
+
+_result_cache: Optional[SQLiteCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[SQLiteCache]:
+    """
+    Process-wide investigation result cache configured from the environment.
+
+    Returns:
+        The cache, or None when disabled (VERA_CACHE_TTL_SECONDS=0)
+    """
+    global _result_cache
+    ttl = float(os.environ.get("VERA_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    if ttl <= 0:
+        return None
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = SQLiteCache(
+                cache_path(),
+                table="investigations",
+                ttl_seconds=ttl,
+                max_entries=int(os.environ.get("VERA_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+            logger.info(f"Result cache enabled at {_result_cache.path} (ttl={ttl:.0f}s)")
+        return _result_cache
@@ -0,0 +1,125 @@
+"""
+Stage Checkpoints - Durable stage results for resuming failed investigations
+
+When a late stage fails (a Critic timeout, a 429 from the API), the stages
+that already completed have been paid for. Their results are checkpointed
+as each stage completes, so running the same investigation again (same
+text, language and source URL) restarts the pipeline at the first
+incomplete stage and only pays for the stages that had not finished.
+
+A stage's published result (its output_key in the pipeline state) is the
+whole of what later stages read - branch sessions are discarded after each
+stage by design (see vera/pipeline.py) - so checkpointing the results is
+enough to resume. Checkpoints are kept in the SQLite file of the result
+cache (table "checkpoints") and are removed once the investigation
+completes.
+
+Checkpoints are keyed by the investigation's input, so concurrent runs of
+the same input would overwrite each other's checkpoints, and the first one
+to complete would remove the others' progress. A run therefore claims its
+run id for as long as it runs (`acquire`); a concurrent run of the same
+input finds it claimed and runs without checkpoints.
+
+Configuration (environment variables):
+    VERA_CHECKPOINT_TTL_SECONDS   Checkpoint lifetime, 0 disables resuming (default: 86400 = 24h)
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Set
+
+from vera.cache import SQLiteCache, cache_path
+
+logger = logging.getLogger("vera.checkpoints")
+
+DEFAULT_CHECKPOINT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_CHECKPOINTS = 10_000
+
+
+class Checkpoint(NamedTuple):
+    """A completed stage: its published result and how long it took (s)."""
+    value: Any
+    duration: float
+
+
+class CheckpointStore:
+    """
+    Per-stage results of investigation runs, keyed by run id and stage name.
+
+    Args:
+        cache: Backend holding one entry per (run, stage)
+    """
+
+    def __init__(self, cache: SQLiteCache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        # Run ids claimed by running investigations of this process
+        self._active: Set[str] = set()
+
+    def acquire(self, run_id: str) -> bool:
+        """
+        Claim a run's checkpoints for one running investigation.
+
+        Returns:
+            False if another investigation holds them
+        """
+        with self._lock:
+            if run_id in self._active:
+                return False
+            self._active.add(run_id)
+            return True
+
+    def release(self, run_id: str) -> None:
+        """Give up a claim taken with acquire()."""
+        with self._lock:
+            self._active.discard(run_id)
+
+    @staticmethod
+    def _key(run_id: str, stage: str) -> str:
+        return f"{run_id}/{stage}"
+
+    def save(self, run_id: str, stage: str, value: Any, duration: float) -> None:
+        """Checkpoint a completed stage."""
+        self.cache.set(self._key(run_id, stage), {"value": value, "duration": duration})
+
+    def load(self, run_id: str, stages: Sequence[str]) -> Dict[str, Checkpoint]:
+        """Checkpoints of the given stages of a run (completed stages only)."""
+        found = {}
+        for stage in stages:
+            entry = self.cache.get(self._key(run_id, stage))
+            if entry is not None:
+                found[stage] = Checkpoint(entry["value"], entry["duration"])
+        return found
+
+    def clear(self, run_id: str, stages: Sequence[str]) -> None:
+        """Remove the checkpoints of a run (once it completed)."""
+        for stage in stages:
+            self.cache.delete(self._key(run_id, stage))
+
+
+_checkpoint_store: Optional[CheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """
+    Process-wide checkpoint store configured from the environment.
+
+    Returns:
+        The store, or None when disabled (VERA_CHECKPOINT_TTL_SECONDS=0)
+    """
+    global _checkpoint_store
+    ttl = float(os.environ.get("VERA_CHECKPOINT_TTL_SECONDS", DEFAULT_CHECKPOINT_TTL_SECONDS))
+    if ttl <= 0:
+        return None
+    with _checkpoint_store_lock:
+        if _checkpoint_store is None:
+            _checkpoint_store = CheckpointStore(SQLiteCache(
+                cache_path(),
+                table="checkpoints",
+                ttl_seconds=ttl,
+                max_entries=DEFAULT_MAX_CHECKPOINTS,
+            ))
+            logger.info(f"Stage checkpoints enabled at {_checkpoint_store.cache.path} (ttl={ttl:.0f}s)")
+        return _checkpoint_store
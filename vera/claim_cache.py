@@ -0,0 +1,413 @@
+"""
+Claim Verdict Cache - Reuses Researcher verdicts across investigations
+
+The same claims ("vaccine X contains microchips") recur in hundreds of
+differently worded posts. Every verified claim is stored with its verdict,
+sources and the Researcher's finding; before the Researcher searches, each
+newly extracted claim is matched against the store and, if a sufficiently
+similar claim was verified recently, answered from it.
+
+Matching uses claim embeddings (Gemini embedding model) in an in-memory
+NumPy index: all stored vectors are L2-normalized rows of one matrix, so
+the cosine similarity of a whole batch of claims against every stored claim
+is a single matrix product. Identical claims (after normalization) match
+even when the embedding API is unavailable.
+
+Backend: SQLite table "claim_verdicts" in the shared cache file
+(`vera/cache.py`); the index is rebuilt from it at startup. Verdicts are
+only reused while fresh (TTL) and only for the model, prompt version and
+embedding model that produced them.
+
+Configuration (environment variables):
+    VERA_CLAIM_CACHE_TTL_SECONDS   Verdict lifetime, 0 disables the cache (default: 259200 = 3 days)
+    VERA_CLAIM_SIMILARITY          Minimum cosine similarity for a match (default: 0.92)
+    VERA_CLAIM_CACHE_MAX_ENTRIES   Size bound before the oldest verdicts are evicted (default: 50000)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from vera.cache import MemoryLRUCache, cache_path, normalize_text
+
+logger = logging.getLogger("vera.claim_cache")
+
+# Claims are about current events - verdicts go stale quickly
+DEFAULT_CLAIM_TTL_SECONDS = 3 * 24 * 60 * 60
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 50_000
+# Embedding vector size requested from the embedding model
+EMBEDDING_DIMENSIONS = 768
+
+Embedder = Callable[[List[str]], Awaitable[Optional[np.ndarray]]]
+
+
+def claim_key(claim: str) -> str:
+    """Normalized claim text used for exact matches."""
+    return normalize_text(claim).casefold().strip(" .\"'")
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class ClaimVerdictCache:
+    """
+    Persistent claim verdicts with a cosine-similarity index over claim embeddings.
+
+    Args:
+        path: SQLite database file (parent directories are created)
+        version: Identifies what produced the verdicts (model, prompt version,
+            embedding model); verdicts of other versions are ignored
+        ttl_seconds: How long a verdict may be reused
+        threshold: Minimum cosine similarity for a match
+        max_entries: Maximum number of verdicts kept; the oldest are evicted
+        clock: Time source (seconds), injectable for tests
+    """
+
+    def __init__(
+        self,
+        path: str,
+        version: str,
+        ttl_seconds: float = DEFAULT_CLAIM_TTL_SECONDS,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS claim_verdicts ("
+                "id INTEGER PRIMARY KEY, version TEXT NOT NULL, claim_key TEXT NOT NULL, claim TEXT NOT NULL, "
+                "verdict TEXT, sources TEXT NOT NULL, finding TEXT NOT NULL, embedding BLOB, "
+                "created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS claim_verdicts_version ON claim_verdicts (version, created_at)"
+            )
+        self._load()
+
+    def _load(self) -> None:
+        """Rebuild the in-memory index from the fresh verdicts of this version."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM claim_verdicts WHERE created_at <= ?", (self.clock() - self.ttl_seconds,)
+            )
+            rows = self._conn.execute(
+                "SELECT id, claim_key, embedding, created_at FROM claim_verdicts "
+                "WHERE version = ? ORDER BY created_at", (self.version,)
+            ).fetchall()
+            dims = next((len(row[2]) // 4 for row in rows if row[2] is not None), EMBEDDING_DIMENSIONS)
+            self._allocate(len(rows), dims)
+            for row_id, key, embedding, created_at in rows:
+                vector = np.frombuffer(embedding, dtype=np.float32) if embedding is not None else None
+                self._insert(row_id, key, vector, created_at)
+
+    def _allocate(self, capacity: int, dims: int) -> None:
+        capacity = max(capacity, 16)
+        self._size = 0
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._created = np.full(capacity, -np.inf, dtype=np.float64)
+        # Rows without an embedding (API unavailable when stored) only match exactly
+        self._has_vector = np.zeros(capacity, dtype=bool)
+        self._matrix = np.zeros((capacity, dims), dtype=np.float32)
+        self._row_keys: List[Optional[str]] = []
+        self._keys: Dict[str, int] = {}
+        self._positions: Dict[int, int] = {}
+
+    def _insert(self, row_id: int, key: str, vector: Optional[np.ndarray], created_at: float) -> None:
+        """Append a verdict to the index (capacity doubles when full), replacing an older one of the same claim."""
+        if not self._size and vector is not None and len(vector) != self._matrix.shape[1]:
+            self._matrix = np.zeros((len(self._ids), len(vector)), dtype=np.float32)
+        position = self._size
+        if position == len(self._ids):
+            self._ids = np.resize(self._ids, 2 * position)
+            self._created = np.resize(self._created, 2 * position)
+            self._has_vector = np.resize(self._has_vector, 2 * position)
+            self._matrix = np.resize(self._matrix, (2 * position, self._matrix.shape[1]))
+        if key in self._keys:
+            self._drop(self._keys[key])
+        self._ids[position] = row_id
+        self._created[position] = created_at
+        self._has_vector[position] = vector is not None and len(vector) == self._matrix.shape[1]
+        if self._has_vector[position]:
+            self._matrix[position] = vector
+        self._row_keys.append(key)
+        self._keys[key] = position
+        self._positions[row_id] = position
+        self._size += 1
+
+    def _drop(self, position: int) -> None:
+        """Retire a replaced or evicted verdict; its slot is reclaimed by the next compaction."""
+        self._created[position] = -np.inf
+        self._has_vector[position] = False
+        self._positions.pop(int(self._ids[position]), None)
+        key = self._row_keys[position]
+        if key is not None and self._keys.get(key) == position:
+            del self._keys[key]
+        self._row_keys[position] = None
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Rebuild the index from the kept slots only."""
+        ids, created = self._ids[keep], self._created[keep]
+        has_vector, matrix = self._has_vector[keep], self._matrix[keep]
+        keys = [self._row_keys[position] for position in keep]
+        self._allocate(2 * len(keep), matrix.shape[1])
+        for row_id, key, vector, present, created_at in zip(ids, keys, matrix, has_vector, created):
+            self._insert(int(row_id), key, vector if present else None, float(created_at))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, claims: Sequence[str], vectors: Optional[np.ndarray] = None) -> List[Optional[dict]]:
+        """
+        Find fresh verdicts for a batch of claims.
+
+        Args:
+            claims: Claim texts
+            vectors: Their embeddings (one row per claim); exact matches only if None
+
+        Returns:
+            Per claim, the stored verdict (dict with claim, verdict, sources,
+            finding, created_at and similarity) or None
+        """
+        with self._lock:
+            if not self._keys:
+                return [None] * len(claims)
+            fresh = self._created[:self._size] > self.clock() - self.ttl_seconds
+            best_rows: List[Optional[int]] = [None] * len(claims)
+            similarity = [1.0] * len(claims)
+
+            if vectors is not None and vectors.shape[1] == self._matrix.shape[1]:
+                scores = _normalize_rows(vectors) @ self._matrix[:self._size].T
+                scores[:, ~(fresh & self._has_vector[:self._size])] = -1.0
+                best = scores.argmax(axis=1)
+                for i, row in enumerate(best):
+                    if scores[i, row] >= self.threshold:
+                        best_rows[i] = int(row)
+                        similarity[i] = float(scores[i, row])
+
+            for i, claim in enumerate(claims):
+                row = self._keys.get(claim_key(claim))
+                if row is not None and fresh[row]:
+                    best_rows[i] = row
+                    similarity[i] = 1.0
+            ids = {i: int(self._ids[row]) for i, row in enumerate(best_rows) if row is not None}
+
+            records = {}
+            if ids:
+                placeholders = ",".join("?" * len(ids))
+                for record in self._conn.execute(
+                    f"SELECT id, claim, verdict, sources, finding, created_at FROM claim_verdicts "
+                    f"WHERE id IN ({placeholders})", tuple(set(ids.values()))
+                ):
+                    records[record[0]] = {
+                        "claim": record[1],
+                        "verdict": record[2],
+                        "sources": json.loads(record[3]),
+                        "finding": json.loads(record[4]),
+                        "created_at": record[5],
+                    }
+        return [
+            {**records[ids[i]], "similarity": similarity[i]} if i in ids and ids[i] in records else None
+            for i in range(len(claims))
+        ]
+
+    def add(self, claims: Sequence[str], findings: Sequence[dict], vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Store verified claims with their Researcher findings.
+
+        Args:
+            claims: Claim texts
+            findings: Researcher verdict per claim (ClaimVerdict dicts)
+            vectors: Claim embeddings (one row per claim), if available
+        """
+        now = self.clock()
+        normalized = _normalize_rows(vectors) if vectors is not None else None
+        rows = []
+        for i, (claim, finding) in enumerate(zip(claims, findings)):
+            rows.append((
+                self.version, claim_key(claim), claim, finding["verdict"],
+                json.dumps(finding.get("sources", []), ensure_ascii=False),
+                json.dumps(finding, ensure_ascii=False),
+                normalized[i].tobytes() if normalized is not None else None, now,
+            ))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM claim_verdicts WHERE version = ? AND claim_key = ?",
+                                   [(row[0], row[1]) for row in rows])
+            for i, row in enumerate(rows):
+                cursor = self._conn.execute(
+                    "INSERT INTO claim_verdicts (version, claim_key, claim, verdict, sources, finding, embedding, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                self._insert(cursor.lastrowid, row[1], normalized[i] if normalized is not None else None, now)
+            count = self._conn.execute("SELECT COUNT(*) FROM claim_verdicts").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                evicted = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM claim_verdicts ORDER BY created_at ASC LIMIT ?", (overflow,)
+                )]
+                self._conn.executemany("DELETE FROM claim_verdicts WHERE id = ?", [(row_id,) for row_id in evicted])
+                for row_id in evicted:
+                    if row_id in self._positions:
+                        self._drop(self._positions[row_id])
+            # Expired and replaced verdicts are pruned once they make up half of the index
+            live = np.flatnonzero(self._created[:self._size] > now - self.ttl_seconds)
+            if 2 * len(live) < self._size:
+                self._conn.execute("DELETE FROM claim_verdicts WHERE created_at <= ?", (now - self.ttl_seconds,))
+                self._compact(live)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Embeddings of recently seen claims - each claim is embedded for lookup and again for storing
+_embedding_cache = MemoryLRUCache(max_entries=2048, ttl_seconds=DEFAULT_CLAIM_TTL_SECONDS)
+
+
+async def embed_claims(claims: List[str]) -> Optional[np.ndarray]:
+    """
+    Embed claims with the Gemini embedding model.
+
+    Returns:
+        One row per claim, or None if the embedding API is unavailable
+        (the cache then falls back to exact matches)
+    """
+    from google.genai import types as genai_types
+    from vera.agents.config import EMBEDDING_MODEL
+    from vera.context import genai_client
+
+    keys = [claim_key(claim) for claim in claims]
+    missing = [key for key in dict.fromkeys(keys) if _embedding_cache.get(key) is None]
+    if missing:
+        try:
+            response = await genai_client().aio.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=missing,
+                config=genai_types.EmbedContentConfig(
+                    task_type="SEMANTIC_SIMILARITY",
+                    output_dimensionality=EMBEDDING_DIMENSIONS,
+                ),
+            )
+        except Exception as exc:
+            logger.warning(f"Claim embedding failed, using exact matches only: {exc}")
+            return None
+        for key, embedding in zip(missing, response.embeddings):
+            _embedding_cache.set(key, np.asarray(embedding.values, dtype=np.float32))
+    vectors = [_embedding_cache.get(key) for key in keys]
+    if any(vector is None for vector in vectors):
+        return None
+    return np.vstack(vectors)
+
+
+_claim_cache: Optional[ClaimVerdictCache] = None
+_claim_cache_lock = threading.Lock()
+
+
+def get_claim_cache() -> Optional[ClaimVerdictCache]:
+    """
+    Process-wide claim verdict cache configured from the environment.
+
+    Returns:
+        The cache, or None when disabled (VERA_CLAIM_CACHE_TTL_SECONDS=0)
+    """
+    global _claim_cache
+    from vera.agents.config import EMBEDDING_MODEL, MODEL_NAME, PROMPT_VERSION
+
+    ttl = float(os.environ.get("VERA_CLAIM_CACHE_TTL_SECONDS", DEFAULT_CLAIM_TTL_SECONDS))
+    if ttl <= 0:
+        return None
+    with _claim_cache_lock:
+        if _claim_cache is None:
+            _claim_cache = ClaimVerdictCache(
+                cache_path(),
+                version=f"{MODEL_NAME}/{PROMPT_VERSION}/{EMBEDDING_MODEL}",
+                ttl_seconds=ttl,
+                threshold=float(os.environ.get("VERA_CLAIM_SIMILARITY", DEFAULT_SIMILARITY_THRESHOLD)),
+                max_entries=int(os.environ.get("VERA_CLAIM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+            logger.info(f"Claim verdict cache enabled at {_claim_cache.path} ({len(_claim_cache)} verdicts)")
+        return _claim_cache
+
+
+def _cached_finding(record: dict, claim: str) -> dict:
+    """A stored verdict applied to this investigation's claim, marked as reused."""
+    verified = datetime.fromtimestamp(record["created_at"], tz=timezone.utc).strftime("%Y-%m-%d")
+    return {**record["finding"], "claim": claim, "reused_from": {"claim": record["claim"], "verified_on": verified}}
+
+
+async def lookup_verdicts(
+    claims: List[str],
+    cache: Optional[ClaimVerdictCache] = None,
+    embed: Embedder = embed_claims,
+) -> List[Optional[dict]]:
+    """
+    Researcher verdicts for claims verified recently, in claim order.
+
+    Returns:
+        Per claim, the reused finding or None if it must be verified
+    """
+    # The first call opens the store and loads its index - off the event loop
+    cache = cache if cache is not None else await asyncio.to_thread(get_claim_cache)
+    if cache is None or not claims:
+        return [None] * len(claims)
+    vectors = await embed(claims) if len(cache) else None
+    records = await asyncio.to_thread(cache.lookup, claims, vectors)
+    hits = sum(record is not None for record in records)
+    logger.info(f"Claim verdict cache: {hits}/{len(claims)} claims reused", extra={"cache_hits": hits})
+    return [
+        _cached_finding(record, claim) if record is not None else None
+        for claim, record in zip(claims, records)
+    ]
+
+
+async def store_verdicts(
+    claims: List[str],
+    findings: List[dict],
+    cache: Optional[ClaimVerdictCache] = None,
+    embed: Embedder = embed_claims,
+) -> None:
+    """
+    Store the findings of freshly verified claims.
+
+    Only True/False verdicts are stored: an "Unverified" claim may well be
+    verifiable by the next investigation, once sources have appeared.
+    """
+    cache = cache if cache is not None else await asyncio.to_thread(get_claim_cache)
+    if cache is None:
+        return
+    verified = [
+        (claim, finding) for claim, finding in zip(claims, findings)
+        if finding.get("verdict") in ("True", "False")
+    ]
+    if not verified:
+        return
+    claims, findings = [claim for claim, _ in verified], [finding for _, finding in verified]
+    vectors = await embed(claims)
+    await asyncio.to_thread(cache.add, claims, findings, vectors)
@@ -0,0 +1,111 @@
+"""
+Investigation Context - Per-investigation configuration without os.environ
+
+The API key, report language and current date of an investigation used to
+be written to os.environ and read back by the agents, so two concurrent
+investigations in one process (two Streamlit sessions on the same Cloud
+Run instance, API jobs) could overwrite each other's key and language
+mid-run.
+
+An investigation now runs inside `use_context(InvestigationContext(...))`.
+The context lives in a contextvar; asyncio tasks copy the current context
+when they are created, so every stage and worker task of an investigation
+sees its values while concurrent investigations each see their own.
+
+The shared agents (built once per process) use ContextGemini, which calls
+the API with the key of the current context; investigations without a key
+use the environment configuration (GOOGLE_API_KEY), as before.
+"""
+
+import contextlib
+import contextvars
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from google.adk.models.google_llm import Gemini
+from pydantic import PrivateAttr
+
+from vera.cache import MemoryLRUCache
+
+
+@dataclass(frozen=True)
+class InvestigationContext:
+    """
+    Configuration of one investigation.
+
+    Attributes:
+        api_key: Google AI Studio API key (None: GOOGLE_API_KEY from the environment)
+        language: Report language ("English" or "Polski")
+        current_datetime: Date and time the investigation started
+        source_url: URL the text was extracted from, if any
+    """
+    api_key: Optional[str] = None
+    language: str = "English"
+    current_datetime: str = "Unknown"
+    source_url: Optional[str] = None
+
+    def session_state(self) -> Dict[str, str]:
+        """Values the agents read from their session state at run time."""
+        return {"current_datetime": self.current_datetime, "language": self.language}
+
+
+_current: contextvars.ContextVar[Optional[InvestigationContext]] = contextvars.ContextVar(
+    "vera_investigation_context", default=None
+)
+
+
+def current_context() -> InvestigationContext:
+    """The context of the running investigation (defaults outside of one)."""
+    return _current.get() or InvestigationContext()
+
+
+@contextlib.contextmanager
+def use_context(context: InvestigationContext) -> Iterator[InvestigationContext]:
+    """Run the enclosed code (and the tasks it creates) with `context` as the current context."""
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+
+
+def genai_client():
+    """A google-genai client for the current context's API key."""
+    from google import genai
+
+    api_key = current_context().api_key
+    return genai.Client(api_key=api_key, vertexai=False) if api_key else genai.Client()
+
+
+def _key_id(api_key: str) -> str:
+    # Cache keys never hold the API key itself
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class ContextGemini(Gemini):
+    """
+    Gemini model that calls the API with the current investigation's key.
+
+    One keyed Gemini per API key (recently used ones kept) holds that key's
+    clients, so a key's client is reused across that user's investigations
+    and Gemini keeps building one client per event loop.
+    """
+    _keyed: MemoryLRUCache = PrivateAttr(
+        default_factory=lambda: MemoryLRUCache(max_entries=64, ttl_seconds=60 * 60)
+    )
+
+    @property
+    def api_client(self):
+        api_key = current_context().api_key
+        if not api_key:
+            return Gemini.api_client.__get__(self, type(self))
+        keyed = self._keyed.get(_key_id(api_key))
+        if keyed is None:
+            keyed = Gemini(
+                model=self.model,
+                retry_options=self.retry_options,
+                client_kwargs={**(self.client_kwargs or {}), "api_key": api_key, "vertexai": False},
+            )
+            self._keyed.set(_key_id(api_key), keyed)
+        return keyed.api_client
@@ -0,0 +1,336 @@
+"""
+Investigation Runner - UI-agnostic entry point for a single VERA investigation
+
+Wraps the user input, runs the stage graph from `vera/pipeline.py`, renders
+the final report from the structured findings (`vera/report.py`) and
+collects it with the scores and per-agent timings. Used by the
+Streamlit UI (`vera/main.py`) and the headless batch CLI (`vera/batch.py`).
+
+Every investigation runs under one deadline (VERA_DEADLINE_SECONDS), split
+into stage budgets by the pipeline: when time runs short the optional
+stages (Librarian, Critic) are skipped or cut short, and the report says so.
+
+A failed investigation resumes where it stopped when it is run again: the
+results of its completed stages are checkpointed (`vera/checkpoints.py`).
+
+Repeated inputs are answered from the persistent result cache
+(`vera/cache.py`) without running any agent, and so are near-identical
+reposts of an earlier input (`vera/near_duplicate.py`). Long inputs are investigated
+section by section (`vera/utils/chunking.py`) instead of being truncated;
+only inputs beyond MAX_DOCUMENT_CHARS are cut, whichever way they arrive
+(UI, API, batch), so the token cost of one investigation stays bounded.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.sessions import InMemorySessionService
+from google.genai import types as genai_types
+
+from vera.cache import get_result_cache, investigation_cache_key
+from vera.checkpoints import get_checkpoint_store
+from vera.context import InvestigationContext, use_context
+from vera.metrics import aggregate
+from vera.near_duplicate import get_near_duplicate_index
+from vera.pipeline import InvestigationPipeline, get_investigation_stages, get_long_document_stages
+from vera.report import render_report
+from vera.utils.chunking import MAX_DOCUMENT_CHARS, is_long_document, split_into_chunks
+
+logger = logging.getLogger("vera.investigation")
+
+APP_NAME = "vera_app"
+
+# Report languages
+LANGUAGES = ("English", "Polski")
+
+# Time an investigation may take (seconds), VERA_DEADLINE_SECONDS overrides;
+# 0 gives every stage its full STAGE_TIMEOUT instead
+DEFAULT_DEADLINE_SECONDS = 240.0
+
+# Scores produced by the Scoring agent
+SCORE_NAMES = ("disinformation", "manipulation", "confidence")
+
+
+@dataclass
+class InvestigationResult:
+    """Outcome of a single investigation."""
+    session_id: str
+    language: str
+    source_url: Optional[str]
+    report: str
+    scores: Dict[str, Optional[int]]
+    # Structured findings: per-claim verdicts (Researcher) and manipulation
+    # techniques (Analyst, all sections), as published by the agents
+    claims: List[Dict[str, Any]] = field(default_factory=list)
+    techniques: List[Dict[str, Any]] = field(default_factory=list)
+    timings_ms: Dict[str, int] = field(default_factory=dict)
+    total_duration_ms: int = 0
+    # Per-stage instrumentation (vera/metrics.py) plus "total"
+    metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # Set when the result was served from the result cache
+    cached: bool = False
+    cached_at: Optional[float] = None
+    # Set when the cached result belongs to a near-identical earlier input
+    near_duplicate: bool = False
+    # Stages restored from the checkpoints of an earlier, failed run
+    resumed_stages: List[str] = field(default_factory=list)
+    # Stages skipped or cut short to meet the deadline, with the reason
+    degraded_stages: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def wrap_user_input(
+    text: str,
+    language: str,
+    current_time: str,
+    source_url: Optional[str] = None,
+) -> str:
+    """
+    Wrap user input with date, language and source-exclusion instructions.
+
+    Args:
+        text: Text to investigate
+        language: Report language ("English" or "Polski")
+        current_time: Current datetime string shown to the agents
+        source_url: URL the text was extracted from, if any
+
+    Returns:
+        Text with instructions and the input between USER_INPUT markers
+    """
+    language_instruction = {
+        "English": f"[CURRENT DATE/TIME: {current_time}] [LANGUAGE: English] ",
+        "Polski": f"[AKTUALNA DATA/CZAS: {current_time}] [JĘZYK: Polski] Odpowiedz w języku polskim. "
+    }
+
+    # Source exclusion instruction
+    source_exclusion = ""
+    if source_url:
+        source_exclusion = f"\n[SOURCE URL TO VERIFY: {source_url}] (DO NOT CITE THIS URL AS A VERIFICATION SOURCE - FIND INDEPENDENT SOURCES)\n"
+
+    # Wrap user input
+    return (
+        language_instruction.get(language, "") +
+        source_exclusion +
+        "\n<<<USER_INPUT_START>>>\n" +
+        text +
+        "\n<<<USER_INPUT_END>>>"
+    )
+
+
+def build_user_message(
+    text: str,
+    language: str,
+    current_time: str,
+    source_url: Optional[str] = None,
+) -> genai_types.Content:
+    """
+    User message for the first stages of the pipeline (see wrap_user_input).
+    """
+    return genai_types.Content(
+        role="user",
+        parts=[genai_types.Part.from_text(text=wrap_user_input(text, language, current_time, source_url))]
+    )
+
+
+def structured_scores(scores: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """
+    The three 1-10 scores from the Scoring agent's structured output.
+
+    Returns:
+        Dict with "disinformation", "manipulation" and "confidence" keys
+    """
+    return {name: (scores.get(name) or {}).get("score") for name in SCORE_NAMES}
+
+
+async def investigate(
+    text: str,
+    language: str = "English",
+    source_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    session_id: Optional[str] = None,
+    user_id: str = "vera_user",
+    on_stage_start: Optional[Callable[[str], None]] = None,
+    on_stage_end: Optional[Callable[[str, float], None]] = None,
+    on_report_text: Optional[Callable[[str], None]] = None,
+    use_cache: bool = True,
+    reuse_near_duplicates: bool = True,
+    resume: bool = True,
+    deadline_seconds: Optional[float] = None,
+) -> InvestigationResult:
+    """
+    Run one full investigation.
+
+    The API key, language and date belong to this investigation
+    (vera/context.py); concurrent investigations never share them.
+
+    Args:
+        text: Text to investigate (already extracted if the input was a URL);
+            text beyond MAX_DOCUMENT_CHARS is cut off
+        language: Report language ("English" or "Polski")
+        source_url: URL the text was extracted from, if any
+        api_key: Google AI Studio API key; GOOGLE_API_KEY from the environment if omitted
+        session_id: Session id for logging; generated if omitted
+        user_id: ADK user id
+        on_stage_start: Callback invoked when a stage starts
+        on_stage_end: Callback invoked with stage name and duration (s) when it completes
+        on_report_text: Callback invoked with the report text once it is available
+        use_cache: Look up and store the result in the result cache
+        reuse_near_duplicates: Also answer near-identical reposts of an
+            earlier input from the result cache
+        resume: Checkpoint completed stages, and restore those of an
+            earlier failed run of the same input instead of running them again
+        deadline_seconds: Time the investigation may take (default:
+            VERA_DEADLINE_SECONDS or 240 s; 0 for no overall deadline)
+
+    Returns:
+        InvestigationResult with report, scores and timings
+    """
+    investigation_start = time.time()
+    session_id = session_id or str(uuid.uuid4())
+    if len(text) > MAX_DOCUMENT_CHARS:
+        logger.warning(f"Input truncated from {len(text)} to {MAX_DOCUMENT_CHARS} characters", extra={
+            "session_id": session_id,
+        })
+        text = text[:MAX_DOCUMENT_CHARS] + "\n\n[Content truncated due to length...]"
+
+    # The caches are SQLite: keep their I/O off the event loop shared by other investigations
+    cache = await asyncio.to_thread(get_result_cache) if use_cache else None
+    cache_key = investigation_cache_key(text, language, source_url)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            logger.info("Investigation served from result cache", extra={
+                "session_id": session_id,
+                "cache_key": cache_key,
+            })
+            if on_report_text:
+                on_report_text(cached["report"])
+            return InvestigationResult(**{**cached, "session_id": session_id, "cached": True})
+
+    near_duplicates = await asyncio.to_thread(get_near_duplicate_index) if cache is not None else None
+    if near_duplicates is not None and reuse_near_duplicates:
+        match = near_duplicates.find(text, language)
+        cached = await asyncio.to_thread(cache.get, match.cache_key) if match is not None else None
+        if cached is not None:
+            logger.info("Investigation served from a near-duplicate input", extra={
+                "session_id": session_id,
+                "cache_key": match.cache_key,
+                "distance_bits": match.distance,
+            })
+            if on_report_text:
+                on_report_text(cached["report"])
+            return InvestigationResult(**{
+                **cached, "session_id": session_id, "cached": True, "near_duplicate": True,
+            })
+
+    current_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+    if deadline_seconds is None:
+        deadline_seconds = float(os.environ.get("VERA_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS))
+
+    logger.info(f"=== Investigation Started ===", extra={
+        "session_id": session_id,
+        "language": language,
+        "text_length": len(text),
+        "timestamp": current_time,
+        "source_url": source_url
+    })
+
+    # Declare the stage graph (claim extraction, Librarian and Analyst run concurrently)
+    if is_long_document(text):
+        # Map-reduce over sections: per-section stages run concurrently
+        sections = split_into_chunks(text)
+        logger.info(f"Long document: {len(sections)} sections", extra={"session_id": session_id})
+        stages = get_long_document_stages(
+            [wrap_user_input(section, language, current_time, source_url) for section in sections],
+            source_url=source_url,
+        )
+    else:
+        stages = get_investigation_stages(source_url=source_url)
+    context = InvestigationContext(
+        api_key=api_key, language=language, current_datetime=current_time, source_url=source_url,
+    )
+    pipeline = InvestigationPipeline(
+        stages,
+        session_service=InMemorySessionService(),
+        app_name=APP_NAME,
+        user_id=user_id,
+        session_id=session_id,
+        # Per-request values for the shared agents (see InvestigationPipeline)
+        context=context.session_state(),
+        # Same input, same run: a retry restarts at the first incomplete stage
+        checkpoints=await asyncio.to_thread(get_checkpoint_store) if resume else None,
+        run_id=cache_key,
+        # One deadline for the whole run, split into stage budgets
+        deadline=deadline_seconds or None,
+    )
+
+    # Every agent call and task of the run uses this investigation's key
+    with use_context(context):
+        agent_timings = await pipeline.run(
+            build_user_message(text, language, current_time, source_url),
+            on_stage_start=on_stage_start,
+            on_stage_end=on_stage_end,
+        )
+
+    state = pipeline.state
+    scores = structured_scores(state["scores"])
+    claims = state["research_findings"]["claims"]
+    techniques = [
+        technique
+        for stage in stages if stage.output_key and stage.output_key.startswith("analysis_report")
+        for technique in state[stage.output_key]["techniques"]
+    ]
+    report = render_report(
+        summary=state["report_summary"]["summary"],
+        conclusion=state["report_summary"]["conclusion"],
+        scores=scores,
+        claims=claims,
+        techniques=techniques,
+        critique=state["critique"],
+        language=language,
+        generated_at=current_time,
+        degraded=pipeline.degraded,
+    )
+    if on_report_text:
+        on_report_text(report)
+
+    total_duration = time.time() - investigation_start
+    metrics = {name: stage.to_dict() for name, stage in pipeline.metrics.items()}
+    totals = aggregate(metrics.values())
+    logger.info(f"=== Investigation Completed ===", extra={
+        "session_id": session_id,
+        "total_duration_ms": int(total_duration * 1000),
+        "agent_count": len(stages),
+        "report_length": len(report),
+        **totals,
+    })
+
+    result = InvestigationResult(
+        session_id=session_id,
+        language=language,
+        source_url=source_url,
+        report=report,
+        scores=scores,
+        claims=claims,
+        techniques=techniques,
+        timings_ms={name: int(duration * 1000) for name, duration in agent_timings.items()},
+        total_duration_ms=int(total_duration * 1000),
+        metrics={**metrics, "total": totals},
+        resumed_stages=pipeline.resumed,
+        degraded_stages=dict(pipeline.degraded),
+    )
+    await pipeline.clear_checkpoints()
+    # A degraded report is not reused: the next request may have the time for all stages
+    if cache is not None and report.strip() and not pipeline.degraded:
+        await asyncio.to_thread(cache.set, cache_key, {**result.to_dict(), "cached_at": time.time()})
+        if near_duplicates is not None:
+            await asyncio.to_thread(near_duplicates.add, cache_key, text, language)
+    return result
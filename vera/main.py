@@ -29,29 +29,20 @@ License: MIT
 """
 
 import streamlit as st
-import asyncio
-import os
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 import logging
 
-# Google ADK imports - Core framework for multi-agent systems
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai import types as genai_types
-
-# VERA agent imports - Each agent has a specific role in the analysis pipeline
-from vera.agents.researcher import get_researcher_agent
-from vera.agents.librarian import get_librarian_agent
-from vera.agents.analyst import get_analyst_agent
-from vera.agents.critic import get_critic_agent
-from vera.agents.scoring import get_scoring_agent
-from vera.agents.reporter import get_reporter_agent
+# VERA investigation runner - Runs the agent stage graph independently of the UI
+from vera.service import follow_investigation, get_background_investigations
+from vera.pipeline import stage_role
 
 # VERA utilities
 from vera.utils.logging_config import setup_logging
+from vera.utils.chunking import MAX_DOCUMENT_CHARS
+from vera.utils.streaming import DedupRenderer
 
 # Initialize logging
 setup_logging(log_level="INFO", enable_console=True, enable_file=True)
@@ -107,6 +98,12 @@ with st.sidebar:
         help="Select the language for VERA's investigation report."
     )
     
+    reuse_near_duplicates = st.checkbox(
+        "Reuse reports of near-identical texts",
+        value=True,
+        help="Reposts of an already investigated text (added emojis, hashtags, a short prefix) are answered with the earlier report. Untick to always run a fresh investigation."
+    )
+    
     st.markdown("---")
     st.markdown("### About VERA")
     st.info(
@@ -135,14 +132,20 @@ st.title("VERA: Disinformation Defense System")
 input_text = st.text_area(
     "Enter text, claim, or URL to investigate:",
     height=150,
+    max_chars=MAX_DOCUMENT_CHARS,
     placeholder="e.g., 'Breaking news: The earth is actually a cube according to new leaked NASA documents...'\n\nOr paste article URL (BETA): https://www.bbc.com/news/article-id",
     help="📝 Paste text directly OR 🌐 paste article URL (BETA feature - may not work with all websites)"
 )
 
-def get_workflow_html(active_agent: str = "Researcher") -> str:
-    """Generate minimal HTML for workflow visualization."""
+def get_workflow_html(active_agents=("Researcher",)) -> str:
+    """Generate minimal HTML for workflow visualization.
+    
+    Several agents can be highlighted at once, since independent stages
+    run concurrently.
+    """
     
     agents = {
+        "Claims": {"icon": "📋", "label": "Claims"},
         "Researcher": {"icon": "🔍", "label": "Researcher"},
         "Librarian": {"icon": "📚", "label": "Librarian"},
         "Analyst": {"icon": "🧐", "label": "Analyst"},
@@ -152,7 +155,7 @@ def get_workflow_html(active_agent: str = "Researcher") -> str:
     }
     
     def agent_style(name: str) -> str:
-        is_active = name == active_agent
+        is_active = name in active_agents
         return f"""
             padding: 8px 16px;
             border-radius: 8px;
@@ -168,6 +171,9 @@ def get_workflow_html(active_agent: str = "Researcher") -> str:
     
     return f"""
     <div style="display: flex; gap: 12px; justify-content: center; flex-wrap: wrap; margin: 15px 0;">
+        <div style="{agent_style('Claims')}">
+            {agents['Claims']['icon']} {agents['Claims']['label']}
+        </div>
         <div style="{agent_style('Researcher')}">
             {agents['Researcher']['icon']} {agents['Researcher']['label']}
         </div>
@@ -190,97 +196,23 @@ def get_workflow_html(active_agent: str = "Researcher") -> str:
     """
 
 
-async def run_investigation(text: str, key: str, lang: str, source_url: str = None):
-    """Runs the VERA agent system."""
-    investigation_start = time.time()
-    
-    # Set Environment Variables
-    from datetime import datetime
-    current_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    
-    os.environ["GOOGLE_API_KEY"] = key
-    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "False" # Use AI Studio
-    os.environ["VERA_LANGUAGE"] = lang  # Store language preference
-    os.environ["VERA_CURRENT_DATETIME"] = current_time  # Store current datetime for agents
-    
-    # Generate session ID
-    session_id = st.session_state.session_id
-    
-    logger.info(f"=== Investigation Started ===", extra={
-        "session_id": session_id,
-        "language": lang,
-        "text_length": len(text),
-        "timestamp": current_time,
-        "source_url": source_url
-    })
-    
-    # Initialize Agents
-    from vera.agents import (
-        get_researcher_agent,
-        get_librarian_agent,
-        get_analyst_agent,
-        get_critic_agent,
-        get_scoring_agent,
-        get_reporter_agent
-    )
-    
-    logger.debug(f"Initializing agent sequence", extra={"session_id": session_id})
-    
-    # Define the sequence of agents
-    agents_sequence = [
-        ("Researcher", get_researcher_agent()),
-        ("Librarian", get_librarian_agent()),
-        ("Analyst", get_analyst_agent()),
-        ("Critic", get_critic_agent()),
-        ("Scoring", get_scoring_agent()),
-        ("Reporter", get_reporter_agent(language=lang))
-    ]
-    
-    session_service = InMemorySessionService()
-    
-    # Create Session
-    await session_service.create_session(
-        app_name="vera_app",
-        user_id="streamlit_user",
-        session_id=st.session_state.session_id
-    )
-    
-    # Prepare Input
-    from datetime import datetime
-    current_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    
-    language_instruction = {
-        "English": f"[CURRENT DATE/TIME: {current_time}] [LANGUAGE: English] ",
-        "Polski": f"[AKTUALNA DATA/CZAS: {current_time}] [JĘZYK: Polski] Odpowiedz w języku polskim. "
-    }
-    
-    # Source exclusion instruction
-    source_exclusion = ""
-    if source_url:
-        source_exclusion = f"\n[SOURCE URL TO VERIFY: {source_url}] (DO NOT CITE THIS URL AS A VERIFICATION SOURCE - FIND INDEPENDENT SOURCES)\n"
-    
-    # Wrap user input
-    prefixed_text = (
-        language_instruction.get(lang, "") + 
-        source_exclusion +
-        "\n<<<USER_INPUT_START>>>\n" + 
-        text + 
-        "\n<<<USER_INPUT_END>>>"
-    )
-    
-    # Initial User Message
-    user_msg = genai_types.Content(
-        role="user",
-        parts=[genai_types.Part.from_text(text=prefixed_text)]
-    )
+def show_investigation(job):
+    """Shows a background investigation's progress and report until it finishes.
+
+    Streamlit reruns this script on every widget interaction or refresh; the
+    investigation keeps running in the background and a rerun reattaches to
+    it here, replaying its event log from the start.
+    """
+    session_id = job.id
     
-    # Stream Output
+    # Report output (identical frames are not re-sent, so the report is rendered once)
     report_container = st.empty()
-    full_response = ""
+    report_view = DedupRenderer(report_container.markdown)
     
-    # Visualization
+    # Visualization (identical frames are not re-sent)
     graph_placeholder = st.empty()
-    graph_placeholder.markdown(get_workflow_html("Researcher"), unsafe_allow_html=True)
+    graph_view = DedupRenderer(lambda html: graph_placeholder.markdown(html, unsafe_allow_html=True))
+    graph_view.update(get_workflow_html(()))
     
     # Status message
     status_container = st.empty()
@@ -310,172 +242,61 @@ async def run_investigation(text: str, key: str, lang: str, source_url: str = No
     status_container.markdown("<div style='text-align: center;'>🕵️ <b>Starting investigation...</b> <span class='spinner'></span></div>", unsafe_allow_html=True)
     
     # ============================================================================
-    # SEQUENTIAL EXECUTION PATTERN (ADK Multi-Agent Requirement)
+    # DEPENDENCY-GRAPH EXECUTION
     # ============================================================================
-    # VERA implements the "Sequential Agents" pattern from Google ADK.
+    # Each stage declares the stages whose output it needs (see vera/pipeline.py).
+    # Claim extraction, Librarian and Analyst only need the original user text,
+    # so they run concurrently; the Researcher then verifies each extracted
+    # claim in its own worker, and Critic, Scoring and Reporter follow in order.
     # 
-    # DESIGN DECISION: Manual Orchestration vs SequentialAgent Wrapper
-    # 
-    # We use manual orchestration (for loop with Runner) instead of ADK's
-    # SequentialAgent wrapper for the following reasons:
+    # DESIGN DECISION: Manual Orchestration vs ParallelAgent/SequentialAgent
     # 
     # 1. TOOL CONFLICT PREVENTION
-    #    - Researcher uses google_search
-    #    - Librarian uses search_wikipedia (custom tool)
-    #    - Using both tools in a SequentialAgent can cause conflicts
-    #    - Manual orchestration allows clean tool separation per agent
+    #    - Researcher uses google_search, Librarian uses search_wikipedia
+    #    - Each stage gets its own Runner, keeping tools cleanly separated
     # 
     # 2. FINE-GRAINED CONTROL
     #    - Custom input for each agent (e.g., Librarian gets different prompt)
-    #    - Precise error handling per agent
-    #    - Agent-specific timeout management
+    #    - Per-stage timeout and error handling
     #    - Individual agent performance tracking
     # 
-    # 3. OBSERVABILITY & DEBUGGING
-    #    - Per-agent logging with structured metadata
-    #    - Real-time UI updates for each agent
-    #    - Detailed timing metrics for performance analysis
-    #    - Easier to debug issues in specific agents
-    # 
-    # 4. SESSION MANAGEMENT
-    #    - Explicit control over session context sharing
-    #    - Each agent sees previous agents' outputs via shared session
-    #    - Easier to inspect session state between agents
+    # 3. SESSION MANAGEMENT
+    #    - Every stage runs in a branch session seeded with the user input and
+    #      the outputs of its dependencies, so concurrent stages never
+    #      interleave events and later agents see all previous findings
     # 
-    # PATTERN COMPLIANCE:
-    # This implementation DOES satisfy ADK's "Sequential Agents" requirement:
-    # - Agents execute in strict sequential order (one after another)
-    # - Each agent completes before the next starts
-    # - Shared context via InMemorySessionService
-    # - No parallel execution
-    # 
-    # The manual approach provides the same sequential execution semantics
-    # as SequentialAgent but with greater control and reliability for our
-    # specific use case (multiple tools, complex error handling, real-time UI).
+    # The orchestration itself lives in vera/investigation.py so the batch CLI
+    # can reuse it. It runs as a background job (vera/service.py) that
+    # outlives script reruns; this function only replays the job's event log
+    # into Streamlit widgets.
     # ============================================================================
     
-    # --- Manual Sequential Orchestration Loop ---
-    agent_timings = {}
-    try:
-        current_input = user_msg
-        
-        for agent_name, agent_obj in agents_sequence:
-            agent_start = time.time()
-            logger.info(f"Starting {agent_name}", extra={"session_id": session_id, "agent_name": agent_name})
-            
-            # Update UI
-            graph_placeholder.markdown(get_workflow_html(agent_name), unsafe_allow_html=True)
-            
-            status_msg = {
-                "Researcher": "<b>Researcher</b> is verifying factual claims...",
-                "Librarian": "<b>Librarian</b> is checking Wikipedia...",
-                "Analyst": "<b>Analyst</b> is analyzing manipulation techniques...",
-                "Critic": "<b>Critic</b> is reviewing the findings...",
-                "Scoring": "<b>Scoring</b> is calculating metrics...",
-                "Reporter": "<b>Reporter</b> is generating final report..."
-            }
-            status_container.markdown(f"<div style='text-align: center;'>{status_msg.get(agent_name, agent_name)} <span class='spinner'></span></div>", unsafe_allow_html=True)
-            
-            # Create Runner for this agent
-            runner = Runner(
-                agent=agent_obj,
-                app_name="vera_app",
-                session_service=session_service
-            )
-            
-            # Determine input for this agent
-            if agent_name == "Researcher":
-                agent_input = current_input
-            elif agent_name == "Librarian":
-                # Librarian also looks at the original text to find terms
-                agent_input = genai_types.Content(
-                    role="user",
-                    parts=[genai_types.Part.from_text(text="Identify terms in the original text that need definition and search Wikipedia.")]
-                )
-            else:
-                # Prompt for next agent to use context from session
-                prompts = {
-                    "Analyst": "Analyze the text, research findings, and librarian context above for manipulation.",
-                    "Critic": "Review the research, librarian report, and analysis above. Provide a critique.",
-                    "Scoring": "Based on all findings above, provide scores.",
-                    "Reporter": "Synthesize all findings above into the final report."
-                }
-                agent_input = genai_types.Content(
-                    role="user",
-                    parts=[genai_types.Part.from_text(text=prompts[agent_name])]
-                )
-
-            # Run with timeout
-            async def run_agent_step():
-                nonlocal full_response
-                async for event in runner.run_async(
-                    user_id="streamlit_user",
-                    session_id=st.session_state.session_id,
-                    new_message=agent_input
-                ):
-                    # Stream text ONLY for Reporter
-                    # Check both event.content and event.model_content
-                    if agent_name == "Reporter":
-                        # Check event.content first
-                        if hasattr(event, 'content') and event.content and event.content.parts:
-                            for part in event.content.parts:
-                                if hasattr(part, 'text') and part.text:
-                                    full_response += part.text
-                                    report_container.markdown(full_response + "▌")
-                        
-                        # Also check model_content
-                        if hasattr(event, 'model_content') and event.model_content and event.model_content.parts:
-                            for part in event.model_content.parts:
-                                if hasattr(part, 'text') and part.text:
-                                    full_response += part.text
-                                    report_container.markdown(full_response + "▌")
-                                    
-            await asyncio.wait_for(run_agent_step(), timeout=300.0)
-            
-            # Log agent completion
-            agent_duration = time.time() - agent_start
-            agent_timings[agent_name] = agent_duration
-            logger.info(f"Completed {agent_name}", extra={
-                "session_id": session_id,
-                "agent_name": agent_name,
-                "duration_ms": int(agent_duration * 1000)
-            })
-            
-        # Final cleanup
-        total_duration = time.time() - investigation_start
-        status_container.markdown("<div style='text-align: center;'>✅ <b>Investigation Complete</b></div>", unsafe_allow_html=True)
-        
-        # Display final report - NO unsafe_allow_html to prevent XSS attacks
-        # Streamlit's default markdown rendering is safe and escapes HTML
-        report_container.markdown(full_response)
-        
-        # Debug: Log report length
-        logger.info(f"Final report length: {len(full_response)} characters")
-        
-        status_container.success("✅ Investigation complete!")
-        
-        # Log investigation summary
-        logger.info(f"=== Investigation Completed ===", extra={
-            "session_id": session_id,
-            "total_duration_ms": int(total_duration * 1000),
-            "agent_count": len(agents_sequence),
-            "report_length": len(full_response)
-        })
-        
-        # Log individual agent timings
-        for agent_name, duration in agent_timings.items():
-            logger.debug(f"Agent timing: {agent_name} = {duration:.2f}s", extra={
-                "session_id": session_id,
-                "agent_name": agent_name,
-                "duration_ms": int(duration * 1000)
-            })
-        
-    except asyncio.TimeoutError:
-        logger.error("Investigation timed out", extra={"session_id": session_id}, exc_info=True)
-        status_container.error("⏱️ Investigation timed out.")
-    except Exception as e:
-        logger.error(f"Investigation failed: {str(e)}", extra={"session_id": session_id}, exc_info=True)
-        status_container.error(f"An error occurred during investigation: {str(e)}")
+    status_msg = {
+        "Researcher": "<b>Researcher</b> is verifying each claim in parallel...",
+        "Librarian": "<b>Librarian</b> is checking Wikipedia...",
+        "Analyst": "<b>Analyst</b> is analyzing manipulation techniques...",
+        "Critic": "<b>Critic</b> is reviewing the findings...",
+        "Scoring": "<b>Scoring</b> is calculating metrics...",
+        "Reporter": "<b>Reporter</b> is generating final report...",
+        "Claims": "<b>Claim extraction</b> is listing verifiable claims..."
+    }
+    
+    def refresh_progress(active_agents):
+        # Long documents run one stage per section ("Analyst-2"); show each role once
+        roles = list(dict.fromkeys(stage_role(name) for name in active_agents))
+        graph_view.update(get_workflow_html(roles))
+        if active_agents:
+            messages = "<br>".join(status_msg.get(role, role) for role in roles)
+            status_container.markdown(f"<div style='text-align: center;'>{messages} <span class='spinner'></span></div>", unsafe_allow_html=True)
+    
+    # Poll the event log; the job runs on the background loop meanwhile.
+    # The report is rendered without unsafe_allow_html to prevent XSS attacks -
+    # Streamlit's default markdown rendering is safe and escapes HTML
+    follow_investigation(job, report_view, refresh_progress)
+    
+    if job.status == "failed":
+        logger.error(f"Investigation failed: {job.error}", extra={"session_id": session_id})
+        status_container.error(f"An error occurred during investigation: {job.error}")
         st.error("""
         **Possible causes:**
         - API rate limiting (too many requests)
@@ -483,14 +304,42 @@ async def run_investigation(text: str, key: str, lang: str, source_url: str = No
         - Network connectivity issues
         
         **Suggestions:**
+        - Wait a few minutes and try again - the agents that already finished
+          are kept, so the investigation resumes from the failed step
         - Try with shorter text
-        - Wait a few minutes and try again
         - Check your API quota in Google AI Studio
         """)
         st.stop()
-        
-    except Exception as e:
-        st.error(f"An error occurred during investigation: {e}")
+    
+    result = job.result
+    
+    # Final cleanup
+    status_container.markdown("<div style='text-align: center;'>✅ <b>Investigation Complete</b></div>", unsafe_allow_html=True)
+    
+    # Debug: Log report length
+    logger.info(f"Final report length: {len(result['report'])} characters")
+    
+    status_container.success("✅ Investigation complete!")
+    
+    if result["near_duplicate"]:
+        checked_ago = int((time.time() - result["cached_at"]) / 60)
+        st.info(
+            f"⚡ A near-identical text was investigated {checked_ago} min ago - showing that report. "
+            "Untick \"Reuse reports of near-identical texts\" in the sidebar to run a fresh investigation."
+        )
+    elif result["cached"]:
+        checked_ago = int((time.time() - result["cached_at"]) / 60)
+        st.info(f"⚡ This text was already investigated {checked_ago} min ago - showing the stored report.")
+    elif result["resumed_stages"]:
+        st.info(f"♻️ Resumed an interrupted investigation - reused: {', '.join(result['resumed_stages'])}.")
+    
+    # Log individual agent timings
+    for agent_name, duration_ms in result["timings_ms"].items():
+        logger.debug(f"Agent timing: {agent_name} = {duration_ms / 1000:.2f}s", extra={
+            "session_id": session_id,
+            "agent_name": agent_name,
+            "duration_ms": duration_ms
+        })
 
 # --- Execution ---
 if st.button("🔍 Analyze & Verify"):
@@ -520,9 +369,21 @@ if st.button("🔍 Analyze & Verify"):
         else:
             processed_text = input_text
     
-    # Generate new session ID for fresh analysis
-    st.session_state.session_id = str(uuid.uuid4())
-    
-    # Run investigation with processed text
+    # Submit the investigation as a background job; the job id in the URL
+    # lets reruns and reloaded pages reattach to it instead of starting over
     source_url = input_text.strip() if is_url(input_text.strip()) else None
-    asyncio.run(run_investigation(processed_text, api_key, language, source_url=source_url))
+    job = get_background_investigations().submit(
+        processed_text,
+        language=language,
+        source_url=source_url,
+        # Per-investigation key: concurrent sessions never share os.environ
+        api_key=api_key,
+        user_id="streamlit_user",
+        reuse_near_duplicates=reuse_near_duplicates,
+    )
+    st.session_state.session_id = job.id
+    st.query_params["job"] = job.id
+    show_investigation(job)
+elif get_background_investigations().get(st.query_params.get("job")) is not None:
+    # Rerun or reconnect while a job is known: reattach to it
+    show_investigation(get_background_investigations().get(st.query_params["job"]))
@@ -0,0 +1,121 @@
+"""
+Stage Metrics - Token, tool and latency instrumentation per agent
+
+Built from the ADK events of each stage, so a slow or expensive run can be
+attributed to Gemini latency, tool latency or context size:
+
+    prompt_tokens / output_tokens / thinking_tokens / cached_tokens
+                       usage_metadata of every (non-partial) model response
+    llm_calls          model responses carrying usage metadata
+    tool_calls         function calls plus built-in Google Search queries
+    tool_latency_ms    summed wall time between a function call and its response
+                       (built-in search runs inside the model call, so it counts
+                       as model latency)
+    ttfe_ms            time from stage start to the first event
+    ttfr_ms            time from stage start to the first event carrying text: stages
+                       do not stream, so this is the first complete text response
+    cost_usd           estimate from the token counts (vera/agents/config.py PRICING)
+
+Fan-out stages feed all their workers into one StageMetrics, so counters add
+up and first-event times are those of the earliest worker.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional
+
+COUNTERS = (
+    "prompt_tokens", "output_tokens", "thinking_tokens", "cached_tokens",
+    "llm_calls", "tool_calls", "tool_latency_ms",
+)
+
+
+def estimate_cost(prompt_tokens: int, output_tokens: int, thinking_tokens: int, cached_tokens: int) -> float:
+    """Estimated USD cost of a token mix at the configured model's prices."""
+    from vera.agents.config import MODEL_NAME, PRICING
+
+    prices = PRICING.get(MODEL_NAME)
+    if not prices:
+        return 0.0
+    cached = min(cached_tokens, prompt_tokens)
+    return (
+        (prompt_tokens - cached) * prices["input"]
+        + cached * prices["cached"]
+        + (output_tokens + thinking_tokens) * prices["output"]
+    ) / 1_000_000
+
+
+@dataclass
+class StageMetrics:
+    """Instrumentation of one stage; feed it every ADK event with record()."""
+    started: float = field(default_factory=time.monotonic)
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    thinking_tokens: int = 0
+    cached_tokens: int = 0
+    llm_calls: int = 0
+    tool_calls: int = 0
+    tool_latency_ms: int = 0
+    ttfe_ms: Optional[int] = None
+    ttfr_ms: Optional[int] = None
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    # Open function calls: id -> time the call event was received
+    _pending_calls: Dict[str, float] = field(default_factory=dict, repr=False)
+
+    def _elapsed_ms(self, now: float) -> int:
+        return int((now - self.started) * 1000)
+
+    def record(self, event) -> None:
+        """Account for one ADK event."""
+        now = self.clock()
+        if self.ttfe_ms is None:
+            self.ttfe_ms = self._elapsed_ms(now)
+        content = getattr(event, "content", None)
+        if self.ttfr_ms is None and content and any(getattr(part, "text", None) for part in content.parts or ()):
+            self.ttfr_ms = self._elapsed_ms(now)
+
+        for call in event.get_function_calls():
+            self.tool_calls += 1
+            self._pending_calls[call.id or call.name] = now
+        for response in event.get_function_responses():
+            called = self._pending_calls.pop(response.id or response.name, None)
+            if called is not None:
+                self.tool_latency_ms += int((now - called) * 1000)
+
+        if event.partial:
+            # Partial (streamed) events repeat the usage of the final response
+            return
+        grounding = getattr(event, "grounding_metadata", None)
+        if grounding is not None and grounding.web_search_queries:
+            self.tool_calls += len(grounding.web_search_queries)
+        usage = getattr(event, "usage_metadata", None)
+        if usage is not None:
+            self.llm_calls += 1
+            self.prompt_tokens += usage.prompt_token_count or 0
+            self.output_tokens += usage.candidates_token_count or 0
+            self.thinking_tokens += usage.thoughts_token_count or 0
+            self.cached_tokens += usage.cached_content_token_count or 0
+
+    @property
+    def cost_usd(self) -> float:
+        return estimate_cost(self.prompt_tokens, self.output_tokens, self.thinking_tokens, self.cached_tokens)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Metrics as structured log / result fields."""
+        fields = {name: getattr(self, name) for name in COUNTERS}
+        fields.update(ttfe_ms=self.ttfe_ms, ttfr_ms=self.ttfr_ms, cost_usd=round(self.cost_usd, 6))
+        return {name: value for name, value in fields.items() if value is not None}
+
+
+def aggregate(stage_metrics: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Totals of an investigation: summed counters and cost. First-event times
+    are per stage and are not summed.
+    """
+    totals: Dict[str, float] = {name: 0 for name in COUNTERS}
+    totals["cost_usd"] = 0.0
+    for metrics in stage_metrics:
+        for name in totals:
+            totals[name] += metrics.get(name, 0)
+    totals["cost_usd"] = round(totals["cost_usd"], 6)
+    return totals
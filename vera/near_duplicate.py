@@ -0,0 +1,275 @@
+"""
+Near-Duplicate Index - Finds earlier investigations of (almost) the same text
+
+Viral texts arrive with trivial edits: added emojis, different hashtags, a
+reposter's prefix. The result cache (`vera/cache.py`) is keyed on the exact
+text and misses all of them. This index maps every cached investigation to
+a 64-bit SimHash of its input, so a new input within a few bits of an
+earlier one is answered with the earlier report.
+
+SimHash: the text is normalized (case, Unicode form; URLs, @mentions,
+#hashtags, "RT", emoji and punctuation removed) and split into overlapping
+word 3-grams; every bit of the signature is the sign of the sum of that bit
+over the 3-gram hashes. Similar texts share most 3-grams and therefore most bits.
+
+Lookup is sub-millisecond regardless of index size: the 64 bits are split
+into max_distance + 1 bands, and two signatures within max_distance bits of
+each other agree exactly on at least one band (pigeonhole). Only entries
+sharing a band value with the query are compared. Signatures live in a
+NumPy uint64 array (8 bytes per investigation) and are persisted in the
+shared SQLite cache file, table "near_duplicates".
+
+Configuration (environment variables):
+    VERA_NEAR_DUPLICATE_DISTANCE   Maximum differing bits for a match, 0 disables (default: 4)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from vera.cache import DEFAULT_TTL_SECONDS, cache_path
+
+logger = logging.getLogger("vera.near_duplicate")
+
+DEFAULT_MAX_DISTANCE = 4
+# Shorter texts have too few 3-grams for a stable signature
+MIN_WORDS = 20
+SHINGLE_SIZE = 3
+
+# Links, mentions, hashtags and the retweet marker (matched after casefolding)
+_NOISE = re.compile(r"https?://\S+|www\.\S+|[@#]\w+|\brt\b", re.UNICODE)
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+_BITS = np.arange(64, dtype=np.uint64)
+
+
+def _words(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WORD.findall(_NOISE.sub(" ", text))
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64-bit SimHash of a text's word 3-grams.
+
+    Returns:
+        The signature, or None if the text is too short to fingerprint
+    """
+    words = _words(text)
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    bits = ((hashes[:, None] >> _BITS) & np.uint64(1)).astype(np.int64)
+    votes = (2 * bits - 1).sum(axis=0)
+    return int(np.sum(np.left_shift(np.uint64(1), _BITS[votes > 0]), dtype=np.uint64))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _signed(value: int) -> int:
+    """uint64 -> int64 (SQLite integers are signed)."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class NearDuplicate(NamedTuple):
+    """An earlier investigation of a near-identical text."""
+    cache_key: str
+    distance: int
+
+
+class NearDuplicateIndex:
+    """
+    SimHash index over investigated inputs, persisted in SQLite.
+
+    Args:
+        path: SQLite database file (parent directories are created)
+        max_distance: Maximum number of differing bits for a match
+        ttl_seconds: Lifetime of an entry (the cached report expires too)
+        clock: Time source (seconds), injectable for tests
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        # Bit ranges of the bands (max_distance + 1 of them, as equal as possible)
+        bounds = np.linspace(0, 64, max_distance + 2).astype(int)
+        self._bands = [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+        self._allocate(64)
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicates ("
+                "cache_key TEXT PRIMARY KEY, simhash INTEGER NOT NULL, "
+                "language TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "DELETE FROM near_duplicates WHERE created_at <= ?", (self.clock() - self.ttl_seconds,)
+            )
+            rows = self._conn.execute(
+                "SELECT cache_key, simhash, language, created_at FROM near_duplicates ORDER BY created_at"
+            ).fetchall()
+            for key, signature, language, created_at in rows:
+                self._insert(key, signature & ((1 << 64) - 1), language, created_at)
+
+    def _allocate(self, capacity: int) -> None:
+        self._signatures = np.zeros(capacity, dtype=np.uint64)
+        self._created = np.zeros(capacity, dtype=np.float64)
+        self._keys: List[Optional[str]] = []
+        self._languages: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._tables: List[Dict[int, List[int]]] = [defaultdict(list) for _ in self._bands]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _band_values(self, signature: int) -> List[int]:
+        return [(signature >> lo) & ((1 << (hi - lo)) - 1) for lo, hi in self._bands]
+
+    def _insert(self, key: str, signature: int, language: str, created_at: float) -> None:
+        position = len(self._keys)
+        if position == len(self._signatures):
+            self._signatures = np.resize(self._signatures, 2 * position)
+            self._created = np.resize(self._created, 2 * position)
+        self._signatures[position] = signature
+        self._created[position] = created_at
+        self._keys.append(key)
+        self._languages.append(language)
+        self._positions[key] = position
+        for table, value in zip(self._tables, self._band_values(signature)):
+            table[value].append(position)
+
+    def add(self, cache_key: str, text: str, language: str) -> bool:
+        """
+        Index an investigated input.
+
+        Returns:
+            False if the text is too short to fingerprint or already indexed
+            (an expired entry of the same key is replaced)
+        """
+        signature = simhash(text)
+        if signature is None:
+            return False
+        now = self.clock()
+        with self._lock:
+            position = self._positions.get(cache_key)
+            if position is not None:
+                if self._created[position] > now - self.ttl_seconds:
+                    return False
+                self._drop(position)
+            self._insert(cache_key, signature, language, now)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO near_duplicates (cache_key, simhash, language, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (cache_key, _signed(signature), language, now),
+                )
+                # Expired and replaced entries are pruned once they make up half of the index
+                live = np.flatnonzero(self._created[:len(self._keys)] > now - self.ttl_seconds)
+                if 2 * len(live) < len(self._keys):
+                    self._conn.execute(
+                        "DELETE FROM near_duplicates WHERE created_at <= ?", (now - self.ttl_seconds,)
+                    )
+                    self._compact(live)
+        return True
+
+    def _drop(self, position: int) -> None:
+        # The slot stays in the band tables (find() skips it as expired) until the next compaction
+        self._created[position] = -np.inf
+        del self._positions[self._keys[position]]
+        self._keys[position] = None
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Rebuild the index from the kept positions only."""
+        entries = [
+            (self._keys[position], int(self._signatures[position]), self._languages[position],
+             float(self._created[position]))
+            for position in keep
+        ]
+        self._allocate(max(64, 2 * len(entries)))
+        for entry in entries:
+            self._insert(*entry)
+
+    def find(self, text: str, language: str) -> Optional[NearDuplicate]:
+        """
+        Closest fresh earlier input of the same language within max_distance bits.
+
+        Returns:
+            The match, or None
+        """
+        signature = simhash(text)
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for table, value in zip(self._tables, self._band_values(signature)):
+                candidates.update(table.get(value, ()))
+            if not candidates:
+                return None
+            positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            fresh = self._created[positions] > self.clock() - self.ttl_seconds
+            positions = positions[fresh]
+            best: Optional[NearDuplicate] = None
+            for position, xor in zip(positions, self._signatures[positions] ^ np.uint64(signature)):
+                distance = int(xor).bit_count()
+                if distance <= self.max_distance and self._languages[position] == language:
+                    if best is None or distance < best.distance:
+                        best = NearDuplicate(self._keys[position], distance)
+        return best
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Process-wide near-duplicate index configured from the environment.
+
+    Returns:
+        The index, or None when disabled (VERA_NEAR_DUPLICATE_DISTANCE=0 or
+        the result cache is disabled - there would be no report to reuse)
+    """
+    global _index
+    distance = int(os.environ.get("VERA_NEAR_DUPLICATE_DISTANCE", DEFAULT_MAX_DISTANCE))
+    ttl = float(os.environ.get("VERA_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    if distance <= 0 or ttl <= 0:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex(cache_path(), max_distance=distance, ttl_seconds=ttl)
+            logger.info(f"Near-duplicate index loaded ({len(_index)} inputs, max distance {distance} bits)")
+        return _index
@@ -0,0 +1,1089 @@
+"""
+Investigation Pipeline - Dependency-graph executor for the VERA agents
+
+Each stage declares which earlier stages it needs. A stage starts as soon as
+all of its dependencies have completed, so independent stages run
+concurrently on the same event loop:
+
+    Claims ─> Researcher (one worker per claim) ─┐
+    Librarian ───────────────────────────────────┼─> Critic ─> Scoring ─> Reporter
+    Analyst ─────────────────────────────────────┘
+
+The Researcher is a fan-out stage (FanOut): the Claim Extractor emits a
+structured claim list, one verification worker per claim runs concurrently
+with its own searches, and the verdicts are merged into a single "Research
+Findings" output for the later stages. Claims verified by an earlier
+investigation are answered from the claim verdict cache (vera/claim_cache.py)
+without starting a worker.
+
+Long documents use a map-reduce graph instead (get_long_document_stages):
+claim extraction and manipulation analysis run per section, concurrently,
+and the Researcher verifies the merged per-section claim lists before
+Critic, Scoring and Reporter run on the merged findings.
+
+Design Decision: Stages exchange structured state, not session history.
+Every agent publishes its result under its `output_key`; the pipeline keeps
+these results in one state dict (plus the wrapped user input under
+"user_input"). A stage declares the state keys it needs (`inputs`) and runs
+in its own fresh branch session, with `include_contents="none"`, on a
+single message holding exactly those inputs and its task. Later agents
+therefore never re-read the user text, tool calls or prompts of earlier
+stages, and input tokens grow with what a stage uses, not with the length
+of the chain.
+
+Results are structured where possible: Claims, Analyst, Critic, Scoring and
+Reporter publish JSON matching a response schema (output_schema), Researcher
+workers a JSON verdict per claim; the final report is rendered from them
+(vera/report.py). A stage with a `schema` has its result validated;
+an invalid result is retried once with the validation errors, and fails the
+stage if still invalid, so no later stage has to guess from prose.
+
+Agents are built once per process (the get_*_agent factories are cached)
+and shared by all investigations, including concurrent ones. Per-request
+values (current date and time, report language) are seeded into each
+branch session's state (InvestigationPipeline context) and read by the
+agents at run time.
+
+Completed stages can be checkpointed (vera/checkpoints.py): a run with the
+same run_id restores their results and restarts at the first incomplete
+stage, so a failure late in the graph costs one stage on retry, not all.
+A run holds its run_id for as long as it runs; a concurrent run with the
+same run_id neither restores nor saves checkpoints.
+
+A run can have one deadline (InvestigationPipeline deadline). Optional
+stages (Librarian, Critic) and fan-out stages get what is left of it minus
+the minimum budget of the required stages still to come, and are skipped,
+cut short or truncated instead of pushing the required ones past it
+(`degraded`). Other required stages may use all that is left: cutting one
+short would fail the investigation anyway.
+
+Every stage is instrumented (vera/metrics.py): token usage, tool calls and
+latency, time to first event and first text response go out with its "Completed"
+log record and are kept in InvestigationPipeline.metrics.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from google.adk.agents import Agent
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+from google.genai import types as genai_types
+from pydantic import BaseModel, ValidationError
+
+from vera.checkpoints import CheckpointStore
+from vera.metrics import StageMetrics
+
+logger = logging.getLogger("vera.pipeline")
+
+# Per-stage timeout (seconds) - same budget every agent had in the sequential loop
+STAGE_TIMEOUT = 300.0
+# Time a stage needs at least (seconds), unless the stage sets its own
+MIN_STAGE_BUDGET = 10.0
+# Time a fan-out stage keeps for merging when its workers hit the stage budget
+FAN_OUT_MERGE_MARGIN = 2.0
+# Maximum stages running at once (long documents fan out to many section stages)
+MAX_CONCURRENT_STAGES = 8
+# Maximum workers of one fan-out stage running at once
+MAX_FAN_OUT_WORKERS = 8
+
+# State key of the wrapped user input
+USER_INPUT = "user_input"
+
+# Headings of the state keys in stage messages (as named in the agent instructions)
+STATE_LABELS = {
+    "claims": "Extracted Claims",
+    "research_findings": "Research Findings",
+    "librarian_report": "Librarian Report",
+    "analysis_report": "Analysis Report",
+    "critique": "Critique",
+    "scores": "Scores",
+    "report_summary": "Report Summary",
+}
+
+
+def event_text(event) -> str:
+    """
+    Concatenate the text parts of an ADK event.
+
+    Events may carry the same parts in both event.content and
+    event.model_content; the first of the two that has text is used, so
+    text is never counted twice.
+    """
+    for content in (getattr(event, 'content', None), getattr(event, 'model_content', None)):
+        if content and content.parts:
+            text = "".join(part.text for part in content.parts if getattr(part, 'text', None))
+            if text:
+                return text
+    return ""
+
+
+def state_label(key: str) -> str:
+    """Heading of a state key ("analysis_report_2" -> "Analysis Report (section 2)")."""
+    base, _, suffix = key.rpartition("_")
+    if base and suffix.isdigit():
+        return f"{STATE_LABELS.get(base, base)} (section {suffix})"
+    return STATE_LABELS.get(key, key)
+
+
+def state_text(value) -> str:
+    """State values as text (agents with an output_schema publish dicts)."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def compose_message(inputs: Dict[str, object], task: Optional[str]) -> str:
+    """
+    A stage's message: its declared inputs, each under a heading, then its task.
+
+    The user input is passed verbatim (it carries its own USER_INPUT markers);
+    structured results are passed as JSON. Results of skipped optional
+    stages (None) are left out.
+    """
+    parts = []
+    for key, value in inputs.items():
+        if value is None:
+            continue  # Optional stage skipped (see Stage.optional)
+        parts.append(value if key == USER_INPUT else f"### {state_label(key)}\n{state_text(value)}")
+    if task:
+        parts.append(task)
+    return "\n\n".join(parts)
+
+
+class StructuredOutputError(ValueError):
+    """A stage result does not match the stage's schema, even after a retry."""
+
+
+class StageTimeoutError(asyncio.TimeoutError):
+    """A required stage did not finish within its budget."""
+
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def parse_structured(schema: Type[BaseModel], value) -> dict:
+    """
+    Validate a stage result against its schema.
+
+    Args:
+        schema: Pydantic model of the result
+        value: Published result: a dict (output_schema) or JSON text,
+            optionally in a code fence
+
+    Returns:
+        The validated result as a dict
+
+    Raises:
+        ValidationError: If the result does not match the schema
+    """
+    if isinstance(value, str):
+        return schema.model_validate_json(_CODE_FENCE.sub("", value.strip())).model_dump()
+    return schema.model_validate(value).model_dump()
+
+
+def validation_errors(exc: ValidationError) -> str:
+    """Compact description of validation errors, for the retry prompt and logs."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'output'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class WorkItem(NamedTuple):
+    """One unit of a fan-out stage: `key` identifies it (e.g. the claim), `prompt` is sent to the worker."""
+    key: str
+    prompt: str
+
+
+@dataclass(frozen=True)
+class FanOut:
+    """
+    Runs a stage's agent once per work item, concurrently, and merges the outputs.
+
+    Attributes:
+        split: Turns the stage's inputs (state values, in declaration order)
+            into work items
+        merge: Builds the stage result from the work items and their outputs
+            (the exception for a failed worker), in work item order
+        max_workers: Maximum workers running at once
+        lookup: Optional coroutine returning a known output per work item key
+            (None where a worker must run)
+        store: Optional coroutine receiving the keys and outputs of the
+            workers that ran successfully
+    """
+    split: Callable[[List[object]], List[WorkItem]]
+    merge: Callable[[List[WorkItem], List[object]], object]
+    max_workers: int = MAX_FAN_OUT_WORKERS
+    lookup: Optional[Callable[[List[str]], Awaitable[List[Optional[object]]]]] = None
+    store: Optional[Callable[[List[str], List[object]], Awaitable[None]]] = None
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A single step of the investigation.
+
+    Attributes:
+        name: Display name of the stage (e.g. "Researcher")
+        agent_factory: Callable building the ADK agent for this stage
+        prompt: Task appended to the stage's inputs. Long-document stages
+            carry their section in the prompt.
+        depends_on: Names of stages that must complete first
+        inputs: State keys the stage receives: USER_INPUT and/or the
+            output_key of (transitive) dependencies
+        output_key: State key the stage publishes its result under
+        fan_out: Run the agent once per work item instead of once per stage
+            (prompt is then unused)
+        schema: Pydantic model the result (of every fan-out worker) must
+            match; the result is published as the validated dict
+        optional: The investigation can do without this stage: under a
+            deadline it is skipped, or cut short, when time runs out, and
+            publishes None
+        min_budget: Time (s) the stage needs at least; an optional stage
+            with less time left is skipped, and optional and fan-out stages
+            keep this much for every required stage still to come
+    """
+    name: str
+    agent_factory: Callable[[], Agent]
+    prompt: Optional[str] = None
+    depends_on: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = (USER_INPUT,)
+    output_key: Optional[str] = None
+    fan_out: Optional[FanOut] = None
+    schema: Optional[Type[BaseModel]] = None
+    optional: bool = False
+    min_budget: float = MIN_STAGE_BUDGET
+
+
+def stage_role(name: str) -> str:
+    """Agent role of a stage ("Analyst-3" -> "Analyst")."""
+    return name.split("-", 1)[0]
+
+
+def claim_verification_items(outputs: List[object], source_url: Optional[str] = None) -> List[WorkItem]:
+    """
+    One verification work item per claim in the Claim Extractor outputs.
+
+    Args:
+        outputs: Claim Extractor outputs (claim lists)
+        source_url: URL the text was extracted from; verifiers must not cite it
+
+    Returns:
+        Work items for the Researcher workers (keyed on the claim text),
+        most important claims first
+    """
+    from vera.agents.claim_extractor import parse_claims
+
+    claims = parse_claims(outputs)
+    source_exclusion = ""
+    if source_url:
+        source_exclusion = f"[SOURCE URL TO VERIFY: {source_url}] (DO NOT CITE THIS URL AS A VERIFICATION SOURCE - FIND INDEPENDENT SOURCES)\n"
+    items = []
+    for i, claim in enumerate(claims, 1):
+        context = f"\nContext: {claim.context}" if claim.context else ""
+        items.append(WorkItem(
+            claim.claim,
+            f"{source_exclusion}Verify claim {i} of {len(claims)}.\n"
+            f"<<<USER_INPUT_START>>>\n{claim.claim}{context}\n<<<USER_INPUT_END>>>",
+        ))
+    return items
+
+
+def merge_verdicts(items: List[WorkItem], outputs: List[object]) -> dict:
+    """
+    Research Findings from the per-claim verdicts, in claim order.
+
+    A failed worker leaves its claim "Unverified", with the failure as explanation.
+    """
+    claims = []
+    for item, output in zip(items, outputs):
+        if isinstance(output, BaseException):
+            output = {
+                "claim": item.key,
+                "verdict": "Unverified",
+                "sources": [],
+                "explanation": f"Verification failed ({type(output).__name__}).",
+            }
+        claims.append(output)
+    return {"claims": claims}
+
+
+def _verification_fan_out(source_url: Optional[str]) -> FanOut:
+    from vera.claim_cache import lookup_verdicts, store_verdicts
+
+    return FanOut(
+        split=functools.partial(claim_verification_items, source_url=source_url),
+        merge=merge_verdicts,
+        lookup=lookup_verdicts,
+        store=store_verdicts,
+    )
+
+
+def get_investigation_stages(source_url: Optional[str] = None) -> List[Stage]:
+    """
+    Returns the default VERA stage graph.
+
+    Claim extraction, Librarian and Analyst only need the original user text,
+    so they run concurrently. The Researcher verifies every extracted claim
+    in its own worker, Critic reviews research, definitions and analysis,
+    then Scoring and Reporter follow in order. Only Claims, Librarian,
+    Analyst and Critic see the user text itself; Scoring and Reporter work
+    from the published findings.
+
+    Args:
+        source_url: URL the text was extracted from, if any
+
+    Returns:
+        List of stages in declaration (display) order
+    """
+    from vera.agents import (
+        get_claim_extractor_agent,
+        get_researcher_agent,
+        get_librarian_agent,
+        get_analyst_agent,
+        get_critic_agent,
+        get_scoring_agent,
+        get_reporter_agent,
+    )
+    from vera.agents.analyst import AnalysisReport
+    from vera.agents.critic import Critique
+    from vera.agents.reporter import ReportSummary
+    from vera.agents.researcher import ClaimVerdict
+    from vera.agents.scoring import Scores
+
+    return [
+        Stage(
+            "Claims",
+            get_claim_extractor_agent,
+            prompt="List the verifiable factual claims in the text above.",
+            output_key="claims",
+        ),
+        Stage(
+            "Researcher",
+            get_researcher_agent,
+            depends_on=("Claims",),
+            inputs=("claims",),
+            output_key="research_findings",
+            fan_out=_verification_fan_out(source_url),
+            schema=ClaimVerdict,
+            min_budget=30.0,
+        ),
+        Stage(
+            "Librarian",
+            get_librarian_agent,
+            prompt="Identify terms in the text above that need definition and search Wikipedia.",
+            output_key="librarian_report",
+            optional=True,
+        ),
+        Stage(
+            "Analyst",
+            get_analyst_agent,
+            prompt="Analyze the text above for manipulation.",
+            output_key="analysis_report",
+            schema=AnalysisReport,
+        ),
+        Stage(
+            "Critic",
+            get_critic_agent,
+            prompt="Review the research, librarian report, and analysis above. Provide a critique.",
+            depends_on=("Researcher", "Librarian", "Analyst"),
+            inputs=(USER_INPUT, "research_findings", "librarian_report", "analysis_report"),
+            output_key="critique",
+            schema=Critique,
+            optional=True,
+        ),
+        Stage(
+            "Scoring",
+            get_scoring_agent,
+            prompt="Based on all findings above, provide scores.",
+            depends_on=("Critic",),
+            inputs=("research_findings", "librarian_report", "analysis_report", "critique"),
+            output_key="scores",
+            schema=Scores,
+        ),
+        Stage(
+            "Reporter",
+            get_reporter_agent,
+            prompt="Write the executive summary and conclusion for the findings above.",
+            depends_on=("Scoring",),
+            inputs=("research_findings", "librarian_report", "analysis_report", "critique", "scores"),
+            output_key="report_summary",
+            schema=ReportSummary,
+        ),
+    ]
+
+
+def get_long_document_stages(
+    sections: Sequence[str],
+    source_url: Optional[str] = None,
+) -> List[Stage]:
+    """
+    Returns the map-reduce stage graph for documents split into sections.
+
+    Map: one Claims-N (claim extraction) and one Analyst-N stage per section,
+    all concurrent, each seeing only its own section.
+    Reduce: Researcher verifies the merged, de-duplicated claim lists (one
+    worker per claim) and Librarian defines their terms; Critic
+    reviews research, definitions and every section's analysis, then Scoring
+    and Reporter follow as usual. The full document never enters a single
+    agent's context.
+
+    Args:
+        sections: Wrapped section texts (see vera.investigation.wrap_user_input)
+        source_url: URL the document was extracted from, if any
+
+    Returns:
+        List of stages in declaration (display) order
+    """
+    from vera.agents import (
+        get_claim_extractor_agent,
+        get_researcher_agent,
+        get_librarian_agent,
+        get_analyst_agent,
+        get_critic_agent,
+        get_scoring_agent,
+        get_reporter_agent,
+    )
+    from vera.agents.analyst import AnalysisReport
+    from vera.agents.critic import Critique
+    from vera.agents.reporter import ReportSummary
+    from vera.agents.researcher import ClaimVerdict
+    from vera.agents.scoring import Scores
+
+    count = len(sections)
+    numbers = range(1, count + 1)
+    claims = tuple(f"Claims-{i}" for i in numbers)
+    analyses = tuple(f"Analyst-{i}" for i in numbers)
+    claim_keys = tuple(f"claims_{i}" for i in numbers)
+    analysis_keys = tuple(f"analysis_report_{i}" for i in numbers)
+
+    def section_prompt(i: int, task: str) -> str:
+        return f"This is section {i} of {count} of a long document.\n{sections[i - 1]}\n\n{task}"
+
+    stages = [
+        Stage(
+            f"Claims-{i}",
+            get_claim_extractor_agent,
+            prompt=section_prompt(i, "List the verifiable factual claims in this section."),
+            inputs=(),
+            output_key=f"claims_{i}",
+        )
+        for i in numbers
+    ]
+    stages += [
+        Stage(
+            f"Analyst-{i}",
+            get_analyst_agent,
+            prompt=section_prompt(i, "Analyze this section for manipulation."),
+            inputs=(),
+            output_key=f"analysis_report_{i}",
+            schema=AnalysisReport,
+        )
+        for i in numbers
+    ]
+    findings = ("research_findings", "librarian_report") + analysis_keys
+    stages += [
+        Stage(
+            "Researcher",
+            get_researcher_agent,
+            depends_on=claims,
+            inputs=claim_keys,
+            output_key="research_findings",
+            fan_out=_verification_fan_out(source_url),
+            schema=ClaimVerdict,
+            min_budget=30.0,
+        ),
+        Stage(
+            "Librarian",
+            get_librarian_agent,
+            prompt="Identify terms in the claims above that need definition and search Wikipedia.",
+            depends_on=claims,
+            inputs=claim_keys,
+            output_key="librarian_report",
+            optional=True,
+        ),
+        Stage(
+            "Critic",
+            get_critic_agent,
+            prompt=(
+                "Review the research, librarian report, and the per-section analyses above "
+                "as findings about one document. Provide a critique."
+            ),
+            depends_on=("Researcher", "Librarian") + analyses,
+            inputs=findings,
+            output_key="critique",
+            schema=Critique,
+            optional=True,
+        ),
+        Stage(
+            "Scoring",
+            get_scoring_agent,
+            prompt="Based on all findings above, provide scores for the document as a whole.",
+            depends_on=("Critic",),
+            inputs=findings + ("critique",),
+            output_key="scores",
+            schema=Scores,
+        ),
+        Stage(
+            "Reporter",
+            get_reporter_agent,
+            prompt="Write the executive summary and conclusion for the document as a whole, from the findings above.",
+            depends_on=("Scoring",),
+            inputs=findings + ("critique", "scores"),
+            output_key="report_summary",
+            schema=ReportSummary,
+        ),
+    ]
+    return stages
+
+
+def validate_stages(stages: Sequence[Stage]) -> None:
+    """
+    Check that stage names are unique, dependencies exist, the graph is
+    acyclic and every stage input is published by one of its dependencies.
+
+    Raises:
+        ValueError: If the stage graph is invalid
+    """
+    names = [stage.name for stage in stages]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate stage names: {names}")
+
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        for dep in stage.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    # Depth-first search for cycles
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle detected at stage '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].depends_on:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in names:
+        visit(name)
+
+    # Every input must be published by a stage that is guaranteed to have completed
+    for stage in stages:
+        available = {by_name[dep].output_key for dep in transitive_dependencies(stages, stage.name)}
+        for key in stage.inputs:
+            if key != USER_INPUT and key not in available:
+                raise ValueError(f"Stage '{stage.name}' needs '{key}', which none of its dependencies publish")
+
+
+def transitive_dependencies(stages: Sequence[Stage], name: str) -> List[str]:
+    """
+    Returns every stage `name` depends on, directly or indirectly,
+    in declaration order.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    needed = set()
+    stack = list(by_name[name].depends_on)
+    while stack:
+        dep = stack.pop()
+        if dep not in needed:
+            needed.add(dep)
+            stack.extend(by_name[dep].depends_on)
+    return [stage.name for stage in stages if stage.name in needed]
+
+
+def downstream_reserve(stages: Sequence[Stage]) -> Dict[str, float]:
+    """
+    Time (s) to keep, after each stage, for the required stages still to
+    come: the largest sum of their min_budget on any path through the
+    stage's dependents. Optional stages are not reserved for.
+    """
+    dependents: Dict[str, List[Stage]] = {stage.name: [] for stage in stages}
+    for stage in stages:
+        for dep in stage.depends_on:
+            dependents[dep].append(stage)
+
+    reserve: Dict[str, float] = {}
+
+    def visit(name: str) -> float:
+        if name not in reserve:
+            reserve[name] = max(
+                (visit(child.name) + (0.0 if child.optional else child.min_budget) for child in dependents[name]),
+                default=0.0,
+            )
+        return reserve[name]
+
+    for stage in stages:
+        visit(stage.name)
+    return reserve
+
+
+async def run_dag(
+    stages: Sequence[Stage],
+    run_stage: Callable[[Stage], Awaitable[None]],
+    on_stage_start: Optional[Callable[[str], None]] = None,
+    on_stage_end: Optional[Callable[[str, float], None]] = None,
+    max_concurrency: Optional[int] = None,
+    completed: Iterable[str] = (),
+) -> Dict[str, float]:
+    """
+    Execute stages respecting their dependencies, running independent ones concurrently.
+
+    If any stage fails, the remaining in-flight stages are cancelled and the
+    exception is re-raised.
+
+    Args:
+        stages: Stage graph to execute
+        run_stage: Coroutine function executing a single stage
+        on_stage_start: Optional callback invoked with the stage name when it starts
+        on_stage_end: Optional callback invoked with the stage name and duration (s)
+        max_concurrency: Maximum number of stages running at once (unbounded if None)
+        completed: Names of stages already completed (e.g. restored from
+            checkpoints); they are not run again
+
+    Returns:
+        Mapping of stage name to duration in seconds (of the stages run)
+    """
+    validate_stages(stages)
+
+    timings: Dict[str, float] = {}
+    completed = set(completed)
+    running: Dict[asyncio.Task, Tuple[Stage, float]] = {}
+
+    def launch_ready() -> None:
+        in_flight = {stage.name for stage, _ in running.values()}
+        for stage in stages:
+            if stage.name in completed or stage.name in in_flight:
+                continue
+            if max_concurrency is not None and len(running) >= max_concurrency:
+                return
+            if all(dep in completed for dep in stage.depends_on):
+                if on_stage_start:
+                    on_stage_start(stage.name)
+                task = asyncio.create_task(run_stage(stage), name=f"vera-stage-{stage.name}")
+                running[task] = (stage, time.time())
+
+    try:
+        launch_ready()
+        while running:
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage, started = running.pop(task)
+                task.result()  # Re-raise stage failure
+                duration = time.time() - started
+                timings[stage.name] = duration
+                completed.add(stage.name)
+                if on_stage_end:
+                    on_stage_end(stage.name, duration)
+            launch_ready()
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running.keys(), return_exceptions=True)
+
+    return timings
+
+
+class InvestigationPipeline:
+    """
+    Runs the VERA stage graph with ADK runners on branch sessions.
+
+    Args:
+        stages: Stage graph to execute
+        session_service: ADK session service holding the branch sessions
+        app_name: ADK application name
+        user_id: ADK user id
+        session_id: Investigation session id, used as prefix for branch sessions
+        context: Per-request values (e.g. "current_datetime", "language")
+            seeded into the state of every branch session. Agents are built
+            once per process and shared; they read these values at run time
+            ({current_datetime} in an instruction, or an instruction provider).
+        checkpoints: Store for the results of completed stages
+            (vera/checkpoints.py); stages checkpointed by an earlier run
+            with the same run_id are restored instead of run again (unless
+            another run with this run_id is in progress)
+        run_id: Checkpoint key of this run (defaults to session_id)
+        deadline: Time (s) the whole run may take. Optional and fan-out
+            stages get what is left of it minus the min_budget of the
+            required stages after them and are skipped, cut short or
+            truncated when time runs short (see `degraded`); other required
+            stages get all that is left. None: every stage gets STAGE_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        session_service: BaseSessionService,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        context: Optional[Dict[str, str]] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        run_id: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ):
+        validate_stages(stages)
+        self.stages = list(stages)
+        self.session_service = session_service
+        self.app_name = app_name
+        self.user_id = user_id
+        self.session_id = session_id
+        self.context = {"current_datetime": "Unknown", "language": "English", **(context or {})}
+        # Published stage results by output_key, plus the user input
+        self.state: Dict[str, object] = {}
+        # Instrumentation per stage
+        self.metrics: Dict[str, StageMetrics] = {}
+        self.checkpoints = checkpoints
+        self.run_id = run_id or session_id
+        # Stages restored from checkpoints instead of run
+        self.resumed: List[str] = []
+        self.deadline = deadline
+        self._deadline_at: Optional[float] = None
+        # Stages skipped or cut short to meet the deadline, with the reason:
+        # "skipped", "timed_out" (optional stages, result None) or
+        # "truncated" (fan-out workers not finished in time)
+        self.degraded: Dict[str, str] = {}
+
+    def branch_session_id(self, stage_name: str) -> str:
+        return f"{self.session_id}-{stage_name.lower()}"
+
+    async def run(
+        self,
+        user_msg: genai_types.Content,
+        on_stage_start: Optional[Callable[[str], None]] = None,
+        on_stage_end: Optional[Callable[[str, float], None]] = None,
+        on_event: Optional[Callable[[str, Event], None]] = None,
+    ) -> Dict[str, float]:
+        """
+        Run all stages for the given user message.
+
+        Args:
+            user_msg: The wrapped user input
+            on_stage_start: Callback invoked when a stage starts
+            on_stage_end: Callback invoked with stage name and duration when it completes
+            on_event: Callback invoked for every ADK event with the stage name
+
+        Returns:
+            Mapping of stage name to duration in seconds (of the stages run,
+            not of stages restored from checkpoints)
+        """
+        self.state[USER_INPUT] = "".join(part.text or "" for part in user_msg.parts)
+        self.resumed = []
+        self.degraded = {}
+        self._deadline_at = time.monotonic() + self.deadline if self.deadline else None
+        reserve = downstream_reserve(self.stages)
+        checkpoints = self.checkpoints
+        if checkpoints is not None and not checkpoints.acquire(self.run_id):
+            logger.info("Another run of this investigation is in progress, running without checkpoints", extra={
+                "session_id": self.session_id,
+            })
+            checkpoints = None
+
+        def stage_started(name: str) -> None:
+            logger.info(f"Starting {name}", extra={"session_id": self.session_id, "agent_name": name})
+            if on_stage_start:
+                on_stage_start(name)
+
+        def stage_finished(name: str, duration: float) -> None:
+            logger.info(f"Completed {name}", extra={
+                "session_id": self.session_id,
+                "agent_name": name,
+                "duration_ms": int(duration * 1000),
+                **self.metrics[name].to_dict(),
+            })
+            if on_stage_end:
+                on_stage_end(name, duration)
+
+        async def run_stage(stage: Stage) -> None:
+            self.metrics[stage.name] = StageMetrics()
+            budget = self.stage_budget(stage, reserve[stage.name])
+            if stage.optional and budget < stage.min_budget:
+                self._degrade(stage, "skipped")
+                return
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self._run_stage(stage, on_event, budget), timeout=budget)
+            except asyncio.TimeoutError:
+                if not stage.optional:
+                    limit = f"the {self.deadline:g}s investigation deadline" if self.deadline else "its timeout"
+                    raise StageTimeoutError(
+                        f"{stage.name} did not finish within {budget:.1f}s ({limit})"
+                    ) from None
+                self._degrade(stage, "timed_out")
+                return
+            if checkpoints is not None and stage.name not in self.degraded:
+                await asyncio.to_thread(
+                    checkpoints.save,
+                    self.run_id, stage.name, self.state.get(stage.output_key), time.monotonic() - started,
+                )
+
+        try:
+            if checkpoints is not None:
+                restored = await asyncio.to_thread(checkpoints.load, self.run_id, [stage.name for stage in self.stages])
+                for stage in self.stages:
+                    if stage.name in restored:
+                        if stage.output_key:
+                            self.state[stage.output_key] = restored[stage.name].value
+                        self.resumed.append(stage.name)
+                if self.resumed:
+                    logger.info(f"Resuming from checkpoints, skipping {', '.join(self.resumed)}", extra={
+                        "session_id": self.session_id,
+                    })
+            return await run_dag(
+                self.stages, run_stage, stage_started, stage_finished,
+                max_concurrency=MAX_CONCURRENT_STAGES, completed=self.resumed,
+            )
+        finally:
+            if checkpoints is not None:
+                checkpoints.release(self.run_id)
+
+    def stage_budget(self, stage: Stage, reserve: float) -> float:
+        """
+        Timeout (s) for a stage starting now. Stages that can give way
+        (optional ones are skipped or cut short, fan-out workers truncated)
+        get what is left of the deadline minus `reserve` (see
+        downstream_reserve); a required fan-out stage may dip into the
+        reserve up to its own min_budget rather than not run. Other required
+        stages get all that is left: cutting one short fails the run.
+        """
+        if self._deadline_at is None:
+            return STAGE_TIMEOUT
+        left = self._deadline_at - time.monotonic()
+        if stage.optional:
+            budget = left - reserve
+        elif stage.fan_out is not None:
+            budget = max(left - reserve, min(stage.min_budget, left))
+        else:
+            budget = left
+        return max(0.0, min(STAGE_TIMEOUT, budget))
+
+    def _degrade(self, stage: Stage, reason: str) -> None:
+        """Record an optional stage dropped for the deadline; it publishes None."""
+        logger.warning(f"{stage.name} {reason.replace('_', ' ')} to meet the deadline", extra={
+            "session_id": self.session_id,
+            "agent_name": stage.name,
+        })
+        self.degraded[stage.name] = reason
+        if stage.output_key:
+            self.state[stage.output_key] = None
+
+    async def clear_checkpoints(self) -> None:
+        """Drop this run's checkpoints (once its result is complete), unless another run is using them."""
+        if self.checkpoints is None or not self.checkpoints.acquire(self.run_id):
+            return
+        try:
+            await asyncio.to_thread(self.checkpoints.clear, self.run_id, [stage.name for stage in self.stages])
+        finally:
+            self.checkpoints.release(self.run_id)
+
+    async def _run_agent(
+        self,
+        stage: Stage,
+        agent: Agent,
+        session_id: str,
+        message: str,
+        on_event: Optional[Callable[[str, Event], None]] = None,
+    ) -> object:
+        """
+        Run an agent on a fresh branch session and return the result it published.
+
+        The agent sees only `message` (include_contents="none"); its result is
+        read from the session state under the agent's output_key (a dict for
+        agents with an output_schema), falling back to the text of its final
+        response.
+        """
+        await self.session_service.create_session(
+            app_name=self.app_name,
+            user_id=self.user_id,
+            session_id=session_id,
+            state=dict(self.context),
+        )
+        runner = Runner(agent=agent, app_name=self.app_name, session_service=self.session_service)
+        final_text = ""
+        async for event in runner.run_async(
+            user_id=self.user_id,
+            session_id=session_id,
+            new_message=genai_types.Content(role="user", parts=[genai_types.Part.from_text(text=message)]),
+        ):
+            self.metrics.setdefault(stage.name, StageMetrics()).record(event)
+            if on_event:
+                on_event(stage.name, event)
+            if not event.partial and event.is_final_response():
+                final_text = event_text(event) or final_text
+
+        if agent.output_key:
+            session = await self.session_service.get_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=session_id,
+            )
+            published = session.state.get(agent.output_key)
+            if published is not None:
+                return published
+        return final_text
+
+    async def _run_validated(
+        self,
+        stage: Stage,
+        agent: Agent,
+        session_id: str,
+        message: str,
+        on_event: Optional[Callable[[str, Event], None]] = None,
+    ) -> object:
+        """
+        Run an agent and validate its result against the stage schema.
+
+        An invalid result (or an output_schema agent failing validation
+        inside ADK) is retried once on a fresh session, with the validation
+        errors appended to the message.
+
+        Raises:
+            StructuredOutputError: If the retry is invalid too
+        """
+        if stage.schema is None:
+            return await self._run_agent(stage, agent, session_id, message, on_event)
+        try:
+            return parse_structured(stage.schema, await self._run_agent(stage, agent, session_id, message, on_event))
+        except ValidationError as exc:
+            errors = validation_errors(exc)
+        logger.warning(f"{stage.name}: invalid {stage.schema.__name__}, retrying: {errors}", extra={
+            "session_id": self.session_id,
+            "agent_name": stage.name,
+        })
+        retry = (
+            f"{message}\n\nYour previous answer was rejected because it does not match the required "
+            f"JSON format ({errors}). Answer again with only the JSON object."
+        )
+        try:
+            return parse_structured(
+                stage.schema, await self._run_agent(stage, agent, f"{session_id}-retry", retry, on_event)
+            )
+        except ValidationError as exc:
+            raise StructuredOutputError(
+                f"{stage.name}: invalid {stage.schema.__name__} after retry: {validation_errors(exc)}"
+            ) from exc
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        on_event: Optional[Callable[[str, Event], None]],
+        budget: float = STAGE_TIMEOUT,
+    ) -> None:
+        if stage.fan_out is not None:
+            result = await self._run_fan_out(stage, on_event, budget)
+        else:
+            message = compose_message({key: self.state[key] for key in stage.inputs}, stage.prompt)
+            result = await self._run_validated(
+                stage, stage.agent_factory(), self.branch_session_id(stage.name), message, on_event
+            )
+        if stage.output_key:
+            self.state[stage.output_key] = result
+
+    async def _run_fan_out(
+        self,
+        stage: Stage,
+        on_event: Optional[Callable[[str, Event], None]],
+        budget: float = STAGE_TIMEOUT,
+    ) -> object:
+        """
+        Run one worker per work item and merge their outputs.
+
+        Workers start from an empty branch session: their prompt carries all
+        the context they need. Items with a known output (FanOut.lookup) are
+        not run. A failed worker is reported in the merged output instead of
+        failing the stage; lookup and store failures only cost the reuse.
+        Workers still running when the stage budget (less a margin for
+        merging) runs out are cancelled and reported as timed out, and the
+        stage is marked "truncated" in `degraded`.
+
+        Returns:
+            The merged output (also forwarded to on_event as one model event)
+        """
+        workers_until = time.monotonic() + budget - FAN_OUT_MERGE_MARGIN
+        fan_out = stage.fan_out
+        items = fan_out.split([self.state[key] for key in stage.inputs])
+        keys = [item.key for item in items]
+        agent = stage.agent_factory()
+
+        results: List[object] = [None] * len(items)
+        if fan_out.lookup is not None and items:
+            try:
+                results = list(await fan_out.lookup(keys))
+            except Exception as exc:
+                logger.warning(f"{stage.name}: lookup failed: {exc}", extra={"session_id": self.session_id})
+        pending = [i for i, result in enumerate(results) if result is None]
+        logger.info(f"{stage.name}: {len(pending)} workers, {len(items) - len(pending)} reused", extra={
+            "session_id": self.session_id,
+            "agent_name": stage.name,
+        })
+
+        semaphore = asyncio.Semaphore(fan_out.max_workers)
+
+        async def run_worker(index: int, prompt: str) -> str:
+            async with semaphore:
+                return await self._run_worker(stage, agent, index, prompt)
+
+        tasks = [asyncio.ensure_future(run_worker(i + 1, items[i].prompt)) for i in pending]
+        late = set()
+        if tasks:
+            _, late = await asyncio.wait(tasks, timeout=max(0.0, workers_until - time.monotonic()))
+            for task in late:
+                task.cancel()
+        worker_results = await asyncio.gather(*tasks, return_exceptions=True)
+        for i, task, result in zip(pending, tasks, worker_results):
+            results[i] = asyncio.TimeoutError() if task in late else result
+        if late:
+            self.degraded[stage.name] = "truncated"
+            logger.warning(f"{stage.name}: {len(late)} of {len(items)} workers stopped at the stage budget", extra={
+                "session_id": self.session_id,
+                "agent_name": stage.name,
+            })
+
+        if fan_out.store is not None:
+            fresh = [i for i in pending if not isinstance(results[i], BaseException)]
+            if fresh:
+                try:
+                    await fan_out.store([keys[i] for i in fresh], [results[i] for i in fresh])
+                except Exception as exc:
+                    logger.warning(f"{stage.name}: store failed: {exc}", extra={"session_id": self.session_id})
+
+        for i, result in enumerate(results, 1):
+            if isinstance(result, BaseException):
+                logger.warning(f"{stage.name} worker {i} failed: {result}", extra={
+                    "session_id": self.session_id,
+                    "agent_name": stage.name,
+                })
+        merged = fan_out.merge(items, results)
+
+        if on_event:
+            on_event(stage.name, Event(
+                author=agent.name,
+                content=genai_types.Content(
+                    role="model", parts=[genai_types.Part.from_text(text=state_text(merged))]
+                ),
+            ))
+        return merged
+
+    async def _run_worker(
+        self,
+        stage: Stage,
+        agent: Agent,
+        index: int,
+        prompt: str,
+    ) -> object:
+        """Run one fan-out worker on its own branch session and return its result."""
+        return await self._run_validated(stage, agent, self.branch_session_id(f"{stage.name}-{index}"), prompt)
@@ -0,0 +1,216 @@
+"""
+Report Renderer - Builds the final VERA report from structured findings
+
+The report layout is fixed (six sections, word and item limits), and every
+section except the executive summary and the conclusion restates data the
+earlier agents already published: scores (Scoring), claim verdicts
+(Researcher), techniques (Analyst) and concerns (Critic). Those sections are
+rendered here from the structured outputs, in English or Polish, so the
+Reporter agent only writes the two prose paragraphs and every report is
+well-formed by construction.
+
+Source citations are cleaned on the way: Google Search grounding returns
+temporary redirect URLs that expire, so such URLs are dropped and only the
+description of the source is kept.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+# Items per section (the layout the Reporter was asked to follow)
+MAX_CLAIMS = 5
+MAX_TECHNIQUES = 5
+MAX_CONCERNS = 3
+
+LABELS = {
+    "English": {
+        "title": "VERA Analysis Report",
+        "summary": "1. Executive Summary",
+        "assessment": "2. Quantitative Assessment",
+        "verification": "3. Factual Verification",
+        "impact": "4. Potential Impact Analysis",
+        "review": "5. Critical Review",
+        "conclusion": "6. Conclusion",
+        "disinformation": "Potential Disinformation Level",
+        "manipulation": "Potential Manipulation Level",
+        "confidence": "Analysis Confidence",
+        "claim": "Claim",
+        "verdict": "Verdict",
+        "source": "Source",
+        "technique": "Technique",
+        "example": "Example",
+        "True": "True",
+        "False": "False",
+        "Unverified": "Unverified",
+        "no_score": "n/a",
+        "no_sources": "No independent source found",
+        "search_source": "Verified via Google Search",
+        "reused": "verdict reused from an earlier verification on {date}",
+        "no_claims": "No verifiable factual claims were found in the text.",
+        "no_techniques": "No manipulation techniques were identified.",
+        "no_concerns": "No concerns were raised about the findings.",
+        "review_skipped": "The critical review was not performed (time limit).",
+        "degraded": "Reduced analysis: to answer within the time limit, these steps were skipped or cut short: {stages}.",
+        "skipped": "skipped",
+        "timed_out": "stopped at the time limit",
+        "truncated": "not every claim verified",
+        "footer": "Report generated by VERA on {generated_at}",
+    },
+    "Polski": {
+        "title": "Raport Analizy VERA",
+        "summary": "1. Podsumowanie",
+        "assessment": "2. Ocena Ilościowa",
+        "verification": "3. Weryfikacja Faktów",
+        "impact": "4. Analiza Potencjalnej Manipulacji",
+        "review": "5. Przegląd Krytyczny",
+        "conclusion": "6. Wnioski",
+        "disinformation": "Potencjalny Poziom Dezinformacji",
+        "manipulation": "Potencjalny Poziom Manipulacji",
+        "confidence": "Pewność Analizy",
+        "claim": "Twierdzenie",
+        "verdict": "Werdykt",
+        "source": "Źródło",
+        "technique": "Technika",
+        "example": "Przykład",
+        "True": "Prawda",
+        "False": "Fałsz",
+        "Unverified": "Niezweryfikowane",
+        "no_score": "b/d",
+        "no_sources": "Nie znaleziono niezależnego źródła",
+        "search_source": "Zweryfikowano przez wyszukiwarkę Google",
+        "reused": "werdykt z wcześniejszej weryfikacji z {date}",
+        "no_claims": "W tekście nie znaleziono weryfikowalnych twierdzeń.",
+        "no_techniques": "Nie zidentyfikowano technik manipulacji.",
+        "no_concerns": "Nie zgłoszono zastrzeżeń do ustaleń.",
+        "review_skipped": "Przegląd krytyczny nie został wykonany (limit czasu).",
+        "degraded": "Ograniczona analiza: aby zmieścić się w limicie czasu, pominięto lub skrócono kroki: {stages}.",
+        "skipped": "pominięty",
+        "timed_out": "przerwany po limicie czasu",
+        "truncated": "nie wszystkie twierdzenia zweryfikowano",
+        "footer": "Raport wygenerowany przez VERA {generated_at}",
+    },
+}
+
+# Temporary Google Search grounding links (and other redirectors) expire
+_REDIRECT_URL = re.compile(
+    r"https?://(?:[\w-]+\.)*(?:vertexaisearch\.cloud\.google\.com|[\w-]*redirect[\w-]*\.[\w.-]+)\S*",
+    re.IGNORECASE,
+)
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\(([^)\s]+)\)")
+
+
+def _inline(text: Optional[str]) -> str:
+    """Collapse whitespace so model text cannot break the list layout."""
+    return " ".join(str(text or "").split())
+
+
+def clean_source(source: str, labels: Dict[str, str]) -> str:
+    """
+    Remove expiring redirect URLs from a citation, keeping its description.
+
+    Returns:
+        The cleaned citation; "Verified via Google Search" if nothing but
+        a redirect URL was left
+    """
+    source = _MARKDOWN_LINK.sub(
+        lambda link: link.group(1) if _REDIRECT_URL.match(link.group(2)) else link.group(0), source
+    )
+    source = _REDIRECT_URL.sub("", source)
+    source = _inline(source).strip(" -:()[]")
+    return source or labels["search_source"]
+
+
+def _scores_section(scores: Dict[str, Optional[int]], labels: Dict[str, str]) -> List[str]:
+    lines = []
+    for name in ("disinformation", "manipulation", "confidence"):
+        value = scores.get(name)
+        lines.append(f"- **{labels[name]}**: {f'{value}/10' if value is not None else labels['no_score']}")
+    return lines
+
+
+def _claims_section(claims: Sequence[dict], labels: Dict[str, str]) -> List[str]:
+    if not claims:
+        return [labels["no_claims"]]
+    lines = []
+    for claim in claims[:MAX_CLAIMS]:
+        verdict = claim.get("verdict", "Unverified")
+        sources = [clean_source(source, labels) for source in claim.get("sources", [])]
+        source = "; ".join(dict.fromkeys(sources)) or labels["no_sources"]
+        reused = claim.get("reused_from")
+        if reused:
+            source += f" ({labels['reused'].format(date=reused.get('verified_on', '?'))})"
+        lines += [
+            f"- **{labels['claim']}**: {_inline(claim.get('claim'))}",
+            f"  - **{labels['verdict']}**: {labels.get(verdict, verdict)}",
+            f"  - **{labels['source']}**: {source}",
+        ]
+    return lines
+
+
+def _techniques_section(techniques: Sequence[dict], labels: Dict[str, str]) -> List[str]:
+    if not techniques:
+        return [labels["no_techniques"]]
+    lines = []
+    for technique in techniques[:MAX_TECHNIQUES]:
+        lines.append(f"- **{labels['technique']}**: {_inline(technique.get('name'))}")
+        if technique.get("quote"):
+            lines.append(f"  - **{labels['example']}**: \"{_inline(technique['quote'])}\"")
+    return lines
+
+
+def _review_section(critique: Optional[dict], labels: Dict[str, str]) -> List[str]:
+    if critique is None:
+        return [labels["review_skipped"]]
+    concerns = [_inline(concern) for concern in critique.get("concerns", []) if _inline(concern)]
+    if concerns:
+        return [f"- {concern}" for concern in concerns[:MAX_CONCERNS]]
+    return [_inline(critique.get("assessment")) or labels["no_concerns"]]
+
+
+def render_report(
+    *,
+    summary: str,
+    conclusion: str,
+    scores: Dict[str, Optional[int]],
+    claims: Sequence[dict],
+    techniques: Sequence[dict],
+    critique: Optional[dict],
+    language: str,
+    generated_at: str,
+    degraded: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Render the final markdown report.
+
+    Args:
+        summary: Executive summary (Reporter)
+        conclusion: Conclusion paragraphs (Reporter)
+        scores: The three 1-10 scores (None where missing)
+        claims: Claim verdicts (ClaimVerdict dicts), most important first
+        techniques: Manipulation techniques (Technique dicts), most significant first
+        critique: The Critic's output (Critique dict); None if the Critic was skipped
+        language: "English" or "Polski"
+        generated_at: Timestamp for the footer
+        degraded: Stages skipped or cut short to meet the deadline, with the
+            reason ("skipped", "timed_out", "truncated"); noted under the title
+
+    Returns:
+        The report in VERA's six-section layout
+    """
+    labels = LABELS.get(language, LABELS["English"])
+    sections = [
+        (labels["summary"], [summary.strip()]),
+        (labels["assessment"], _scores_section(scores, labels)),
+        (labels["verification"], _claims_section(claims, labels)),
+        (labels["impact"], _techniques_section(techniques, labels)),
+        (labels["review"], _review_section(critique, labels)),
+        (labels["conclusion"], [conclusion.strip()]),
+    ]
+    parts = [f"# {labels['title']}"]
+    if degraded:
+        stages = ", ".join(f"{name} ({labels.get(reason, reason)})" for name, reason in degraded.items())
+        parts.append(f"> ⚠️ {labels['degraded'].format(stages=stages)}")
+    for heading, lines in sections:
+        parts.append(f"## {heading}\n" + "\n".join(lines))
+    parts.append(f"---\n\n*{labels['footer'].format(generated_at=generated_at)}*")
+    return "\n\n".join(parts) + "\n"
@@ -0,0 +1,282 @@
+"""
+Investigation Service - In-process registry of running investigations
+
+Submitted investigations run as asyncio tasks on the caller's event loop.
+Every investigation keeps an append-only event log (agent start/finish,
+rendered report, completion or failure). Subscribers replay the log
+from any position and then wait for new events, so late or reconnecting
+clients never miss anything.
+
+Used by the ASGI API (`vera/api.py`), and by the Streamlit UI through
+BackgroundInvestigations: Streamlit reruns its script (and abandons
+whatever it was awaiting) on every widget interaction or page refresh, so
+the UI submits investigations to a service running on a long-lived
+background event loop and only polls their event logs. The orchestration
+itself lives in `vera/investigation.py`.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from vera.investigation import investigate
+from vera.utils.streaming import DedupRenderer
+from vera.utils.url_extractor import extract_text_from_url
+
+logger = logging.getLogger("vera.service")
+
+# Event types published on an investigation's event log
+TERMINAL_EVENTS = ("completed", "failed")
+
+# How often a UI polls a background investigation's event log (seconds)
+POLL_INTERVAL = 0.25
+
+
+@dataclass
+class Investigation:
+    """State and event log of one submitted investigation."""
+    id: str
+    language: str
+    source_url: Optional[str]
+    status: str = "pending"
+    created_at: float = field(default_factory=time.time)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    # Resolved (and replaced) on every publish; subscribers await it
+    _changed: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_EVENTS
+
+    def publish(self, event_type: str, **data: Any) -> None:
+        """Append an event to the log and wake up subscribers."""
+        self.events.append({"id": len(self.events), "type": event_type, **data})
+        if event_type in TERMINAL_EVENTS:
+            self.status = event_type
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_result(None)
+        self._changed = None
+
+    async def subscribe(self, after: int = -1) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield events with id greater than `after`, waiting for new ones
+        until the investigation completes or fails.
+        """
+        position = after + 1
+        while True:
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.finished:
+                return
+            if self._changed is None:
+                self._changed = asyncio.get_running_loop().create_future()
+            await asyncio.shield(self._changed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "language": self.language,
+            "source_url": self.source_url,
+            "created_at": self.created_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class InvestigationService:
+    """
+    Runs investigations in the background and keeps their event logs.
+
+    Args:
+        max_concurrent: Maximum number of investigations running at once;
+            further submissions wait in "pending" state
+        max_retained: Maximum number of finished investigations kept in memory
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_retained: int = 1000):
+        self.max_retained = max_retained
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._investigations: "OrderedDict[str, Investigation]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, investigation_id: str) -> Optional[Investigation]:
+        return self._investigations.get(investigation_id)
+
+    def submit(
+        self,
+        text: Optional[str] = None,
+        language: str = "English",
+        source_url: Optional[str] = None,
+        **options: Any,
+    ) -> Investigation:
+        """
+        Start an investigation in the background.
+
+        If `text` is empty, the content is extracted from `source_url` first.
+        Must be called from a running event loop.
+
+        Args:
+            options: Further arguments for investigate() (api_key, user_id,
+                reuse_near_duplicates); kept out of the event log
+        """
+        investigation = Investigation(id=str(uuid.uuid4()), language=language, source_url=source_url)
+        self._investigations[investigation.id] = investigation
+        self._evict_finished()
+
+        task = asyncio.create_task(self._run(investigation, text, {"user_id": "api_user", **options}))
+        self._tasks[investigation.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(investigation.id, None))
+        return investigation
+
+    async def _run(self, investigation: Investigation, text: Optional[str], options: Dict[str, Any]) -> None:
+        async with self._slots:
+            investigation.status = "running"
+            investigation.publish("started")
+            publish = investigation.publish
+
+            try:
+                if not text:
+                    # URL extraction is blocking I/O - keep it off the event loop
+                    success, content = await asyncio.to_thread(extract_text_from_url, investigation.source_url)
+                    if not success:
+                        raise ValueError(content)
+                    text = f"[Content extracted from: {investigation.source_url}]\n\n{content}"
+
+                result = await investigate(
+                    text,
+                    language=investigation.language,
+                    source_url=investigation.source_url,
+                    session_id=investigation.id,
+                    on_stage_start=lambda name: publish("agent_start", agent=name),
+                    on_stage_end=lambda name, duration: publish(
+                        "agent_end", agent=name, duration_ms=int(duration * 1000)
+                    ),
+                    on_report_text=lambda chunk: publish("report_delta", text=chunk),
+                    **options,
+                )
+                investigation.result = result.to_dict()
+                publish("completed", result=investigation.result)
+            except asyncio.CancelledError:
+                investigation.error = "Investigation cancelled"
+                publish("failed", error=investigation.error)
+                raise
+            except Exception as e:
+                logger.error(f"Investigation failed: {e}", extra={"session_id": investigation.id}, exc_info=True)
+                investigation.error = str(e) or type(e).__name__
+                publish("failed", error=investigation.error)
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished investigations beyond `max_retained`."""
+        finished = [key for key, inv in self._investigations.items() if inv.finished]
+        for key in finished[:max(0, len(finished) - self.max_retained)]:
+            del self._investigations[key]
+
+    async def shutdown(self) -> None:
+        """Cancel running investigations (used on server shutdown)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class BackgroundInvestigations:
+    """
+    An InvestigationService on its own event loop thread.
+
+    Investigations outlive the code that submitted them (a Streamlit script
+    run); callers poll `get(job_id)` - status, event log and result - from
+    any thread, and reattach to a running investigation by its id.
+
+    Args:
+        max_concurrent: Maximum number of investigations running at once
+        max_retained: Maximum number of finished investigations kept in memory
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_retained: int = 1000):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="vera-investigations", daemon=True)
+        self._thread.start()
+        # The semaphore of the service belongs to the background loop
+        self.service = self._call(lambda: InvestigationService(max_concurrent, max_retained))
+
+    def _call(self, function):
+        """Run `function` on the background loop and return its result."""
+        async def call():
+            return function()
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result()
+
+    def submit(self, text: Optional[str] = None, **kwargs: Any) -> Investigation:
+        """Start an investigation in the background (see InvestigationService.submit)."""
+        return self._call(lambda: self.service.submit(text, **kwargs))
+
+    def get(self, job_id: Optional[str]) -> Optional[Investigation]:
+        """The investigation with this id, or None if unknown (or evicted)."""
+        return self.service.get(job_id) if job_id else None
+
+    def close(self) -> None:
+        """Cancel running investigations and stop the loop thread."""
+        asyncio.run_coroutine_threadsafe(self.service.shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def follow_investigation(
+    job: Investigation,
+    report_view: DedupRenderer,
+    on_progress: Callable[[List[str]], None],
+    interval: float = POLL_INTERVAL,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """
+    Replay a background investigation's events into a UI until it finishes.
+
+    Args:
+        job: Investigation to follow (replayed from its first event)
+        report_view: Renders the report; the final report is rendered once
+        on_progress: Called with the running stages whenever a stage starts or ends
+        interval: Time between two polls of the event log (seconds)
+        sleep: Waits between polls, injectable for tests
+    """
+    active: List[str] = []
+    position = 0
+    while True:
+        finished = job.finished
+        events = job.events[position:]
+        position += len(events)
+        for event in events:
+            if event["type"] == "agent_start":
+                active.append(event["agent"])
+                on_progress(active)
+            elif event["type"] == "agent_end":
+                active.remove(event["agent"])
+                on_progress(active)
+            elif event["type"] == "report_delta":
+                # The rendered report, in one chunk
+                report_view.update(event["text"])
+        if finished:
+            break
+        sleep(interval)
+    if job.status == "completed":
+        report_view.update(job.result["report"])
+
+
+_background: Optional[BackgroundInvestigations] = None
+_background_lock = threading.Lock()
+
+
+def get_background_investigations() -> BackgroundInvestigations:
+    """Process-wide background runner, shared by all Streamlit sessions."""
+    global _background
+    with _background_lock:
+        if _background is None:
+            _background = BackgroundInvestigations()
+        return _background
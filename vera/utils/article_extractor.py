@@ -0,0 +1,196 @@
+"""
+Article Extractor
+
+Finds the main article text of a parsed page in a single traversal.
+
+Every paragraph scores its parent container (and half of that goes to the
+grandparent) by length and punctuation, the usual readability heuristic.
+Container scores are then damped by link density, so navigation, "most read"
+lists and share bars lose to prose. The class names and tags that used to
+be matched one by one (article__body, entry-content, <article>, ...) are
+kept as hints that boost a candidate's score instead of deciding alone.
+
+Boilerplate tags (script, style, nav, ...) are skipped during the walk
+rather than decomposed beforehand.
+
+The walk reads the tree through a TreeAdapter, so the same scoring runs on
+BeautifulSoup trees (html.parser, lxml) and selectolax trees; see
+`vera/utils/html_parser.py`.
+"""
+
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from bs4 import Tag
+from bs4.element import CData, NavigableString
+
+# Subtrees never considered article text
+SKIP_TAGS = frozenset({
+    "script", "style", "nav", "footer", "header", "aside", "form", "iframe",
+    "noscript", "template", "svg",
+})
+# Elements that may hold the article
+CANDIDATE_TAGS = frozenset({"div", "article", "main", "section", "td", "body"})
+# Elements whose text counts as a paragraph
+PARAGRAPH_TAGS = frozenset({"p", "pre", "blockquote"})
+# Former selector list, now used as score hints
+HINT_CLASSES = (
+    "article__body", "article-body", "article__text", "article-content",
+    "post-content", "entry-content", "story-body", "content",
+)
+HINT_TAGS = frozenset({"article", "main"})
+HINT_BONUS = 1.25
+
+# Paragraphs shorter than this are captions, bylines or buttons
+MIN_PARAGRAPH_LENGTH = 25
+
+
+class TreeAdapter:
+    """Read access to a parsed tree, as needed by the extractor."""
+
+    def root(self, document: Any) -> Any:
+        """Element to start from (usually <body>)."""
+        raise NotImplementedError
+
+    def children(self, node: Any) -> Iterator[Tuple[Optional[str], Any]]:
+        """Yield (tag name, element) for child elements and (None, text) for text nodes."""
+        raise NotImplementedError
+
+    def classes(self, node: Any) -> Sequence[str]:
+        raise NotImplementedError
+
+    def tag(self, node: Any) -> str:
+        raise NotImplementedError
+
+
+class SoupAdapter(TreeAdapter):
+    """BeautifulSoup trees (any tree builder)."""
+
+    _text_types = (NavigableString, CData)
+
+    def root(self, document):
+        return document.body or document
+
+    def children(self, node):
+        text_types = self._text_types
+        for child in node.contents:
+            if type(child) in text_types:
+                yield None, child
+            elif isinstance(child, Tag):
+                yield child.name, child
+
+    def classes(self, node):
+        return node.get("class") or ()
+
+    def tag(self, node):
+        return node.name
+
+
+SOUP = SoupAdapter()
+
+
+class _Candidate:
+    """Per-element totals collected during the walk."""
+    __slots__ = ("node", "tag", "parent", "total", "links", "commas", "score")
+
+    def __init__(self, node, tag, parent):
+        self.node = node
+        self.tag = tag
+        self.parent = parent
+        self.total = 0
+        self.links = 0
+        self.commas = 0
+        self.score = 0.0
+
+
+def iter_text(root: Any, adapter: TreeAdapter = SOUP) -> Iterator[str]:
+    """Yield the stripped text fragments of `root`, skipping boilerplate subtrees."""
+    # Stack of elements and already stripped text, popped in document order
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        pending = []
+        for name, child in adapter.children(item):
+            if name is None:
+                text = child.strip()
+                if text:
+                    pending.append(text)
+            elif name not in SKIP_TAGS:
+                pending.append(child)
+        stack.extend(reversed(pending))
+
+
+def _hint_matches(tag: str, classes: Sequence[str]) -> bool:
+    if tag in HINT_TAGS:
+        return True
+    return any(hint in css_class for css_class in classes for hint in HINT_CLASSES)
+
+
+def _paragraph_score(text_length: int, commas: int) -> float:
+    return 1.0 + commas + min(text_length / 100.0, 3.0)
+
+
+def find_article_element(document: Any, adapter: TreeAdapter = SOUP) -> Optional[Any]:
+    """
+    Return the element that most likely contains the article body.
+
+    Args:
+        document: Parsed page
+        adapter: How to read the tree (BeautifulSoup by default)
+
+    Returns:
+        Best scoring container, or None if the page has no paragraphs
+    """
+    root = adapter.root(document)
+    scored: List[_Candidate] = []
+
+    # Iterative post-order walk: children are totalled before their parent
+    stack: List[tuple] = [(_Candidate(root, adapter.tag(root), None), False)]
+    while stack:
+        record, children_done = stack.pop()
+        if not children_done:
+            stack.append((record, True))
+            is_paragraph = record.tag in PARAGRAPH_TAGS
+            for name, child in adapter.children(record.node):
+                if name is None:
+                    text = child.strip()
+                    record.total += len(text)
+                    if is_paragraph:
+                        record.commas += text.count(",")
+                elif name not in SKIP_TAGS:
+                    stack.append((_Candidate(child, name, record), False))
+            continue
+
+        if record.tag == "a":
+            record.links = record.total
+        parent = record.parent
+        if parent is not None:
+            parent.total += record.total
+            parent.links += record.links
+
+        text_length = record.total - record.links
+        if record.tag in PARAGRAPH_TAGS and text_length >= MIN_PARAGRAPH_LENGTH:
+            score = _paragraph_score(text_length, record.commas)
+            ancestor = parent
+            for share in (1.0, 0.5):
+                if ancestor is None:
+                    break
+                if ancestor.tag in CANDIDATE_TAGS:
+                    if not ancestor.score:
+                        scored.append(ancestor)
+                    ancestor.score += score * share
+                ancestor = ancestor.parent
+
+    if not scored:
+        return None
+
+    def final_score(candidate: _Candidate) -> float:
+        link_density = candidate.links / candidate.total if candidate.total else 1.0
+        score = candidate.score * (1.0 - link_density)
+        if _hint_matches(candidate.tag, adapter.classes(candidate.node)):
+            score *= HINT_BONUS
+        return score
+
+    return max(scored, key=final_score).node
@@ -0,0 +1,96 @@
+"""
+Document Chunking
+
+Splits long documents into sections for the long-document (map-reduce)
+investigation mode. Sections follow the text's own structure: paragraphs are
+packed together up to a target size, and only paragraphs longer than a
+section are split, at sentence boundaries.
+
+The number of sections is capped (MAX_CHUNKS): longer documents get larger
+sections instead of more of them, so the number of model calls, and with it
+the token cost, stays bounded.
+"""
+
+import math
+import re
+from typing import List
+
+# Inputs longer than this are investigated section by section
+LONG_DOCUMENT_THRESHOLD = 12_000
+# Target section size (characters)
+CHUNK_CHARS = 8_000
+# Upper bound on sections per document
+MAX_CHUNKS = 12
+# Longest document accepted for investigation (characters)
+MAX_DOCUMENT_CHARS = 100_000
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def is_long_document(text: str) -> bool:
+    return len(text) > LONG_DOCUMENT_THRESHOLD
+
+
+def _split_paragraph(paragraph: str, size: int) -> List[str]:
+    """Split an oversized paragraph at sentence boundaries (hard cut as last resort)."""
+    pieces: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        while len(sentence) > size:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:size])
+            sentence = sentence[size:]
+        if current and len(current) + 1 + len(sentence) > size:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text: str, chunk_chars: int = CHUNK_CHARS, max_chunks: int = MAX_CHUNKS) -> List[str]:
+    """
+    Split text into at most `max_chunks` sections along paragraph boundaries.
+
+    Args:
+        text: Document text
+        chunk_chars: Target section size; raised for documents that would
+            otherwise need more than `max_chunks` sections
+        max_chunks: Maximum number of sections
+
+    Returns:
+        List of sections in document order
+    """
+    text = text.strip()
+    if not text:
+        return []
+    size = max(chunk_chars, math.ceil(len(text) / max_chunks))
+
+    # Single newlines separate paragraphs in extracted pages; blank lines in pasted text
+    separator = "\n\n" if _PARAGRAPH_BREAK.search(text) else "\n"
+    paragraphs = [p.strip() for p in (_PARAGRAPH_BREAK.split(text) if separator == "\n\n" else text.split("\n"))]
+
+    chunks: List[str] = []
+    current = ""
+    for paragraph in paragraphs:
+        if not paragraph:
+            continue
+        for piece in _split_paragraph(paragraph, size) if len(paragraph) > size else [paragraph]:
+            if current and len(current) + len(separator) + len(piece) > size:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+
+    # Packing at paragraph boundaries can overshoot the cap by a section or two
+    while len(chunks) > max_chunks:
+        i = min(range(len(chunks) - 1), key=lambda j: len(chunks[j]) + len(chunks[j + 1]))
+        chunks[i:i + 2] = [chunks[i] + separator + chunks[i + 1]]
+    return chunks
@@ -0,0 +1,120 @@
+"""
+HTML Parser Backends
+
+Selectable parser for URL extraction. Backends, fastest first:
+
+    selectolax   Lexbor C parser (pip install selectolax)
+    lxml         BeautifulSoup with the libxml2 tree builder (pip install lxml)
+    html.parser  BeautifulSoup with the standard library parser (always available)
+
+VERA_HTML_PARSER selects a backend ("auto", the default, picks the fastest
+installed one). A requested backend that is not installed falls back to the
+next available one. Every backend feeds the same article extractor
+(`vera/utils/article_extractor.py`), so only speed and memory differ.
+
+The "auto" order follows `python scripts/benchmark_parsers.py`. On the
+bundled synthetic pages padded to news-page size (`--pad-kb 70`) it
+measured selectolax ~400, lxml ~19 and html.parser ~12.5 pages/s. On
+the unpadded 2-3 KB pages lxml and html.parser are within run-to-run noise
+of each other (340-460 pages/s each), so they cannot rank the two; real
+pages are tens of KB, where lxml is about 1.5x faster and uses less peak
+memory. Measure on your own saved pages before changing the order.
+"""
+
+import importlib.util
+import logging
+import os
+from typing import Any, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+from vera.utils.article_extractor import SOUP, TreeAdapter
+
+logger = logging.getLogger("vera.utils.html_parser")
+
+# "auto" preference order, fastest first at news-page size (see module docstring)
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# Module that must be importable for each backend
+_BACKEND_MODULES = {"selectolax": "selectolax", "lxml": "lxml", "html.parser": None}
+
+
+class SelectolaxAdapter(TreeAdapter):
+    """selectolax (Lexbor) trees."""
+
+    def root(self, document):
+        return document.body or document.root
+
+    def children(self, node):
+        for child in node.iter(include_text=True):
+            if child.is_text_node:
+                yield None, child.text_content
+            elif child.is_element_node:
+                yield child.tag, child
+
+    def classes(self, node):
+        return (node.attributes.get("class") or "").split()
+
+    def tag(self, node):
+        return node.tag
+
+
+SELECTOLAX = SelectolaxAdapter()
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first."""
+    return [
+        name for name in BACKENDS
+        if _BACKEND_MODULES[name] is None or importlib.util.find_spec(_BACKEND_MODULES[name]) is not None
+    ]
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use.
+
+    Args:
+        name: Requested backend; defaults to VERA_HTML_PARSER or "auto"
+
+    Returns:
+        The requested backend if installed, otherwise the fastest available one
+    """
+    name = name or os.environ.get("VERA_HTML_PARSER", "auto")
+    available = available_backends()
+    if name == "auto":
+        return available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name} (choose from {', '.join(BACKENDS)} or auto)")
+    if name in available:
+        return name
+    fallback = next(backend for backend in BACKENDS[BACKENDS.index(name):] if backend in available)
+    logger.warning(f"HTML parser '{name}' is not installed, falling back to '{fallback}'")
+    return fallback
+
+
+def decode_html(content: bytes) -> str:
+    """Decode page bytes, honouring <meta charset> like BeautifulSoup does."""
+    return UnicodeDammit(content, is_html=True).unicode_markup or ""
+
+
+def parse_html(content: Union[bytes, str], backend: Optional[str] = None) -> Tuple[Any, TreeAdapter]:
+    """
+    Parse a page with the selected backend.
+
+    Args:
+        content: Decoded markup, or raw page bytes (the encoding is then
+            detected from the markup)
+        backend: Backend name; see resolve_backend()
+
+    Returns:
+        Tuple of (document, adapter for the article extractor)
+    """
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        # Lexbor expects text
+        markup = decode_html(content) if isinstance(content, bytes) else content
+        return LexborHTMLParser(markup), SELECTOLAX
+    return BeautifulSoup(content, backend), SOUP
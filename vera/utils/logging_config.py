@@ -12,6 +12,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from vera.metrics import COUNTERS
+
+# Stage instrumentation fields (vera/metrics.py) passed as log extras
+METRIC_FIELDS = (*COUNTERS, "ttfe_ms", "ttfr_ms", "cost_usd")
+
 # Create logs directory structure
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
@@ -44,6 +49,11 @@ class JSONFormatter(logging.Formatter):
             log_data["agent_name"] = record.agent_name
         if hasattr(record, "duration_ms"):
             log_data["duration_ms"] = record.duration_ms
+        if hasattr(record, "extraction_path"):
+            log_data["extraction_path"] = record.extraction_path
+        for field in METRIC_FIELDS:
+            if hasattr(record, field):
+                log_data[field] = getattr(record, field)
             
         return json.dumps(log_data)
 
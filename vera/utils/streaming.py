@@ -0,0 +1,35 @@
+"""
+Deduplicated Rendering
+
+Streamlit placeholders re-send their whole content on every update, and the
+browser re-renders it each time. The UI redraws its progress graph on every
+stage start and end and shows the report when it arrives, often with
+content identical to what is already on screen.
+
+DedupRenderer sits in front of such a placeholder and only sends frames
+that differ from the one on screen, so the final report is rendered once.
+"""
+
+from typing import Callable, Optional
+
+
+class DedupRenderer:
+    """
+    Skip updates of a widget that would not change what it shows.
+
+    Args:
+        render: Renders a whole frame (e.g. `placeholder.markdown`)
+    """
+
+    def __init__(self, render: Callable[[str], None]):
+        self.render = render
+        self.frames = 0
+        self._shown: Optional[str] = None
+
+    def update(self, text: str) -> None:
+        """Show `text`, unless it is already on screen."""
+        if text == self._shown:
+            return
+        self.render(text)
+        self.frames += 1
+        self._shown = text
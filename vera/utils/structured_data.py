@@ -0,0 +1,163 @@
+"""
+Structured Data Extractor
+
+Fast path for URL extraction: most news sites embed the article in
+schema.org JSON-LD (`articleBody`, `headline`, `datePublished`) and describe
+it with OpenGraph / article meta tags. Both are read with regular expressions
+over the raw markup, without building a DOM tree.
+
+- JSON-LD articleBody   -> article text (path "json-ld")
+- OpenGraph / meta tags -> title, publication date, author, site name
+- <link rel="amphtml">  -> AMP URL, recorded as metadata only
+
+When no usable articleBody is present the caller falls back to the full
+parse (`vera/utils/html_parser.py` + `vera/utils/article_extractor.py`).
+"""
+
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+# schema.org types that carry an article body
+ARTICLE_TYPES = frozenset({
+    "Article", "NewsArticle", "ReportageNewsArticle", "AnalysisNewsArticle",
+    "OpinionNewsArticle", "BackgroundNewsArticle", "BlogPosting", "Report",
+    "ScholarlyArticle", "TechArticle", "LiveBlogPosting",
+})
+# Shorter bodies are teasers; the full page is parsed instead
+MIN_ARTICLE_BODY_LENGTH = 300
+
+_JSON_LD = re.compile(
+    r"<script[^>]+type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_META = re.compile(r"<meta\s[^>]*>", re.IGNORECASE)
+_AMP_LINK = re.compile(r"<link\s[^>]*rel\s*=\s*[\"']?amphtml[\"']?[^>]*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"([a-zA-Z_:-]+)\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s>]+)")
+_TAG = re.compile(r"<[^>]+>")
+_HEAD_END = re.compile(r"</head\s*>", re.IGNORECASE)
+
+# Meta property/name -> metadata field, first match wins
+_META_FIELDS = {
+    "og:title": "title",
+    "twitter:title": "title",
+    "article:published_time": "published",
+    "og:article:published_time": "published",
+    "date": "published",
+    "pubdate": "published",
+    "article:author": "author",
+    "author": "author",
+    "og:site_name": "publisher",
+}
+
+
+@dataclass
+class ArticleData:
+    """Article text and publication metadata found in structured data."""
+    text: Optional[str] = None
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+def _attributes(tag: str) -> Dict[str, str]:
+    return {
+        name.lower(): html.unescape(value.strip("\"'"))
+        for name, value in _ATTRIBUTE.findall(tag)
+    }
+
+
+def _iter_json_ld_objects(markup: str) -> Iterator[Dict[str, Any]]:
+    """Yield every JSON object in the page's JSON-LD blocks, including @graph members."""
+    for block in _JSON_LD.findall(markup):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(reversed(item))
+            elif isinstance(item, dict):
+                yield item
+                if "@graph" in item:
+                    stack.append(item["@graph"])
+
+
+def _types(item: Dict[str, Any]) -> set:
+    types = item.get("@type", [])
+    return set(types if isinstance(types, list) else [types])
+
+
+def _name(value: Any) -> Optional[str]:
+    """Name of a schema.org Person/Organization (or list of them)."""
+    if isinstance(value, list):
+        names = [name for name in (_name(item) for item in value) if name]
+        return ", ".join(names) or None
+    if isinstance(value, dict):
+        return value.get("name")
+    if isinstance(value, str):
+        return value
+    return None
+
+
+def _clean_body(body: str) -> str:
+    # Some sites put HTML into articleBody
+    text = _TAG.sub("\n", html.unescape(body))
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def extract_structured_data(markup: str) -> ArticleData:
+    """
+    Read article text and metadata from JSON-LD, OpenGraph and AMP markup.
+
+    Args:
+        markup: Decoded page HTML
+
+    Returns:
+        ArticleData; `text` is None when the page has no usable articleBody
+    """
+    result = ArticleData()
+
+    for item in _iter_json_ld_objects(markup):
+        if not _types(item) & ARTICLE_TYPES:
+            continue
+        body = item.get("articleBody")
+        if isinstance(body, str) and result.text is None:
+            body = _clean_body(body)
+            if len(body) >= MIN_ARTICLE_BODY_LENGTH:
+                result.text = body
+        for key, value in (
+            ("title", item.get("headline")),
+            ("published", item.get("datePublished")),
+            ("author", _name(item.get("author"))),
+            ("publisher", _name(item.get("publisher"))),
+        ):
+            if isinstance(value, str) and value.strip():
+                result.metadata.setdefault(key, value.strip())
+
+    # Meta tags live in <head>; do not scan the body
+    head_end = _HEAD_END.search(markup)
+    head = markup[:head_end.start()] if head_end else markup
+    for tag in _META.findall(head):
+        attributes = _attributes(tag)
+        key = _META_FIELDS.get((attributes.get("property") or attributes.get("name") or "").lower())
+        content = attributes.get("content", "").strip()
+        if key and content:
+            result.metadata.setdefault(key, content)
+
+    amp_link = _AMP_LINK.search(head)
+    if amp_link:
+        amp_url = _attributes(amp_link.group(0)).get("href")
+        if amp_url:
+            result.metadata["amp_url"] = amp_url
+
+    return result
+
+
+def format_metadata(metadata: Dict[str, str]) -> str:
+    """Publication metadata as header lines for the agents (empty if none)."""
+    labels = (("title", "Title"), ("published", "Published"), ("author", "Author"), ("publisher", "Publisher"))
+    return "\n".join(f"{label}: {metadata[key]}" for key, label in labels if metadata.get(key))
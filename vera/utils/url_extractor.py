@@ -3,16 +3,98 @@ URL Content Extractor
 
 Utility for extracting text content from web pages.
 Supports automatic URL detection and content extraction.
+Pages are fetched over the pooled keep-alive session from `vera/utils/http.py`.
+
+Article text is taken from embedded JSON-LD when present (no DOM is built),
+otherwise from the parsed page; the path that served each URL is logged and
+counted (see get_extraction_stats()).
+
+Downloads are streamed and capped at VERA_MAX_DOWNLOAD_BYTES (default 2 MB);
+non-HTML responses (PDF, video, ...) are rejected from their headers before
+any of the body is read.
 """
 
+import os
 import re
+import threading
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional, Tuple
+from collections import Counter
+from typing import Dict, Optional, Tuple
 import logging
 
+from vera.utils.article_extractor import find_article_element, iter_text
+from vera.utils.chunking import MAX_DOCUMENT_CHARS
+from vera.utils.html_parser import decode_html, parse_html
+from vera.utils.http import get_session
+from vera.utils.structured_data import extract_structured_data, format_metadata
+
 logger = logging.getLogger("vera.utils.url_extractor")
 
+# Maximum extracted text length (characters); long articles are investigated
+# section by section, so this is only a safety ceiling
+MAX_TEXT_LENGTH = MAX_DOCUMENT_CHARS
+DEFAULT_MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Content types parsed as pages; responses without a Content-Type are tried too
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+# How each successfully extracted URL was served: "json-ld", "article" or "full-page"
+_extraction_paths: Counter = Counter()
+_extraction_paths_lock = threading.Lock()
+
+
+def record_extraction_path(path: str) -> None:
+    with _extraction_paths_lock:
+        _extraction_paths[path] += 1
+
+
+def get_extraction_stats() -> Dict[str, int]:
+    """Number of extracted URLs per extraction path since process start."""
+    with _extraction_paths_lock:
+        return dict(_extraction_paths)
+
+
+class UnsupportedContentError(Exception):
+    """Raised when a URL does not serve an HTML page."""
+
+
+def download_page(url: str, headers: dict, timeout: int, max_bytes: int) -> bytes:
+    """
+    Stream a page body, stopping at `max_bytes`.
+
+    Raises:
+        UnsupportedContentError: If the Content-Type is not HTML
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise UnsupportedContentError(content_type)
+
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                logger.warning(f"Download capped at {max_bytes} bytes for URL: {url}")
+                del body[max_bytes:]
+                break
+        return bytes(body)
+
+
+def collect_text(strings, limit: int = MAX_TEXT_LENGTH) -> str:
+    """Join text fragments line by line, stopping once `limit` characters are collected."""
+    lines = []
+    length = 0
+    for fragment in strings:
+        lines.append(fragment)
+        length += len(fragment) + 1
+        if length > limit:
+            break
+    return '\n'.join(lines)
+
 
 def is_url(text: str) -> bool:
     """
@@ -35,13 +117,14 @@ def is_url(text: str) -> bool:
     return bool(url_pattern.match(text.strip()))
 
 
-def extract_text_from_url(url: str, timeout: int = 10) -> Tuple[bool, str]:
+def extract_text_from_url(url: str, timeout: int = 10, max_bytes: Optional[int] = None) -> Tuple[bool, str]:
     """
     Extract text content from a URL.
     
     Args:
         url: URL to extract content from
         timeout: Request timeout in seconds
+        max_bytes: Download ceiling (default: VERA_MAX_DOWNLOAD_BYTES or 2 MB)
         
     Returns:
         Tuple of (success: bool, content: str)
@@ -56,81 +139,63 @@ def extract_text_from_url(url: str, timeout: int = 10) -> Tuple[bool, str]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        # Fetch the page
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+        # Fetch the page (streamed, size-capped)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("VERA_MAX_DOWNLOAD_BYTES", DEFAULT_MAX_DOWNLOAD_BYTES))
+        content = download_page(url, headers, timeout, max_bytes)
         
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header", "aside", "form", "iframe"]):
-            script.decompose()
-        
-        # Try to find main article content using common selectors
-        article_selectors = [
-            # Specific article containers
-            {'name': 'div', 'class_': 'article__body'},
-            {'name': 'div', 'class_': 'article-body'},
-            {'name': 'div', 'class_': 'article__text'},
-            {'name': 'div', 'class_': 'article-content'},
-            {'name': 'article', 'class_': None},
-            {'name': 'div', 'class_': 'post-content'},
-            {'name': 'div', 'class_': 'entry-content'},
-            {'name': 'div', 'class_': 'content'},
-            {'name': 'main', 'class_': None},
-            # Fallback to body
-            {'name': 'body', 'class_': None},
-        ]
-        
-        text = None
-        for selector in article_selectors:
-            if selector['class_']:
-                # Try exact class match
-                elem = soup.find(selector['name'], class_=selector['class_'])
-                if not elem:
-                    # Try partial class match
-                    elem = soup.find(selector['name'], class_=lambda x: x and selector['class_'] in x if x else False)
-            else:
-                elem = soup.find(selector['name'])
-            
-            if elem:
-                logger.debug(f"Found content using selector: {selector}")
-                text = elem.get_text(separator='\n', strip=True)
-                break
+        markup = decode_html(content)
         
-        if not text:
-            # Try paragraph-based extraction (for sites like Gazeta.pl)
-            logger.info("Trying paragraph-based extraction")
-            paragraphs = soup.find_all('p')
-            paragraph_texts = []
-            for p in paragraphs:
-                p_text = p.get_text(strip=True)
-                if len(p_text) > 50:  # Only meaningful paragraphs
-                    paragraph_texts.append(p_text)
+        # Fast path: article body and metadata embedded as JSON-LD / OpenGraph
+        structured = extract_structured_data(markup)
+        if structured.text:
+            text = structured.text
+            extraction_path = "json-ld"
+        else:
+            # Parse HTML (backend chosen by VERA_HTML_PARSER, fastest installed by default)
+            document, adapter = parse_html(markup)
             
-            if paragraph_texts:
-                text = '\n\n'.join(paragraph_texts)
-                logger.info(f"Extracted {len(paragraph_texts)} paragraphs")
-            else:
-                # Ultimate fallback - get all text
-                text = soup.get_text(separator='\n', strip=True)
+            # Locate the article body in one pass (text and link density scoring)
+            element = find_article_element(document, adapter)
+            if element is None:
+                # No paragraphs at all - get all text
+                element = adapter.root(document)
+                extraction_path = "full-page"
                 logger.warning("Using fallback: extracting all text from page")
+            else:
+                extraction_path = "article"
+                logger.debug(f"Found content in <{adapter.tag(element)} class={list(adapter.classes(element))}>")
+            # Stop walking the tree once enough text is collected
+            text = collect_text(iter_text(element, adapter))
+        
+        # Publication date and author help the agents judge timeliness
+        header = format_metadata(structured.metadata)
+        if header:
+            text = f"{header}\n\n{text}"
         
         # Clean up whitespace
         lines = (line.strip() for line in text.splitlines())
         chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
         text = '\n'.join(chunk for chunk in chunks if chunk)
         
-        # Limit text length (max 10000 chars to avoid overwhelming the LLM)
+        # Limit text length (safety ceiling - long documents are chunked downstream)
         original_length = len(text)
-        if len(text) > 10000:
-            text = text[:10000] + "\n\n[Content truncated due to length...]"
-            logger.warning(f"Content truncated from {original_length} to 10000 characters")
-        
-        logger.info(f"Successfully extracted {original_length} characters from URL")
+        if len(text) > MAX_TEXT_LENGTH:
+            text = text[:MAX_TEXT_LENGTH] + "\n\n[Content truncated due to length...]"
+            logger.warning(f"Content truncated from {original_length} to {MAX_TEXT_LENGTH} characters")
+        
+        record_extraction_path(extraction_path)
+        logger.info(
+            f"Successfully extracted {original_length} characters from URL ({extraction_path})",
+            extra={"extraction_path": extraction_path},
+        )
         return True, text
         
+    except UnsupportedContentError as e:
+        error_msg = f"📄 Unsupported content type '{e}'. Only web pages (HTML) can be analyzed."
+        logger.error(f"Unsupported content type for URL: {url} - {e}")
+        return False, error_msg
+        
     except requests.exceptions.Timeout:
         error_msg = f"⏱️ Request timed out after {timeout} seconds. The website may be slow or unresponsive."
         logger.error(f"Timeout error for URL: {url}")